@@ -0,0 +1,141 @@
+"""
+Tiempo de arranque del juego y presupuesto de la primera ventana.
+
+Mide dos cosas, cada una en un proceso nuevo (arranque en frío del
+intérprete, sin módulos en memoria):
+
+1. Importaciones de main.py con `python -X importtime`: tiempo acumulado,
+   los módulos más caros y que ninguno de MODULOS_DIFERIDOS (NumPy y la
+   lógica de matrices) se cargue antes de la primera ventana.
+2. `python main.py --medir-arranque`: tiempo desde lanzar el proceso hasta
+   que la ventana de niveles está dibujada y hasta que la sesión (NumPy,
+   bitácora, recuperación) está lista. Necesita una pantalla; sin ella se
+   informa y se omite.
+
+La bitácora de estas corridas se escribe en un HOME temporal, no en el del
+usuario.
+
+tests/test_arranque.py aplica los mismos presupuestos en la suite de pytest.
+
+Uso:
+    python -m benchmarks.arranque
+    python -m benchmarks.arranque --presupuesto-ms 400 --repeticiones 7
+
+Termina con código 1 si se importa un módulo diferido al arrancar o si la
+mediana de la primera ventana (o de las importaciones, si no hay pantalla)
+supera el presupuesto.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULOS_DIFERIDOS = ("numpy", "logic.sesion", "logic.matrix_utils", "logic.eliminacion",
+                     "logic.bitacora", "logic.entrada", "concurrent.futures")
+PRESUPUESTO_VENTANA_MS = 500
+PRESUPUESTO_IMPORTACION_MS = 150
+REPETICIONES = 5
+
+_LINEA_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _entorno(home):
+    entorno = dict(os.environ, HOME=home, PYTHONDONTWRITEBYTECODE="1")
+    entorno.pop("QUIZLINEAL_PERFIL", None)
+    return entorno
+
+
+def importaciones(home):
+    """
+    Importa main en un intérprete nuevo con -X importtime.
+    Retorna {módulo: (µs propios, µs acumulados)} y el total en ms.
+    """
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                             cwd=RAIZ, env=_entorno(home), capture_output=True, text=True, check=True)
+    modulos = {}
+    for linea in proceso.stderr.splitlines():
+        coincidencia = _LINEA_IMPORTTIME.match(linea)
+        if coincidencia:
+            propio, acumulado, _, modulo = coincidencia.groups()
+            modulos[modulo] = (int(propio), int(acumulado))
+    return modulos, modulos["main"][1] / 1000
+
+
+def modulos_diferidos(modulos):
+    # Módulos de MODULOS_DIFERIDOS (o submódulos suyos) que aparecen entre los importados
+    return sorted(m for m in modulos if m.split(".")[0] in MODULOS_DIFERIDOS or m in MODULOS_DIFERIDOS)
+
+
+def primera_ventana(home):
+    """
+    Lanza main.py --medir-arranque y retorna (ms hasta la primera ventana,
+    ms hasta la sesión lista) medidos desde fuera del proceso, o None si
+    no hay pantalla.
+    """
+    from main import MARCA_VENTANA, MARCA_SESION
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen([sys.executable, "main.py", "--medir-arranque"], cwd=RAIZ, env=_entorno(home),
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    marcas = {}
+    for linea in proceso.stdout:
+        if linea.startswith(MARCA_VENTANA) or linea.startswith(MARCA_SESION):
+            marcas[linea.split("=")[0]] = (time.perf_counter() - inicio) * 1000
+        if MARCA_SESION in marcas:
+            break
+    proceso.communicate()
+    if MARCA_VENTANA not in marcas:
+        return None
+    return marcas[MARCA_VENTANA], marcas.get(MARCA_SESION)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arranque en frío del juego y presupuesto de la primera ventana.")
+    parser.add_argument("--presupuesto-ms", type=float, default=PRESUPUESTO_VENTANA_MS,
+                        help="máximo para la primera ventana (mediana)")
+    parser.add_argument("--presupuesto-importacion-ms", type=float, default=PRESUPUESTO_IMPORTACION_MS,
+                        help="máximo para importar main.py (mediana)")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--mostrar", type=int, default=10, help="módulos más caros a listar")
+    args = parser.parse_args(argv)
+
+    fallas = []
+    with tempfile.TemporaryDirectory() as home:
+        corridas = [importaciones(home) for _ in range(args.repeticiones)]
+        modulos = corridas[-1][0]
+        tiempo_importacion = statistics.median(total for _, total in corridas)
+        print(f"Importar main.py: {tiempo_importacion:.1f} ms (mediana de {args.repeticiones})")
+        for modulo, (propio, acumulado) in sorted(modulos.items(), key=lambda par: -par[1][1])[:args.mostrar]:
+            print(f"  {modulo:<40} {acumulado / 1000:8.1f} ms acumulado {propio / 1000:8.1f} ms propio")
+
+        diferidos = modulos_diferidos(modulos)
+        if diferidos:
+            fallas.append(f"se importan al arrancar: {', '.join(diferidos)}")
+
+        ventanas = [primera_ventana(home) for _ in range(args.repeticiones)]
+        if None in ventanas:
+            print("Sin pantalla: no se mide la primera ventana, se aplica el presupuesto de importación.")
+            if tiempo_importacion > args.presupuesto_importacion_ms:
+                fallas.append(f"importar main.py tarda {tiempo_importacion:.1f} ms "
+                              f"(presupuesto {args.presupuesto_importacion_ms:.0f} ms)")
+        else:
+            ventana = statistics.median(v for v, _ in ventanas)
+            sesion = statistics.median(s for _, s in ventanas if s is not None)
+            print(f"Primera ventana: {ventana:.1f} ms; sesión lista: {sesion:.1f} ms (mediana de {args.repeticiones})")
+            if ventana > args.presupuesto_ms:
+                fallas.append(f"la primera ventana tarda {ventana:.1f} ms (presupuesto {args.presupuesto_ms:.0f} ms)")
+
+    for falla in fallas:
+        print(f"FALLA: {falla}")
+    if fallas:
+        return 1
+    print("Arranque dentro del presupuesto.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Banco de rendimiento reproducible de las funciones más usadas del juego.
+
+Mide crear_matriz_aleatoria, aplicar_operacion_elemental,
+verificar_forma_escalonada_reducida, formatear_matriz_para_mostrar y
+verificar_producto_es_identidad para n en el rango del juego (2 a 5) y en
+tamaños de estrés, con matrices int, float y object (Fraction). Todas las
+entradas salen de semillas fijas, así dos corridas miden exactamente el
+mismo trabajo.
+
+Cada caso se repite hasta acumular al menos TIEMPO_MINIMO segundos y se
+toma la mediana de REPETICIONES mediciones del tiempo por llamada.
+
+Uso:
+    python -m benchmarks.rendimiento --salida resultados.json
+    python -m benchmarks.rendimiento --comparar benchmarks/linea_base.json
+    python -m benchmarks.rendimiento --guardar-linea-base
+
+La comparación termina con código 1 si algún caso es más lento que la
+línea base por encima de la tolerancia. Los tiempos dependen de la
+máquina: la línea base debe regenerarse en la máquina donde se compara.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+from logic.operations import (crear_matriz_aleatoria, aplicar_operacion_elemental,
+                              verificar_producto_es_identidad, contadores_caminos,
+                              reiniciar_contadores_caminos)
+from logic.matrix_utils import verificar_forma_escalonada_reducida, formatear_matriz_para_mostrar
+from logic.rational_matrix import _como_fraccion
+
+RUTA_LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linea_base.json")
+TAMANOS_JUEGO = [2, 3, 4, 5]
+TAMANOS_ESTRES = [50, 100, 200, 400]
+TIPOS = ["int", "float", "object"]
+SEMILLA = 2024
+TIEMPO_MINIMO = 0.05
+REPETICIONES = 5
+
+
+def _convertir(A, tipo):
+    if tipo == "int":
+        return A.astype(np.int64)
+    if tipo == "float":
+        return A.astype(float)
+    return np.vectorize(_como_fraccion, otypes=[object])(A)
+
+
+def _par_inverso(rng, n):
+    # A = I + e₀·vᵀ con v₀ = 0 tiene inversa entera exacta I - e₀·vᵀ
+    v = rng.integers(-10, 10, n)
+    v[0] = 0
+    A = np.eye(n, dtype=np.int64)
+    inversa = np.eye(n, dtype=np.int64)
+    A[0] += v
+    inversa[0] -= v
+    return A, inversa
+
+
+def casos(n, tipo, semilla=SEMILLA):
+    """
+    Retorna {nombre de función: llamada sin argumentos} para n y tipo,
+    con entradas generadas de forma determinista.
+    """
+    rng = np.random.default_rng([semilla, n])
+    A = _convertir(rng.integers(-10, 10, (n, n)), tipo)
+    identidad = _convertir(np.eye(n, dtype=np.int64), tipo)
+    original, inversa = (_convertir(M, tipo) for M in _par_inverso(rng, n))
+
+    resultado = {
+        "aplicar_operacion_elemental": lambda: aplicar_operacion_elemental(A, "suma", 0, 1, 3, identidad),
+        "verificar_forma_escalonada_reducida": lambda: verificar_forma_escalonada_reducida(identidad),
+        "formatear_matriz_para_mostrar": lambda: formatear_matriz_para_mostrar(A),
+        "verificar_producto_es_identidad": lambda: verificar_producto_es_identidad(original, inversa),
+    }
+    if tipo == "int":
+        def crear():
+            np.random.seed(semilla)
+            return crear_matriz_aleatoria(n)
+        resultado["crear_matriz_aleatoria"] = crear
+    return resultado
+
+
+def medir(llamada, tiempo_minimo=TIEMPO_MINIMO, repeticiones=REPETICIONES):
+    """Mediana del tiempo por llamada (s) y número de llamadas por medición."""
+    llamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            llamada()
+        if time.perf_counter() - inicio >= tiempo_minimo:
+            break
+        llamadas *= 2
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            llamada()
+        tiempos.append((time.perf_counter() - inicio) / llamadas)
+    return statistics.median(tiempos), llamadas
+
+
+def ejecutar(tamanos, tipos=TIPOS, semilla=SEMILLA, tiempo_minimo=TIEMPO_MINIMO, progreso=None):
+    """Corre todos los casos y retorna el documento de resultados."""
+    reiniciar_contadores_caminos()
+    resultados = []
+    for n in tamanos:
+        for tipo in tipos:
+            for funcion, llamada in casos(n, tipo, semilla).items():
+                segundos, llamadas = medir(llamada, tiempo_minimo)
+                fila = {"funcion": funcion, "tipo": tipo, "n": n,
+                        "segundos_por_llamada": segundos, "llamadas": llamadas}
+                resultados.append(fila)
+                if progreso is not None:
+                    progreso(fila)
+    return {
+        "metadatos": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "procesador": platform.processor() or platform.machine(),
+            "semilla": semilla,
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "resultados": resultados,
+        # Caminos que tomó aplicar_operacion_elemental (int64, float64, exacta, promovida)
+        "caminos": contadores_caminos(),
+    }
+
+
+def comparar(actual, linea_base, tolerancia=0.25):
+    """
+    Compara dos documentos de resultados caso por caso.
+    Retorna la lista de (clave, razón actual/base) más lentas que 1 + tolerancia.
+    """
+    base = {(r["funcion"], r["tipo"], r["n"]): r["segundos_por_llamada"] for r in linea_base["resultados"]}
+    regresiones = []
+    for fila in actual["resultados"]:
+        clave = (fila["funcion"], fila["tipo"], fila["n"])
+        if clave in base and base[clave] > 0:
+            razon = fila["segundos_por_llamada"] / base[clave]
+            if razon > 1 + tolerancia:
+                regresiones.append((clave, razon))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de rendimiento de las funciones del juego.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS_JUEGO + TAMANOS_ESTRES)
+    parser.add_argument("--tipos", nargs="+", choices=TIPOS, default=TIPOS)
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--tiempo-minimo", type=float, default=TIEMPO_MINIMO,
+                        help="segundos mínimos por medición")
+    parser.add_argument("--salida", help="archivo JSON de resultados")
+    parser.add_argument("--comparar", metavar="LINEA_BASE", help="JSON de línea base para detectar regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="lentitud relativa admitida")
+    parser.add_argument("--guardar-linea-base", action="store_true", help=f"escribe {RUTA_LINEA_BASE}")
+    args = parser.parse_args(argv)
+
+    def progreso(fila):
+        print(f"{fila['funcion']:<38} {fila['tipo']:<7} n={fila['n']:<4} "
+              f"{fila['segundos_por_llamada'] * 1e6:12.1f} µs", file=sys.stderr)
+
+    documento = ejecutar(args.tamanos, args.tipos, args.semilla, args.tiempo_minimo, progreso)
+    rutas = [args.salida] if args.salida else []
+    if args.guardar_linea_base:
+        rutas.append(RUTA_LINEA_BASE)
+    for ruta in rutas:
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(documento, archivo, indent=2)
+    if not rutas and not args.comparar:
+        print(json.dumps(documento, indent=2))
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            regresiones = comparar(documento, json.load(archivo), args.tolerancia)
+        for (funcion, tipo, n), razon in regresiones:
+            print(f"REGRESIÓN {funcion} {tipo} n={n}: {razon:.2f}× la línea base")
+        if regresiones:
+            return 1
+        print("Sin regresiones respecto de la línea base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
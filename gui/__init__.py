@@ -1,5 +1,9 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) 
+# Linealgame se importa al pedirlo (gui.Linealgame), así importar gui.vistas
+# o gui.tareas no arrastra la aplicación completa
 
-from gui.app import Linealgame
+
+def __getattr__(nombre):
+    if nombre == "Linealgame":
+        from gui.app import Linealgame
+        return Linealgame
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
@@ -1,20 +1,29 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) 
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-from logic.operations import crear_matriz_aleatoria, aplicar_operacion_elemental, evaluar_entrada_transpuesta, verificar_producto_es_identidad
-from logic.matrix_utils import formatear_matriz_para_mostrar, verificar_forma_escalonada_reducida
-import numpy as np
-from fractions import Fraction
+from logic.niveles import TRANSPUESTA, GAUSS_JORDAN, INVERSA, TAMANO_MINIMO, TAMANO_MAXIMO
+from logic import instrumentacion
+from gui.vistas import PantallaTranspuesta, PantallaOperaciones, PantallaCompletado, IndicadorTarea, TAMANO_ETIQUETAS
+from gui.tareas import EjecutorTareas
 
+# Este módulo no importa NumPy ni la lógica de matrices: la sesión se crea en
+# segundo plano después de mostrar la ventana, y las funciones de logic.* se
+# importan dentro de los métodos que las usan (ya cargadas para entonces).
+
+
+def crear_sesion():
+    # Sesión sin bitácora (main.py pasa una que sí la tiene)
+    from logic.sesion import GameSession
+    return GameSession()
+
+
+@instrumentacion.medir_metodos
 class Linealgame:
-    def __init__(self, root):
+    # Vista Tkinter sobre una GameSession: toda la lógica y el estado del juego
+    # viven en la sesión; aquí solo se leen entradas y se muestran resultados
+    def __init__(self, root, sesion=None, crear_sesion=crear_sesion):
         self.root = root
         self.root.title("🎯 Desafío Matemático 🎯")
-        self.matriz = None  
-        self.n = 0
-        self.current_level = 0  
+        self.sesion = None
 
         self.start_frame = tk.Frame(root)
         self.start_frame.pack()
@@ -22,7 +31,8 @@ class Linealgame:
         tk.Label(self.start_frame, text="🎯 Bienvenido al Desafío Matemático 🎯", font=("Arial", 16)).pack(pady=10)
         tk.Label(self.start_frame, text="Elige un nivel:").pack(pady=5)
 
-        self.level1_button = tk.Button(self.start_frame, text="Nivel 1: Transpuesta", command=self.start_transpose)
+        # Los niveles se habilitan cuando la sesión está lista
+        self.level1_button = tk.Button(self.start_frame, text="Nivel 1: Transpuesta", command=self.start_transpose, state="disabled")
         self.level1_button.pack(pady=5)
 
         self.level2_button = tk.Button(self.start_frame, text="Nivel 2: Gauss Jordan", command=self.start_gauss, state="disabled")
@@ -32,42 +42,136 @@ class Linealgame:
         self.level3_button.pack(pady=5)
 
         self.game_frame = tk.Frame(root)
+        # La lógica corre fuera del hilo de Tk; el indicador aparece si tarda
+        self.indicador = IndicadorTarea(root, self.cancelar_tarea)
+        self.tareas = EjecutorTareas(root, self.indicador)
+        # Pantallas ya construidas, por nivel; solo una está visible a la vez
+        self.pantallas = {}
+        self.pantalla_actual = None
+        # Cambia al mostrar una pantalla o volver al menú (ver en_esta_pantalla)
+        self.visita = 0
+
+        if sesion is not None:
+            self.conectar_sesion(sesion)
+        else:
+            # Primero se dibuja la ventana; NumPy y la lógica se cargan después, fuera del hilo de Tk
+            self.root.after_idle(lambda: self.tareas.enviar(
+                crear_sesion, al_terminar=self.conectar_sesion, al_fallar=self.sesion_sin_recuperar,
+                clave="sesion", cancelable=False, descripcion="Cargando…"))
+
+    def sesion_sin_recuperar(self, error):
+        # Bitácora o caché ilegibles: se juega igual, con una sesión nueva que no se guarda
+        self.tareas.enviar(crear_sesion, al_terminar=self.conectar_sesion, al_fallar=self.mostrar_error,
+                           clave="sesion", cancelable=False, descripcion="Cargando…")
+        messagebox.showwarning("Partida no recuperada",
+                               f"No se pudo recuperar la partida guardada: {error}\n"
+                               "Se empieza una partida nueva que no se guardará.")
+
+    def conectar_sesion(self, sesion):
+        # Habilita los niveles según el progreso y retoma un nivel recuperado de la bitácora
+        self.sesion = sesion
+        self.actualizar_botones_niveles()
+        if self.sesion.nivel is not None:
+            self.start_frame.pack_forget()
+            self.show_game_screen(self.sesion.nivel)
+
+    # Estado de la sesión, de solo lectura para la vista
+    @property
+    def matriz(self):
+        return self.sesion.matriz
+
+    @property
+    def n(self):
+        return self.sesion.n
+
+    @property
+    def current_level(self):
+        return self.sesion.current_level
+
+    @property
+    def motor(self):
+        return self.sesion.motor
+
+    def actualizar_botones_niveles(self):
+        # Habilita los botones de los niveles según el progreso de la sesión
+        self.level1_button.config(state="normal")
+        self.level2_button.config(state="normal" if self.sesion.nivel_disponible(GAUSS_JORDAN) else "disabled")
+        self.level3_button.config(state="normal" if self.sesion.nivel_disponible(INVERSA) else "disabled")
+
+    def iniciar_nivel(self, nivel):
+        # Pide el tamaño, inicia el nivel en la sesión y muestra su pantalla
+        if not self.sesion.nivel_disponible(nivel):
+            messagebox.showerror("Error", self.sesion.motivo_bloqueo(nivel))
+            return
+        n = self.ask_matrix_size()
+        if n is None:
+            return
+
+        def iniciado(resultado):
+            exito, mensaje = resultado
+            if not exito:
+                messagebox.showerror("Error", mensaje)
+                return
+            self.start_frame.pack_forget()
+            self.show_game_screen(nivel)
+
+        # Si se cancela mientras se genera la matriz, la sesión vuelve al menú
+        self.tareas.enviar(self.sesion.iniciar, nivel, n, al_terminar=iniciado, al_fallar=self.mostrar_error,
+                           al_cancelar=self.volver_al_menu_en_sesion, clave="iniciar",
+                           descripcion="Generando matriz…")
+
+    # -------------------- Tareas en segundo plano --------------------
+
+    def cancelar_tarea(self):
+        # Botón Cancelar del indicador
+        self.tareas.cancelar()
+
+    def volver_al_menu_en_sesion(self):
+        self.tareas.enviar(self.sesion.salir, al_terminar=lambda _: self.actualizar_botones_niveles(),
+                           al_fallar=self.mostrar_error, cancelable=False)
+
+    def mostrar_error(self, error):
+        # Mismos mensajes que mostraban los callbacks cuando la lógica corría en el hilo de Tk
+        if isinstance(error, IndexError):
+            messagebox.showerror("Error", f"Índice fuera de rango: {error}")
+        elif isinstance(error, ValueError):
+            messagebox.showerror("Error", f"Entrada inválida: {error}")
+        else:
+            messagebox.showerror("Error", f"Ha ocurrido un error: {error}")
+
+    def mostrar_veredicto(self, resultado):
+        # Resultado (exito, mensaje) de una verificación de nivel
+        exito, mensaje = resultado
+        if exito:
+            messagebox.showinfo("¡Correcto!", mensaje)
+            self.quit_game()
+        else:
+            messagebox.showerror("Incorrecto", mensaje)
+
+    def aplicar_en_segundo_plano(self, operacion, fila1, fila2, factor, mensaje):
+        # Aplica la operación en el hilo de trabajo, en orden con las demás
+        def aplicada(_):
+            self.refrescar_matriz_aumentada()
+            messagebox.showinfo("Operación realizada", mensaje)
+        self.tareas.enviar(self.sesion.aplicar_operacion, operacion, fila1, fila2, factor,
+                           al_terminar=self.en_esta_pantalla(aplicada), al_fallar=self.mostrar_error,
+                           cancelable=False, descripcion="Aplicando operación…")
 
     def start_gauss(self):
         # Inicia nivel Gauss Jordan
-        if self.current_level < 1:
-            messagebox.showerror("Error", "Debes completar el Nivel 1 (Transpuesta) antes de avanzar al Nivel 2.")
-            return
-        self.n = self.ask_matrix_size()
-        if self.n is None:
-            return
-        self.matriz = crear_matriz_aleatoria(self.n)  
-        # Crear una matriz aleatoria de 2x1 en lugar de la matriz identidad
-        self.identidad = np.random.randint(-10, 10, (self.n, 1)).astype(object)
-    
-        self.start_frame.pack_forget()
-        self.show_game_screen("Gauss Jordan")
+        self.iniciar_nivel(GAUSS_JORDAN)
     
     def show_completed_level_1(self):
         # Muestra matriz completada nivel 1
         if self.matriz is None:
             tk.messagebox.showerror("Error", "La matriz no está definida.")
             return
-    
-    
-        for widget in self.root.winfo_children():
-            widget.destroy()
-    
-    
-        matriz_texto = formatear_matriz_para_mostrar(self.matriz)
-        text_widget = tk.Text(self.root, wrap="none", height=10, width=50)
-        text_widget.insert("1.0", matriz_texto)
-        text_widget.config(state="disabled")
-        text_widget.pack()
-    
-    
-        tk.Button(self.root, text="Continuar al Nivel 2 (Gauss Jordan)", command=self.next_level).pack()
-        tk.Button(self.root, text="Salir", command=self.quit_game).pack()
+
+        self.start_frame.pack_forget()
+        self.game_frame.pack()
+        from logic.matrix_utils import formatear_matriz_para_mostrar
+        pantalla = self.mostrar_pantalla("Completado", lambda: PantallaCompletado(self.game_frame, self))
+        pantalla.mostrar(formatear_matriz_para_mostrar(self.matriz))
     
     def next_level(self):
         # Avanza al siguiente nivel
@@ -76,133 +180,117 @@ class Linealgame:
     
     def start_transpose(self):
         """Start the Transpose level (Level 1)."""
-        self.n = self.ask_matrix_size()
-        if self.n is None:
-            return
-        self.matriz = crear_matriz_aleatoria(self.n) 
-        self.start_frame.pack_forget()
-        self.show_game_screen("Transpuesta")
+        self.iniciar_nivel(TRANSPUESTA)
 
     def start_inverse(self):
         # Inicia nivel de inversa
-        if self.current_level < 2:
-            messagebox.showerror("Error", "Debes completar el Nivel 2 (Gauss Jordan) antes de avanzar al Nivel 3.")
-            return
-
-        self.n = self.ask_matrix_size()
-        if self.n is None:
-            return
-
-        # Crea matriz identidad y guarda matriz original
-
-        self.identidad = np.eye(self.n, dtype=object)
-        self.matriz = crear_matriz_aleatoria(self.n)
-        # Asegúrate de que self.matriz no sea None antes de copiar
-        if self.matriz is None:
-            self.msg_label = tk.Label(self.frame, text="Error: No se pudo crear la matriz.", fg="red")
-            self.msg_label.grid(row=0, column=0)
-            return
-        self.matriz_original = self.matriz.copy()
-
-        self.start_frame.pack_forget()
-        self.show_game_screen("Inversa")
+        self.iniciar_nivel(INVERSA)
 
     def ask_matrix_size(self):
         # Solicita tamaño de matriz
         try:
-            n = int(simpledialog.askstring("Tamaño de la matriz", "Ingresa el tamaño de la matriz cuadrada (2-5):"))
-            if n < 2 or n > 5:
-                raise ValueError
-            return n
+            n = int(simpledialog.askstring(
+                "Tamaño de la matriz",
+                f"Ingresa el tamaño de la matriz cuadrada ({TAMANO_MINIMO}-{TAMANO_MAXIMO}):"))
+            return self.sesion.validar_tamano(n)
         except (ValueError, TypeError):
-            messagebox.showerror("Error", "Por favor, ingresa un número válido entre 2 y 5.")
+            messagebox.showerror(
+                "Error", f"Por favor, ingresa un número válido entre {TAMANO_MINIMO} y {TAMANO_MAXIMO}.")
             return None
 
-    def show_game_screen(self, level, disable_controls=False):
-        # Muestra pantalla de juego
-        for widget in self.game_frame.winfo_children():
-            widget.destroy()
+    def mostrar_pantalla(self, clave, construir):
+        # Oculta la pantalla visible y muestra la de `clave`, construyéndola solo la primera vez
+        if self.pantalla_actual is not None:
+            self.pantalla_actual.frame.pack_forget()
+        pantalla = self.pantallas.get(clave)
+        if pantalla is None:
+            pantalla = self.pantallas[clave] = construir()
+        pantalla.frame.pack()
+        self.pantalla_actual = pantalla
+        self.visita += 1
+        return pantalla
+
+    def en_esta_pantalla(self, al_terminar):
+        """
+        Envuelve el al_terminar de una tarea que redibuja la pantalla
+        visible: si mientras tanto el jugador volvió al menú o cambió de
+        nivel, el resultado ya no corresponde a lo que se ve y se ignora.
+        """
+        visita = self.visita
+
+        def envoltura(resultado):
+            if self.visita == visita and self.pantalla_actual is not None:
+                al_terminar(resultado)
+        return envoltura
 
+    def show_game_screen(self, level, disable_controls=False):
+        # Muestra pantalla de juego reutilizando la ya construida para el nivel
+        # Las matrices grandes usan su propia versión de la pantalla, con cuadrículas virtuales
         self.game_frame.pack()
-        tk.Label(self.game_frame, text=f"Nivel: {level}", font=("Arial", 14)).pack(pady=10)
-
-        if level == "Transpuesta":
-
-            matriz_texto = formatear_matriz_para_mostrar(self.matriz)
-            tk.Label(self.game_frame, text="Matriz Original:", font=("Arial", 12)).pack(pady=5)
-            text_widget = tk.Text(self.game_frame, wrap="none", height=10, width=50)
-            text_widget.insert("1.0", matriz_texto)
-            text_widget.config(state="disabled")
-            text_widget.pack(pady=5)
-
-
-            self.entries = []  
-            tk.Label(self.game_frame, text="Ingresa la matriz transpuesta:", font=("Arial", 12)).pack(pady=5)
-            for i in range(self.n):
-                row_entries = []
-                row_frame = tk.Frame(self.game_frame)
-                row_frame.pack()
-                for j in range(self.n):
-                    entry = tk.Entry(row_frame, width=5, justify="center")
-                    entry.grid(row=i, column=j, padx=5, pady=5)
-                    row_entries.append(entry)
-                self.entries.append(row_entries)
-
-
-            tk.Button(self.game_frame, text="Resultado", command=self.mostrar_resultado_transpuesta).pack(pady=5)
-
-
-            tk.Button(self.game_frame, text="Terminar", command=self.verificar_transpuesta).pack(pady=5)
-
-
-            tk.Button(self.game_frame, text="Salir", command=self.salir_nivel).pack(pady=5)
-
-        elif level == "Inversa":
-            separador = np.array([["|"] for _ in range(self.n)], dtype=object)
-            matriz_combinada = np.hstack((self.matriz, separador, self.identidad))  
-            matriz_texto = formatear_matriz_para_mostrar(matriz_combinada)
-            self.matriz_label = tk.Label(self.game_frame, text=f"Matriz:\n{matriz_texto}", font=("Courier", 12))
-            self.matriz_label.pack(pady=5)
-            self.add_inverse_controls(disable_controls)
-        
-        elif level == "Gauss Jordan":
-            separador = np.array([["|"] for _ in range(self.n)], dtype=object)
-            # La identidad ahora tiene solo una columna
-            matriz_combinada = np.hstack((self.matriz, separador, self.identidad))  
-            matriz_texto = formatear_matriz_para_mostrar(matriz_combinada)
-            self.matriz_label = tk.Label(self.game_frame, text=f"Matriz:\n{matriz_texto}", font=("Courier", 12))
-            self.matriz_label.pack(pady=5)
-            self.add_gauss_controls(disable_controls)
+        grande = self.n > TAMANO_ETIQUETAS
+
+        if level == TRANSPUESTA:
+            pantalla = self.mostrar_pantalla(
+                (TRANSPUESTA, grande), lambda: PantallaTranspuesta(self.game_frame, self, grande))
+            pantalla.mostrar(self.matriz, self.n)
+
+        elif level == INVERSA:
+            pantalla = self.mostrar_pantalla(
+                (INVERSA, grande),
+                lambda: PantallaOperaciones(self.game_frame, INVERSA, self.botones_inversa(), grande))
+            pantalla.mostrar(self.sesion, disable_controls)
+
+        elif level == GAUSS_JORDAN:
+            # La parte derecha tiene COLUMNAS_DERECHA columnas: varios sistemas a la vez
+            pantalla = self.mostrar_pantalla(
+                (GAUSS_JORDAN, grande),
+                lambda: PantallaOperaciones(self.game_frame, GAUSS_JORDAN, self.botones_gauss(), grande))
+            pantalla.mostrar(self.sesion, disable_controls)
+
+        if instrumentacion.activa():
+            # Mide también el cálculo de geometría que Tk haría después
+            with instrumentacion.seccion("Tk.update_idletasks"):
+                self.root.update_idletasks()
 
     def mostrar_resultado_transpuesta(self):
         # Muestra matriz transpuesta
-        try:
-            transpuesta = self.matriz.T
-            matriz_texto = formatear_matriz_para_mostrar(transpuesta)
-            messagebox.showinfo("Resultado", f"Matriz transpuesta:\n{matriz_texto}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Ha ocurrido un error: {e}")
+        from logic.matrix_utils import formatear_matriz_para_mostrar
+
+        def calcular():
+            return formatear_matriz_para_mostrar(self.sesion.resultado_transpuesta())
+        self.tareas.enviar(
+            calcular, clave="resultado", al_fallar=self.mostrar_error,
+            al_terminar=lambda matriz_texto: messagebox.showinfo("Resultado", f"Matriz transpuesta:\n{matriz_texto}"))
 
     def mostrar_resultado_inversa(self):
         # Muestra matriz inversa
-        try:
-            self.inversa_correcta = obtener_matriz_inversa(self.matriz)  
+        from logic.matrix_utils import formatear_matriz_para_mostrar
+
+        def calcular():
+            inversa = self.sesion.resultado_inversa()
+            return inversa, None if inversa is None else formatear_matriz_para_mostrar(inversa)
+
+        def mostrar(resultado):
+            self.inversa_correcta, matriz_texto = resultado
             if self.inversa_correcta is None:
                 messagebox.showerror("Error", "La matriz no tiene inversa.")
                 return
-            matriz_texto = formatear_matriz_para_mostrar(self.inversa_correcta)
             messagebox.showinfo("Resultado", f"Matriz inversa:\n{matriz_texto}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Ha ocurrido un error: {e}")
 
-    def add_gauss_controls(self, disable_controls=False):
-        # Agrega controles nivel Gauss
-        if not disable_controls:
-            tk.Button(self.game_frame, text="Intercambiar filas", command=self.intercambiar_filas).pack(pady=5)
-            tk.Button(self.game_frame, text="Multiplicar fila por un escalar", command=self.multiplicar_fila).pack(pady=5)
-            tk.Button(self.game_frame, text="Sumar múltiplo de una fila a otra", command=self.sumar_filas).pack(pady=5)
-            tk.Button(self.game_frame, text="Terminar", command=self.terminar_nivel).pack(pady=5)
-        tk.Button(self.game_frame, text="Salir", command=self.quit_game).pack(pady=5)
+        self.tareas.enviar(calcular, al_terminar=mostrar, al_fallar=self.mostrar_error, clave="resultado",
+                           descripcion="Calculando la inversa…")
+
+    def botones_gauss(self):
+        # Botones del nivel Gauss (el último, Salir, queda visible aunque se deshabiliten los controles)
+        return [
+            ("Intercambiar filas", self.intercambiar_filas),
+            ("Multiplicar fila por un escalar", self.multiplicar_fila),
+            ("Sumar múltiplo de una fila a otra", self.sumar_filas),
+            ("Deshacer", self.deshacer_operacion),
+            ("Rehacer", self.rehacer_operacion),
+            ("Terminar", self.terminar_nivel),
+            ("Salir", self.quit_game),
+        ]
 
     def add_transpose_controls(self):
         # Agrega controles nivel Transpuesta
@@ -210,13 +298,18 @@ class Linealgame:
         tk.Button(self.game_frame, text="Terminar", command=self.verificar_transpuesta).pack(pady=5)
         tk.Button(self.game_frame, text="Salir", command=self.salir_nivel).pack(pady=5)
 
-    def add_inverse_controls(self, disable_controls=False):
-        if not disable_controls:
-            tk.Button(self.game_frame, text="Intercambiar filas", command=self.intercambiar_filas_inversa).pack(pady=5)
-            tk.Button(self.game_frame, text="Multiplicar fila por un escalar", command=self.multiplicar_fila_inversa).pack(pady=5)
-            tk.Button(self.game_frame, text="Sumar múltiplo de una fila a otra", command=self.sumar_filas_inversa).pack(pady=5)
-            tk.Button(self.game_frame, text="Terminar", command=self.terminar_nivel_inversa).pack(pady=5)
-        tk.Button(self.game_frame, text="Salir", command=self.quit_game).pack(pady=5)
+    def botones_inversa(self):
+        # Botones del nivel Inversa
+        return [
+            ("Intercambiar filas", self.intercambiar_filas_inversa),
+            ("Multiplicar fila por un escalar", self.multiplicar_fila_inversa),
+            ("Sumar múltiplo de una fila a otra", self.sumar_filas_inversa),
+            ("Deshacer", self.deshacer_operacion),
+            ("Rehacer", self.rehacer_operacion),
+            ("Resultado", self.mostrar_resultado_inversa),
+            ("Terminar", self.terminar_nivel_inversa),
+            ("Salir", self.quit_game),
+        ]
 
     def intercambiar_filas(self):
         try:
@@ -239,12 +332,8 @@ class Linealgame:
                 raise ValueError(f"Los índices de fila deben estar entre 1 y {self.n}.")
                 
             f1, f2 = f1 - 1, f2 - 1  
-            # Solo intercambiar las filas en la matriz principal
-            self.matriz, _ = aplicar_operacion_elemental(self.matriz, "intercambio", f1, f2)
-            # Generar nuevos valores aleatorios para la matriz derecha
-            self.identidad = np.random.randint(-10, 10, (self.n, 1)).astype(object)
-            self.actualizar_matriz()
-            messagebox.showinfo("Operación realizada", f"Se intercambiaron las filas {f1 + 1} y {f2 + 1}.")
+            self.aplicar_en_segundo_plano("intercambio", f1, f2, 1,
+                                          f"Se intercambiaron las filas {f1 + 1} y {f2 + 1}.")
         except ValueError as ve:
             messagebox.showerror("Error", f"{ve}")
         except Exception as e:
@@ -257,16 +346,13 @@ class Linealgame:
                 raise ValueError("No se ingresó ninguna entrada.")
             f1, factor = entrada.split()
             f1 = int(f1) - 1  
-            factor = float(eval(factor))  
+            from logic.entrada import interpretar_valor
+            factor = interpretar_valor(factor)
             if f1 < 0 or f1 >= self.n:
                 raise IndexError("El índice de la fila está fuera del rango de la matriz.")
-            # Solo aplicar la operación a la matriz principal
-            self.matriz, _ = aplicar_operacion_elemental(self.matriz, "multiplicacion", f1, factor=factor)
-            # Generar nuevos valores aleatorios para la matriz derecha
-            self.identidad = np.random.randint(-10, 10, (self.n, 1)).astype(object)
-            self.actualizar_matriz()
-            factor_formateado = Fraction(factor).limit_denominator() if factor != int(factor) else factor
-            messagebox.showinfo("Operación realizada", f"La fila {f1 + 1} fue multiplicada por {factor_formateado}.")
+            factor_formateado = factor.limit_denominator() if factor != int(factor) else factor
+            self.aplicar_en_segundo_plano("multiplicacion", f1, None, factor,
+                                          f"La fila {f1 + 1} fue multiplicada por {factor_formateado}.")
         except ValueError as ve:
             messagebox.showerror("Error", f"Entrada inválida: {ve}")
         except IndexError as ie:
@@ -288,22 +374,14 @@ class Linealgame:
                 raise ValueError("Debes ingresar exactamente tres valores separados por espacios.")
     
             f1, f2 = int(partes[0]) - 1, int(partes[1]) - 1  
-            factor = float(eval(partes[2]))  
+            from logic.entrada import interpretar_valor
+            factor = interpretar_valor(partes[2])
     
             if f1 < 0 or f1 >= self.n or f2 < 0 or f2 >= self.n:
                 raise IndexError("Los índices de las filas están fuera del rango de la matriz.")
     
-            # Solo aplicar la operación a la matriz principal
-            self.matriz, _ = aplicar_operacion_elemental(self.matriz, "suma", f2, f1, factor)
-
-            # Generar nuevos valores aleatorios para la matriz derecha
-            self.identidad = np.random.randint(-10, 10, (self.n, 1)).astype(object)
-
-            self.actualizar_matriz()
-            messagebox.showinfo(
-                "Operación realizada", 
-                f"Se sumó {factor} veces la fila {f1 + 1} a la fila {f2 + 1}."
-            )
+            self.aplicar_en_segundo_plano("suma", f2, f1, factor,
+                                          f"Se sumó {factor} veces la fila {f1 + 1} a la fila {f2 + 1}.")
         except ValueError as ve:
             messagebox.showerror("Error", f"Entrada inválida: {ve}")
         except IndexError as ie:
@@ -313,29 +391,53 @@ class Linealgame:
 
     def actualizar_matriz(self):
         # Actualiza visualización de matriz
-        separador = np.array([["|"] for _ in range(self.n)], dtype=object)
-        matriz_combinada = np.hstack((self.matriz, separador, self.identidad))  
-        matriz_texto = formatear_matriz_para_mostrar(matriz_combinada)
-        self.matriz_label.config(text=f"Matriz y Resultante\n{matriz_texto}")
+        # Solo se vuelven a formatear las filas (o celdas visibles) tocadas desde el último redibujo
+        self.pantalla_actual.actualizar(self.sesion, "Matriz y Resultante")
+
+    def deshacer_operacion(self):
+        # Deshace la última operación elemental (niveles Gauss Jordan e Inversa)
+        def deshecha(hecho):
+            if not hecho:
+                messagebox.showinfo("Deshacer", "No hay operaciones para deshacer.")
+                return
+            self.refrescar_matriz_aumentada()
+        self.tareas.enviar(self.sesion.deshacer, al_terminar=self.en_esta_pantalla(deshecha),
+                           al_fallar=self.mostrar_error, cancelable=False)
+
+    def rehacer_operacion(self):
+        # Rehace la última operación deshecha
+        def rehecha(hecho):
+            if not hecho:
+                messagebox.showinfo("Rehacer", "No hay operaciones para rehacer.")
+                return
+            self.refrescar_matriz_aumentada()
+        self.tareas.enviar(self.sesion.rehacer, al_terminar=self.en_esta_pantalla(rehecha),
+                           al_fallar=self.mostrar_error, cancelable=False)
+
+    def refrescar_matriz_aumentada(self):
+        # Elige la etiqueta según el nivel en curso
+        if self.sesion.nivel == INVERSA:
+            self.actualizar_matriz_inversa()
+        else:
+            self.actualizar_matriz()
 
     def terminar_nivel(self):
         # Valida matriz y finaliza nivel
-        try:
-            if verificar_forma_escalonada_reducida(self.matriz):
-                messagebox.showinfo("¡Correcto!", "¡Has completado el nivel correctamente!")
-                self.current_level = 2  
-                self.level3_button.config(state="normal")  
-                self.quit_game()
-            else:
-                messagebox.showerror("Incorrecto", "La matriz no está en forma escalonada reducida.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Ha ocurrido un error: {e}")
+        self.tareas.enviar(self.sesion.terminar_gauss, al_terminar=self.mostrar_veredicto,
+                           al_fallar=self.mostrar_error, clave="terminar", cancelable=False,
+                           descripcion="Verificando…")
 
     def quit_game(self):
         # Vuelve al menú principal
-        self.matriz = None  
-        for widget in self.game_frame.winfo_children():
-            widget.destroy()
+        # Lo que quede pendiente se descarta; la salida se encola detrás de la tarea en curso
+        self.tareas.cancelar()
+        self.volver_al_menu_en_sesion()
+        self.actualizar_botones_niveles()
+        # La pantalla se oculta y se conserva para el próximo nivel
+        if self.pantalla_actual is not None:
+            self.pantalla_actual.frame.pack_forget()
+            self.pantalla_actual = None
+        self.visita += 1
 
         self.game_frame.pack_forget()
         self.start_frame.pack()
@@ -360,11 +462,15 @@ class Linealgame:
                 elementos = fila.split()
                 if len(elementos) != self.n:
                     raise ValueError(f"Cada fila debe tener exactamente {self.n} elementos.")
-                matriz.append([Fraction(eval(x)) for x in elementos]) 
-
-            self.matriz = np.array(matriz, dtype=object)
-            self.actualizar_matriz()
-            messagebox.showinfo("Matriz actualizada", "La matriz fue ingresada correctamente.")
+                matriz.append(elementos)
+
+            def reemplazada(_):
+                self.actualizar_matriz()
+                messagebox.showinfo("Matriz actualizada", "La matriz fue ingresada correctamente.")
+            from logic.entrada import interpretar_matriz
+            self.tareas.enviar(self.sesion.reemplazar_matriz, interpretar_matriz(matriz),
+                               al_terminar=self.en_esta_pantalla(reemplazada),
+                               al_fallar=self.mostrar_error, cancelable=False)
         except ValueError as ve:
             messagebox.showerror("Error", f"Entrada inválida: {ve}")
         except Exception as e:
@@ -372,52 +478,19 @@ class Linealgame:
 
     def digitar_matriz_transpuesta(self):
         """Allow the user to manually input the transposed matrix using entry widgets."""
-        for widget in self.game_frame.winfo_children():
-            widget.destroy()
-
-        tk.Label(self.game_frame, text="Ingresa la matriz transpuesta:", font=("Arial", 14)).pack(pady=10)
-
+        # Reutiliza la pantalla de Transpuesta en modo de digitación
+        grande = self.n > TAMANO_ETIQUETAS
+        pantalla = self.mostrar_pantalla(
+            (TRANSPUESTA, grande), lambda: PantallaTranspuesta(self.game_frame, self, grande))
+        pantalla.mostrar(self.matriz, self.n, digitar=True)
 
-        matriz_texto = formatear_matriz_para_mostrar(self.matriz)
-        tk.Label(self.game_frame, text="Matriz Original:", font=("Arial", 12)).pack(pady=5)
-        text_widget = tk.Text(self.game_frame, wrap="none", height=10, width=50)
-        text_widget.insert("1.0", matriz_texto)
-        text_widget.config(state="disabled")
-        text_widget.pack(pady=5)
-
-
-        self.entries = []  
-        for i in range(self.n):
-            row_entries = []
-            row_frame = tk.Frame(self.game_frame)
-            row_frame.pack()
-            for j in range(self.n):
-                entry = tk.Entry(row_frame, width=5, justify="center")
-                entry.grid(row=i, column=j, padx=5, pady=5)
-                row_entries.append(entry)
-            self.entries.append(row_entries)
-
-
-        tk.Button(self.game_frame, text="Guardar", command=self.guardar_matriz_transpuesta).pack(pady=5)
-        tk.Button(self.game_frame, text="Terminar", command=self.verificar_transpuesta).pack(pady=5)
-        tk.Button(self.game_frame, text="Salir", command=self.salir_nivel).pack(pady=5)
+    def celdas_ingresadas(self):
+        # Textos de la cuadrícula de respuesta de la pantalla visible
+        return self.pantalla_actual.cuadricula.celdas()
 
     def guardar_matriz_transpuesta(self):
         try:
-            matriz_transpuesta = []
-            for i in range(self.n):
-                row = []
-                for j in range(self.n):
-                    value = self.entries[i][j].get()
-                    if not value.strip():  # Verifica si está vacío
-                        raise ValueError(f"El campo en fila {i+1}, columna {j+1} está vacío.")
-                    try:
-                        # Intenta convertir el valor a fracción
-                        row.append(Fraction(eval(value)))
-                    except Exception:
-                        raise ValueError(f"Valor inválido en fila {i+1}, columna {j+1}: '{value}'")
-                matriz_transpuesta.append(row)
-            self.matriz_transpuesta = np.array(matriz_transpuesta, dtype=object)
+            self.matriz_transpuesta = self.obtener_matriz_ingresada()
             messagebox.showinfo("Matriz guardada", "La matriz transpuesta fue ingresada correctamente.")
         except ValueError as ve:
             messagebox.showerror("Error", f"Entrada inválida: {ve}")
@@ -426,17 +499,9 @@ class Linealgame:
 
     def verificar_transpuesta(self):
         """Verifica si la matriz ingresada coincide con la transpuesta."""
-        try:
-            exito, mensaje = evaluar_entrada_transpuesta(self.matriz, self.entries)
-            if exito:
-                messagebox.showinfo("¡Correcto!", mensaje)
-                self.current_level = 1
-                self.level2_button.config(state="normal")
-                self.quit_game()
-            else:
-                messagebox.showerror("Incorrecto", mensaje)
-        except Exception as e:
-            messagebox.showerror("Error", f"Ha ocurrido un error: {e}")
+        self.tareas.enviar(self.sesion.verificar_transpuesta, self.celdas_ingresadas(),
+                           al_terminar=self.mostrar_veredicto, al_fallar=self.mostrar_error,
+                           clave="terminar", cancelable=False, descripcion="Verificando…")
 
     def intercambiar_filas_inversa(self):
         # Intercambia filas en nivel inversa
@@ -446,9 +511,8 @@ class Linealgame:
                 raise ValueError("No se ingresó ninguna entrada.")
             f1, f2 = map(int, entrada.split())
             f1, f2 = f1 - 1, f2 - 1  
-            self.matriz, self.identidad = aplicar_operacion_elemental(self.matriz, "intercambio", f1, f2, B=self.identidad)
-            self.actualizar_matriz_inversa()
-            messagebox.showinfo("Operación realizada", f"Se intercambiaron las filas {f1 + 1} y {f2 + 1}.")
+            self.aplicar_en_segundo_plano("intercambio", f1, f2, 1,
+                                          f"Se intercambiaron las filas {f1 + 1} y {f2 + 1}.")
         except Exception as e:
             messagebox.showerror("Error", f"Entrada inválida: {e}")
     
@@ -460,13 +524,13 @@ class Linealgame:
                 raise ValueError("No se ingresó ninguna entrada.")
             f1, factor = entrada.split()
             f1 = int(f1) - 1  
-            factor = float(eval(factor))  
+            from logic.entrada import interpretar_valor
+            factor = interpretar_valor(factor)
             if f1 < 0 or f1 >= self.n:
                 raise IndexError("El índice de la fila está fuera del rango de la matriz.")
-            self.matriz, self.identidad = aplicar_operacion_elemental(self.matriz, "multiplicacion", f1, factor=factor, B=self.identidad)
-            self.actualizar_matriz_inversa()
-            factor_formateado = Fraction(factor).limit_denominator() if factor != int(factor) else factor
-            messagebox.showinfo("Operación realizada", f"La fila {f1 + 1} fue multiplicada por {factor_formateado}.")
+            factor_formateado = factor.limit_denominator() if factor != int(factor) else factor
+            self.aplicar_en_segundo_plano("multiplicacion", f1, None, factor,
+                                          f"La fila {f1 + 1} fue multiplicada por {factor_formateado}.")
         except ValueError as ve:
             messagebox.showerror("Error", f"Entrada inválida: {ve}")
         except IndexError as ie:
@@ -488,17 +552,14 @@ class Linealgame:
                 raise ValueError("Debes ingresar exactamente tres valores separados por espacios.")
     
             f1, f2 = int(partes[0]) - 1, int(partes[1]) - 1  
-            factor = float(eval(partes[2]))  
+            from logic.entrada import interpretar_valor
+            factor = interpretar_valor(partes[2])
     
             if f1 < 0 or f1 >= self.n or f2 < 0 or f2 >= self.n:
                 raise IndexError("Los índices de las filas están fuera del rango de la matriz.")
     
-            self.matriz, self.identidad = aplicar_operacion_elemental(self.matriz, "suma", f2, f1, factor, B=self.identidad)
-            self.actualizar_matriz_inversa()
-            messagebox.showinfo(
-                "Operación realizada", 
-                f"Se sumó {factor} veces la fila {f1 + 1} a la fila {f2 + 1}."
-            )
+            self.aplicar_en_segundo_plano("suma", f2, f1, factor,
+                                          f"Se sumó {factor} veces la fila {f1 + 1} a la fila {f2 + 1}.")
         except ValueError as ve:
             messagebox.showerror("Error", f"Entrada inválida: {ve}")
         except IndexError as ie:
@@ -508,99 +569,33 @@ class Linealgame:
 
     def actualizar_matriz_inversa(self):
         # Actualiza visualización de matriz inversa
-        separador = np.array([["|"] for _ in range(self.n)], dtype=object)
-        matriz_combinada = np.hstack((self.matriz, separador, self.identidad))  
-        matriz_texto = formatear_matriz_para_mostrar(matriz_combinada)
-        self.matriz_label.config(text=f"Matriz y Identidad\n{matriz_texto}")
+        # Solo se vuelven a formatear las filas (o celdas visibles) tocadas desde el último redibujo
+        self.pantalla_actual.actualizar(self.sesion, "Matriz y Identidad")
 
     def terminar_nivel_inversa(self):
         # Verifica matriz inversa y finaliza nivel
-        try:
-            # Verificamos tamaño de matriz
-            if self.matriz.shape[0] != self.n or self.matriz.shape[1] != self.n:
-                messagebox.showerror("Error", f"La matriz no tiene el tamaño correcto ({self.n}x{self.n}).")
-                return
-                
-            # Primero, verificamos si la matriz izquierda es la identidad
-            identidad_esperada = np.eye(self.n, dtype=float)
-            matriz_float = self.matriz.astype(float)
-    
-            if not np.allclose(matriz_float, identidad_esperada, atol=1e-9):
-                messagebox.showerror("Incorrecto", "La matriz izquierda debe ser la matriz identidad.")
-                return
-    
-            # Ahora verificamos si la matriz derecha es la inversa de la matriz original
-            matriz_original_float = self.matriz_original.astype(float)
-            identidad_float = self.identidad.astype(float)
-    
-            # Verificamos que la matriz de identidad tenga dimensiones adecuadas
-            if identidad_float.shape[0] != self.n:
-                messagebox.showerror("Error", "La matriz de transformación no tiene las dimensiones correctas.")
-                return
-    
-            # Verificar si A * B = I (la matriz original multiplicada por la calculada es identidad)
-            try:
-                producto = np.dot(matriz_original_float, identidad_float)
-                
-                if np.allclose(producto, identidad_esperada, atol=1e-9):
-                    messagebox.showinfo("¡Correcto!", "¡Has calculado correctamente la matriz inversa!")
-                    self.current_level = 3
-                    self.quit_game()
-                else:
-                    messagebox.showerror("Incorrecto", "La matriz derecha no es la inversa de la matriz original.")
-            except ValueError:
-                messagebox.showerror("Error", "No se puede realizar el producto matricial. Verifica las dimensiones.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Ha ocurrido un error: {e}")
+        # La izquierda debe ser la identidad y A * B = I, con aritmética exacta
+        self.tareas.enviar(self.sesion.terminar_inversa, al_terminar=self.mostrar_veredicto,
+                           al_fallar=self.mostrar_error, clave="terminar", cancelable=False,
+                           descripcion="Verificando…")
 
     def verificar_inversa(self):
         """Verifica si la matriz ingresada coincide con la inversa calculada."""
-        try:
-            matriz_ingresada = []
-            for i in range(self.n):
-                row = []
-                for j in range(self.n):
-                    value = self.entries[i][j].get() 
-                    if not value.strip():  # Verifica si el campo está vacío
-                        raise ValueError("Todos los campos deben estar completos")
-                    row.append(Fraction(eval(value)))
-                matriz_ingresada.append(row)
-            matriz_ingresada = np.array(matriz_ingresada, dtype=object)
-            
-            # Verificar directamente si es la inversa correcta usando la función especializada
-            exito, mensaje = verificar_producto_es_identidad(self.matriz, matriz_ingresada)
-            
-            if exito:
-                messagebox.showinfo("¡Correcto!", mensaje)
-                self.current_level = 3
-                self.quit_game()
-            else:
-                messagebox.showerror("Incorrecto", mensaje)
-        except ValueError as ve:
-            messagebox.showerror("Error", f"Entrada inválida: {ve}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Ha ocurrido un error: {e}")
+        # Verificar directamente si es la inversa correcta usando la función especializada
+        self.tareas.enviar(self.sesion.verificar_inversa, self.celdas_ingresadas(),
+                           al_terminar=self.mostrar_veredicto, al_fallar=self.mostrar_error,
+                           clave="terminar", cancelable=False, descripcion="Verificando…")
 
     def obtener_matriz_ingresada(self):
         """Obtiene la matriz ingresada por el usuario desde los campos de entrada."""
-        matriz_ingresada = []
-        for i in range(self.n):
-            row = []
-            for j in range(self.n):
-                value = self.entries[i][j].get()
-                if not value.strip():  # Verifica si está vacío
-                    raise ValueError(f"El campo en fila {i+1}, columna {j+1} está vacío.")
-                try:
-                    # Intenta convertir el valor a fracción
-                    row.append(Fraction(eval(value)))
-                except Exception:
-                    raise ValueError(f"Valor inválido en fila {i+1}, columna {j+1}: '{value}'")
-            matriz_ingresada.append(row)
-        return np.array(matriz_ingresada, dtype=object)
+        # Valida celdas vacías o inválidas y convierte a fracciones exactas
+        from logic.entrada import interpretar_matriz
+        return interpretar_matriz(self.celdas_ingresadas())
 
     def calcular_resultado(self):
         # Calcula y muestra el resultado de la matriz inversa
         try:
+            from logic.matrix_utils import formatear_matriz_para_mostrar
             resultado = calcular_matriz_escalada(self.matriz, self.determinante)
             matriz_texto = formatear_matriz_para_mostrar(resultado)
             messagebox.showinfo("Resultado", f"Matriz escalada:\n{matriz_texto}")
@@ -609,12 +604,9 @@ class Linealgame:
     
     def salir_nivel(self):
         # Sale del nivel actual
-        self.matriz = None
         self.quit_game()
 
     def reset_to_level_1(self):
         # Reinicia al nivel 1
-        self.current_level = 0
-        self.level2_button.config(state="disabled")
-        self.level3_button.config(state="disabled")
+        self.tareas.enviar(self.sesion.reiniciar, al_fallar=self.mostrar_error, cancelable=False)
         self.salir_nivel()
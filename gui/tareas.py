@@ -0,0 +1,135 @@
+"""
+Ejecución de la lógica del juego fuera del hilo de Tk.
+
+Los callbacks de los botones envían el trabajo pesado (verificar un nivel,
+generar una matriz, aplicar una operación sobre una matriz grande) a un
+EjecutorTareas. El trabajo corre en un hilo aparte y el resultado vuelve a
+la interfaz con root.after, que revisa periódicamente las tareas pendientes
+mientras haya alguna; así la ventana sigue respondiendo y redibujándose.
+
+Se usa un único hilo de trabajo: las tareas se ejecutan de a una y en el
+orden en que se enviaron, por lo que la GameSession nunca se modifica desde
+dos hilos a la vez y los resultados llegan en orden. El hilo (y
+concurrent.futures, que arrastra logging) se crea con la primera tarea,
+después de mostrar la ventana.
+"""
+from time import perf_counter
+
+
+class Tarea:
+    __slots__ = ("futuro", "clave", "descripcion", "cancelable", "cancelada",
+                 "al_terminar", "al_fallar", "al_cancelar", "inicio")
+
+    def __init__(self, futuro, clave, descripcion, cancelable, al_terminar, al_fallar, al_cancelar):
+        self.futuro = futuro
+        self.clave = clave
+        self.descripcion = descripcion
+        self.cancelable = cancelable
+        self.cancelada = False
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self.al_cancelar = al_cancelar
+        self.inicio = perf_counter()
+
+
+class EjecutorTareas:
+    """
+    Ejecuta funciones en segundo plano y entrega sus resultados en el hilo
+    de Tk. `indicador` (opcional) es un IndicadorTarea que se muestra cuando
+    una tarea tarda más de `espera_indicador` segundos.
+    """
+
+    def __init__(self, root, indicador=None, intervalo_ms=30, espera_indicador=0.2):
+        self.root = root
+        self.indicador = indicador
+        self.intervalo_ms = intervalo_ms
+        self.espera_indicador = espera_indicador
+        self._hilo = None
+        self._pendientes = []  # En orden de envío
+        self._sondeo = None
+
+    @property
+    def ocupado(self):
+        return bool(self._pendientes)
+
+    def enviar(self, funcion, *args, al_terminar=None, al_fallar=None, al_cancelar=None,
+               clave=None, descripcion="Calculando…", cancelable=True):
+        """
+        Programa funcion(*args) en el hilo de trabajo. al_terminar(resultado)
+        o al_fallar(excepcion) se llaman luego en el hilo de Tk.
+
+        Si ya hay una tarea pendiente con la misma `clave` no se envía otra
+        (varios clics seguidos en el mismo botón cuentan como uno) y se
+        retorna False.
+
+        Una tarea cancelada que ya había empezado termina igual, pero su
+        resultado se descarta y se llama al_cancelar() para deshacer sus
+        efectos; las tareas que modifican la sesión deben enviarse con
+        cancelable=False o con un al_cancelar.
+        """
+        if clave is not None and any(t.clave == clave and not t.cancelada for t in self._pendientes):
+            return False
+        if self._hilo is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quizlineal")
+        futuro = self._hilo.submit(funcion, *args)
+        self._pendientes.append(Tarea(futuro, clave, descripcion, cancelable,
+                                      al_terminar, al_fallar, al_cancelar))
+        self._programar()
+        return True
+
+    def cancelar(self):
+        """Cancela las tareas cancelables pendientes. Retorna cuántas se cancelaron."""
+        canceladas = 0
+        for tarea in self._pendientes:
+            if tarea.cancelable and not tarea.cancelada:
+                tarea.cancelada = True
+                tarea.futuro.cancel()  # Solo tiene efecto si aún no empezó
+                canceladas += 1
+        self._actualizar_indicador()
+        return canceladas
+
+    def cerrar(self):
+        # Al salir del mainloop: espera a la tarea en curso y descarta las que no empezaron
+        if self._hilo is not None:
+            self._hilo.shutdown(wait=True, cancel_futures=True)
+
+    # -------------------- Entrega en el hilo de Tk --------------------
+
+    def _programar(self):
+        if self._sondeo is None:
+            self._sondeo = self.root.after(self.intervalo_ms, self._sondear)
+
+    def _sondear(self):
+        self._sondeo = None
+        try:
+            # Las tareas se entregan en orden: se espera a la más antigua
+            while self._pendientes and self._pendientes[0].futuro.done():
+                self._entregar(self._pendientes.pop(0))
+        finally:
+            self._actualizar_indicador()
+            if self._pendientes:
+                self._programar()
+
+    def _entregar(self, tarea):
+        futuro = tarea.futuro
+        if tarea.cancelada:
+            if not futuro.cancelled() and tarea.al_cancelar is not None:
+                tarea.al_cancelar()
+            return
+        excepcion = futuro.exception()
+        if excepcion is not None:
+            if tarea.al_fallar is None:
+                raise excepcion
+            tarea.al_fallar(excepcion)
+        elif tarea.al_terminar is not None:
+            tarea.al_terminar(futuro.result())
+
+    def _actualizar_indicador(self):
+        if self.indicador is None:
+            return
+        activas = [t for t in self._pendientes if not t.cancelada]
+        if activas and perf_counter() - activas[0].inicio >= self.espera_indicador:
+            self.indicador.mostrar(activas[0].descripcion, any(t.cancelable for t in activas))
+        else:
+            self.indicador.ocultar()
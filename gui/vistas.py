@@ -0,0 +1,379 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+# Pantallas reutilizables del juego. Cada pantalla se construye una sola vez
+# y al cambiar de nivel o de tamaño solo se actualizan textos, se muestran u
+# ocultan widgets y se vacían las celdas, sin destruir ni crear objetos Tcl.
+
+# Hasta este tamaño se usan etiquetas y un Entry por celda; más allá, las
+# matrices se muestran en una CuadriculaVirtual
+TAMANO_ETIQUETAS = 5
+
+
+class CuadriculaEntradas:
+    # Cuadrícula de tk.Entry que crece según haga falta y oculta las sobrantes
+    def __init__(self, padre):
+        self.frame = tk.Frame(padre)
+        self._celdas = []  # Filas de Entry ya construidas (cuadrado de lado len)
+        self.n = 0
+
+    def mostrar(self, n):
+        # Deja visibles y vacías exactamente n×n celdas
+        lado = max(n, len(self._celdas))
+        while len(self._celdas) < lado:
+            self._celdas.append([])
+        for i, fila in enumerate(self._celdas):
+            while len(fila) < lado:
+                entry = tk.Entry(self.frame, width=5, justify="center")
+                entry.grid(row=i, column=len(fila), padx=5, pady=5)
+                fila.append(entry)
+        for i, fila in enumerate(self._celdas):
+            for j, entry in enumerate(fila):
+                if i < n and j < n:
+                    entry.delete(0, tk.END)
+                    entry.grid()
+                else:
+                    entry.grid_remove()
+        self.n = n
+
+    @property
+    def entries(self):
+        return [fila[:self.n] for fila in self._celdas[:self.n]]
+
+    def celdas(self):
+        # Textos ingresados, como lista de filas
+        return [[entry.get() for entry in fila] for fila in self.entries]
+
+
+class CuadriculaVirtual:
+    # Cuadrícula sobre un Canvas que solo dibuja las celdas visibles.
+    # Los textos se piden a `valor(i, j)` al dibujar (o se guardan aquí si
+    # la cuadrícula es editable), así el costo de memoria y de redibujo
+    # depende del tamaño de la ventana y no de n.
+    ALTO_CELDA = 24
+    CARACTERES_MINIMOS = 5
+
+    def __init__(self, padre, valor=None, editable=False, ancho=640, alto=320):
+        self.frame = tk.Frame(padre)
+        self.fuente = tkfont.Font(family="Courier", size=11)
+        self.canvas = tk.Canvas(self.frame, width=ancho, height=alto, background="white",
+                                highlightthickness=0, yscrollincrement=self.ALTO_CELDA)
+        barra_y = tk.Scrollbar(self.frame, orient="vertical", command=self._desplazar_y)
+        barra_x = tk.Scrollbar(self.frame, orient="horizontal", command=self._desplazar_x)
+        self.canvas.config(yscrollcommand=barra_y.set, xscrollcommand=barra_x.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        barra_y.grid(row=0, column=1, sticky="ns")
+        barra_x.grid(row=1, column=0, sticky="ew")
+
+        self.valor = valor
+        self.editable = editable
+        self.filas = self.columnas = 0
+        self.columna_separador = None
+        self._valores = None  # Textos de la cuadrícula editable
+        self._caracteres = self.CARACTERES_MINIMOS
+        self._items = []  # Textos del canvas, reutilizados entre redibujos
+        self._separador = self.canvas.create_line(0, 0, 0, 0, state="hidden")
+        self._dibujo_pendiente = False
+        self._editor = None
+        self._editando = None
+
+        self.canvas.bind("<Configure>", lambda evento: self.programar_dibujo())
+        self.canvas.bind("<MouseWheel>", self._rueda)
+        self.canvas.bind("<Button-4>", lambda evento: self._desplazar_y("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda evento: self._desplazar_y("scroll", 3, "units"))
+        if editable:
+            self.canvas.bind("<Button-1>", self._clic)
+
+    # -------------------- Geometría --------------------
+
+    @property
+    def ancho_celda(self):
+        return self.fuente.measure("0") * self._caracteres + 12
+
+    def _x(self, j):
+        # Borde izquierdo de la columna j (deja media celda para el separador)
+        x = j * self.ancho_celda
+        if self.columna_separador is not None and j >= self.columna_separador:
+            x += self.ancho_celda // 2
+        return x
+
+    def _actualizar_region(self):
+        self.canvas.config(scrollregion=(0, 0, self._x(self.columnas), self.filas * self.ALTO_CELDA),
+                           xscrollincrement=self.ancho_celda)
+
+    def configurar(self, filas, columnas, columna_separador=None):
+        # Prepara la cuadrícula para una matriz nueva y vuelve al inicio
+        self._cerrar_editor(guardar=False)
+        self.filas, self.columnas = filas, columnas
+        self.columna_separador = columna_separador
+        self._caracteres = self.CARACTERES_MINIMOS
+        if self.editable:
+            self._valores = [[""] * columnas for _ in range(filas)]
+        self._actualizar_region()
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self.programar_dibujo()
+
+    # -------------------- Dibujo --------------------
+
+    def programar_dibujo(self):
+        # Junta varios pedidos de redibujo (desplazamientos, cambios) en uno solo
+        if not self._dibujo_pendiente:
+            self._dibujo_pendiente = True
+            self.canvas.after_idle(self._dibujar)
+
+    def refrescar(self, filas=None):
+        # Los valores se leen al dibujar: basta con redibujar lo visible
+        self.programar_dibujo()
+
+    def _texto(self, i, j):
+        if self.editable:
+            return self._valores[i][j] or "·"
+        return self.valor(i, j)
+
+    def _dibujar(self):
+        self._dibujo_pendiente = False
+        alto, ancho = self.ALTO_CELDA, self.ancho_celda
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        fila_inicio = max(0, int(y0 // alto))
+        fila_fin = min(self.filas, int((y0 + self.canvas.winfo_height()) // alto) + 1)
+        columna_inicio = max(0, int(x0 // ancho) - 1)
+        columna_fin = min(self.columnas, int((x0 + self.canvas.winfo_width()) // ancho) + 1)
+
+        usados = 0
+        mas_largo = 0
+        for i in range(fila_inicio, fila_fin):
+            y = i * alto + alto // 2
+            for j in range(columna_inicio, columna_fin):
+                texto = self._texto(i, j)
+                mas_largo = max(mas_largo, len(texto))
+                if usados == len(self._items):
+                    self._items.append(self.canvas.create_text(0, 0, anchor="e", font=self.fuente))
+                item = self._items[usados]
+                self.canvas.coords(item, self._x(j) + ancho - 6, y)
+                self.canvas.itemconfigure(item, text=texto, state="normal")
+                usados += 1
+        for item in self._items[usados:]:
+            self.canvas.itemconfigure(item, state="hidden")
+
+        if self.columna_separador is not None:
+            x = self._x(self.columna_separador) - ancho // 4
+            self.canvas.coords(self._separador, x, 0, x, self.filas * alto)
+            self.canvas.itemconfigure(self._separador, state="normal")
+        else:
+            self.canvas.itemconfigure(self._separador, state="hidden")
+
+        if mas_largo > self._caracteres:
+            # Las columnas solo se ensanchan, para que la vista no salte al desplazarse
+            self._caracteres = mas_largo
+            self._actualizar_region()
+            self.programar_dibujo()
+
+    # -------------------- Desplazamiento --------------------
+
+    def _desplazar_y(self, *argumentos):
+        self.canvas.yview(*argumentos)
+        self.programar_dibujo()
+
+    def _desplazar_x(self, *argumentos):
+        self.canvas.xview(*argumentos)
+        self.programar_dibujo()
+
+    def _rueda(self, evento):
+        pasos = -1 if evento.delta > 0 else 1
+        if evento.state & 0x1:  # Shift: desplazamiento horizontal
+            self._desplazar_x("scroll", pasos, "units")
+        else:
+            self._desplazar_y("scroll", 3 * pasos, "units")
+
+    # -------------------- Edición --------------------
+
+    def _clic(self, evento):
+        x, y = self.canvas.canvasx(evento.x), self.canvas.canvasy(evento.y)
+        i = int(y // self.ALTO_CELDA)
+        j = next((c for c in range(self.columnas) if self._x(c) <= x < self._x(c) + self.ancho_celda), None)
+        if j is not None and 0 <= i < self.filas:
+            self._editar(i, j)
+
+    def _editar(self, i, j):
+        # Un único Entry se coloca sobre la celda que se está editando
+        self._cerrar_editor(guardar=True)
+        if self._editor is None:
+            self._editor = tk.Entry(self.canvas, justify="center", font=self.fuente)
+            self._editor.bind("<Return>", lambda evento: self._mover(1, 0))
+            self._editor.bind("<Tab>", lambda evento: self._mover(0, 1))
+            self._editor.bind("<Escape>", lambda evento: self._cerrar_editor(guardar=False))
+            self._editor.bind("<FocusOut>", lambda evento: self._cerrar_editor(guardar=True))
+            self._ventana_editor = self.canvas.create_window(0, 0, window=self._editor, anchor="nw")
+        self._editando = (i, j)
+        self.canvas.coords(self._ventana_editor, self._x(j), i * self.ALTO_CELDA)
+        self.canvas.itemconfigure(self._ventana_editor, width=self.ancho_celda,
+                                  height=self.ALTO_CELDA, state="normal")
+        self._editor.delete(0, tk.END)
+        self._editor.insert(0, self._valores[i][j])
+        self._editor.focus_set()
+
+    def _mover(self, di, dj):
+        # Guarda la celda y pasa a la siguiente (abajo con Enter, derecha con Tab)
+        i, j = self._editando
+        j += dj
+        if j >= self.columnas:
+            i, j = i + 1, 0
+        i += di
+        self._cerrar_editor(guardar=True)
+        if i < self.filas:
+            self.canvas.yview_moveto(max(0, i - 2) / self.filas)
+            self._editar(i, j)
+            self.programar_dibujo()
+        return "break"
+
+    def _cerrar_editor(self, guardar):
+        if self._editando is None:
+            return
+        if guardar:
+            i, j = self._editando
+            self._valores[i][j] = self._editor.get().strip()
+        self._editando = None
+        self.canvas.itemconfigure(self._ventana_editor, state="hidden")
+        self.programar_dibujo()
+
+    def celdas(self):
+        # Textos ingresados, como lista de filas
+        self._cerrar_editor(guardar=True)
+        return [fila[:] for fila in self._valores]
+
+
+class PantallaTranspuesta:
+    # Nivel Transpuesta: matriz original y cuadrícula para la respuesta
+    # virtual: usa cuadrículas virtuales (matrices grandes)
+    def __init__(self, padre, app, virtual=False):
+        self.frame = tk.Frame(padre)
+        self.virtual = virtual
+        self.titulo = tk.Label(self.frame, font=("Arial", 14))
+        self.titulo.pack(pady=10)
+        tk.Label(self.frame, text="Matriz Original:", font=("Arial", 12)).pack(pady=5)
+        if virtual:
+            self.original = CuadriculaVirtual(self.frame, alto=200)
+            self.original.frame.pack(pady=5)
+        else:
+            self.texto = tk.Text(self.frame, wrap="none", height=10, width=50)
+            self.texto.pack(pady=5)
+        self.indicacion = tk.Label(self.frame, text="Ingresa la matriz transpuesta:", font=("Arial", 12))
+        self.indicacion.pack(pady=5)
+        self.cuadricula = CuadriculaVirtual(self.frame, editable=True, alto=200) if virtual else CuadriculaEntradas(self.frame)
+        self.cuadricula.frame.pack()
+        # Resultado en el juego, Guardar al digitar la matriz
+        self.boton_principal = tk.Button(self.frame)
+        self.boton_principal.pack(pady=5)
+        tk.Button(self.frame, text="Terminar", command=app.verificar_transpuesta).pack(pady=5)
+        tk.Button(self.frame, text="Salir", command=app.salir_nivel).pack(pady=5)
+        self.app = app
+
+    def mostrar(self, matriz, n, digitar=False):
+        if digitar:
+            self.titulo.config(text="Ingresa la matriz transpuesta:")
+            self.indicacion.pack_forget()
+            self.boton_principal.config(text="Guardar", command=self.app.guardar_matriz_transpuesta)
+        else:
+            self.titulo.config(text="Nivel: Transpuesta")
+            self.indicacion.pack(pady=5, before=self.cuadricula.frame)
+            self.boton_principal.config(text="Resultado", command=self.app.mostrar_resultado_transpuesta)
+        # NumPy se carga recién al mostrar un nivel (ver main.py)
+        from logic.matrix_utils import formatear_matriz_para_mostrar, formatear_elemento
+        if self.virtual:
+            self.original.valor = lambda i, j: formatear_elemento(matriz, i, j)
+            self.original.configurar(n, n)
+            self.cuadricula.configurar(n, n)
+            return
+        self.texto.config(state="normal")
+        self.texto.delete("1.0", tk.END)
+        self.texto.insert("1.0", formatear_matriz_para_mostrar(matriz))
+        self.texto.config(state="disabled")
+        self.cuadricula.mostrar(n)
+
+
+class PantallaOperaciones:
+    # Niveles Gauss Jordan e Inversa: matriz aumentada y botones de operaciones
+    # virtual: la matriz se dibuja en una CuadriculaVirtual (matrices grandes)
+    def __init__(self, padre, nivel, botones, virtual=False):
+        self.frame = tk.Frame(padre)
+        self.virtual = virtual
+        tk.Label(self.frame, text=f"Nivel: {nivel}", font=("Arial", 14)).pack(pady=10)
+        self.matriz_label = tk.Label(self.frame, font=("Courier", 12))
+        self.matriz_label.pack(pady=5)
+        if virtual:
+            self.cuadricula = CuadriculaVirtual(self.frame)
+            self.cuadricula.frame.pack(pady=5)
+        # Las operaciones se ocultan juntas cuando los controles están deshabilitados
+        self.controles = tk.Frame(self.frame)
+        self.controles.pack()
+        for texto, comando in botones[:-1]:
+            tk.Button(self.controles, text=texto, command=comando).pack(pady=5)
+        texto, comando = botones[-1]
+        self.salir = tk.Button(self.frame, text=texto, command=comando)
+        self.salir.pack(pady=5)
+
+    def mostrar(self, sesion, disable_controls=False):
+        from logic.matrix_utils import formatear_elemento
+        if self.virtual:
+            motor = sesion.motor
+            self.cuadricula.valor = lambda i, j: formatear_elemento(sesion.motor.matriz, i, j)
+            self.cuadricula.configurar(motor.n, motor.matriz.shape[1], motor.columnas_a)
+        self.actualizar(sesion, "Matriz:")
+        if disable_controls:
+            self.controles.pack_forget()
+        else:
+            self.controles.pack(before=self.salir)
+
+    def actualizar(self, sesion, encabezado):
+        # Refleja las operaciones aplicadas desde el último redibujo: la etiqueta o las celdas visibles
+        if self.virtual:
+            self.matriz_label.config(text=encabezado)
+            self.cuadricula.refrescar(sesion.motor.tomar_filas_sucias())
+        else:
+            self.matriz_label.config(text=f"{encabezado}\n{sesion.texto_matriz()}")
+
+
+class PantallaCompletado:
+    # Resumen del nivel 1 con la matriz y el paso al nivel 2
+    def __init__(self, padre, app):
+        self.frame = tk.Frame(padre)
+        self.texto = tk.Text(self.frame, wrap="none", height=10, width=50)
+        self.texto.pack()
+        tk.Button(self.frame, text="Continuar al Nivel 2 (Gauss Jordan)", command=app.next_level).pack()
+        tk.Button(self.frame, text="Salir", command=app.quit_game).pack()
+
+    def mostrar(self, texto_matriz):
+        self.texto.config(state="normal")
+        self.texto.delete("1.0", tk.END)
+        self.texto.insert("1.0", texto_matriz)
+        self.texto.config(state="disabled")
+
+
+class IndicadorTarea:
+    # Barra de "Calculando…" con botón Cancelar, visible mientras una tarea
+    # en segundo plano tarda (ver gui.tareas.EjecutorTareas)
+    def __init__(self, padre, cancelar):
+        self.frame = tk.Frame(padre)
+        self.etiqueta = tk.Label(self.frame, font=("Arial", 10))
+        self.etiqueta.pack(side="left", padx=5)
+        self.barra = ttk.Progressbar(self.frame, mode="indeterminate", length=120)
+        self.barra.pack(side="left", padx=5)
+        self.boton = tk.Button(self.frame, text="Cancelar", command=cancelar)
+        self.boton.pack(side="left", padx=5)
+        self.visible = False
+
+    def mostrar(self, descripcion, cancelable=True):
+        self.etiqueta.config(text=descripcion)
+        self.boton.config(state="normal" if cancelable else "disabled")
+        if not self.visible:
+            self.frame.pack(side="bottom", pady=5)
+            self.barra.start(15)
+            self.visible = True
+
+    def ocultar(self):
+        if self.visible:
+            self.barra.stop()
+            self.frame.pack_forget()
+            self.visible = False
@@ -0,0 +1,357 @@
+"""
+Análisis fuera de línea de registros de partidas.
+
+Lee bitácoras binarias (logic.bitacora) o archivos JSONL de eventos como
+un flujo de generadores, arma los intentos de cada nivel, los reproduce en
+varios procesos con la semántica de aplicar_operacion_elemental y acumula
+estadísticas por nivel: pasos hasta la forma escalonada reducida,
+operaciones deshechas (movimientos erróneos), inversas correctas y tiempo
+por nivel. La memoria no depende del tamaño de los registros: solo se
+guardan los intentos abiertos y un número acotado de lotes en vuelo, y el
+resumen se reescribe en disco cada cierto número de intentos.
+
+Formato JSONL: un evento por línea, con "sesion" (opcional, por defecto
+la ruta completa del archivo), "t" (segundos) y "tipo":
+    {"tipo": "inicio", "nivel": 2, "matriz": [["1", "2", "5"], ...], "columnas_a": 2}
+    {"tipo": "operacion", "operacion": "suma", "fila1": 1, "fila2": 0, "factor": "-3"}
+    {"tipo": "deshacer"}  {"tipo": "rehacer"}  {"tipo": "matriz", "matriz": ..., "columnas_a": 2}
+    {"tipo": "completado", "nivel": 2}  {"tipo": "salir"}  {"tipo": "reinicio"}
+
+Uso:
+    python -m logic.analisis registros/*.jsonl partida.bitacora \\
+        --salida estadisticas.json --procesos 4
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from fractions import Fraction
+import numpy as np
+from logic import bitacora as bit
+from logic.entrada import interpretar_valor
+from logic.generador import NIVEL_GAUSS, NIVEL_INVERSA
+from logic.matrix_utils import verificar_forma_escalonada_reducida
+from logic.motor import CODIGOS
+from logic.operations import aplicar_operacion_elemental, verificar_producto_es_identidad
+from logic.rational_matrix import LIMITE_INT64
+
+NOMBRES_EVENTO = {
+    bit.OPERACION: "operacion", bit.DESHACER: "deshacer", bit.REHACER: "rehacer",
+    bit.COMPLETADO: "completado", bit.INICIO: "inicio", bit.SALIR: "salir",
+    bit.REINICIO: "reinicio", bit.MATRIZ: "matriz",
+}
+_NOMBRES_OPERACION = {codigo: tipo for tipo, codigo in CODIGOS.items()}
+REGISTROS_POR_BLOQUE = 65536
+
+
+# ==================== LECTURA DE EVENTOS ====================
+
+def eventos_jsonl(ruta):
+    """Genera los eventos de un archivo JSONL, uno por línea."""
+    # Ruta completa: las bitácoras de distintos equipos suelen llamarse igual
+    sesion = os.path.abspath(ruta)
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            if linea.strip():
+                evento = json.loads(linea)
+                evento.setdefault("sesion", sesion)
+                yield evento
+
+
+def eventos_binarios(ruta):
+    """
+    Genera los eventos de una bitácora binaria leyendo bloques de registros.
+    Los registros VALOR se juntan en la matriz del INICIO o MATRIZ previo.
+    """
+    sesion = os.path.abspath(ruta)
+    with open(ruta, "rb") as archivo:
+        firma, cantidad, _ = bit.CABECERA.unpack(archivo.read(bit.CABECERA.size))
+        if firma != bit.FIRMA:
+            raise ValueError(f"El archivo {ruta} no es una bitácora válida.")
+        pendiente = None  # Evento con matriz que aún espera sus valores
+        faltan = 0
+        leidos = 0
+        while leidos < cantidad:
+            bloque = min(REGISTROS_POR_BLOQUE, cantidad - leidos)
+            registros = np.frombuffer(archivo.read(bloque * bit.TAMANO_REGISTRO), dtype=bit.TIPO_REGISTRO)
+            leidos += bloque
+            for tipo, nivel, codigo, fila1, fila2, num, den, instante in zip(
+                    registros["tipo"].tolist(), registros["nivel"].tolist(), registros["codigo"].tolist(),
+                    registros["fila1"].tolist(), registros["fila2"].tolist(),
+                    registros["num"].tolist(), registros["den"].tolist(), registros["instante"].tolist()):
+                if tipo == bit.VALOR:
+                    if pendiente is not None:
+                        pendiente["matriz"][fila1][fila2] = f"{Fraction(num, den)}"
+                        faltan -= 1
+                        if faltan == 0:
+                            yield pendiente
+                            pendiente = None
+                    continue
+                evento = {"sesion": sesion, "t": instante, "tipo": NOMBRES_EVENTO[tipo], "nivel": nivel}
+                if tipo == bit.OPERACION:
+                    evento.update(operacion=_NOMBRES_OPERACION[codigo], fila1=fila1,
+                                  fila2=None if fila2 < 0 else fila2, factor=f"{Fraction(num, den)}")
+                elif tipo in (bit.INICIO, bit.MATRIZ):
+                    evento.update(matriz=[[None] * num for _ in range(fila1)], columnas_a=fila2)
+                    pendiente, faltan = evento, fila1 * num
+                    if faltan:
+                        continue
+                    pendiente = None
+                yield evento
+
+
+def leer_eventos(rutas):
+    # Detecta el formato de cada archivo por su firma
+    for ruta in rutas:
+        with open(ruta, "rb") as archivo:
+            binario = archivo.read(len(bit.FIRMA)) == bit.FIRMA
+        yield from (eventos_binarios(ruta) if binario else eventos_jsonl(ruta))
+
+
+# ==================== INTENTOS POR NIVEL ====================
+
+def armar_intentos(eventos):
+    """
+    Agrupa los eventos de cada sesión en intentos de nivel. Deshacer y
+    rehacer se resuelven aquí: el intento lleva solo las operaciones
+    vigentes y cuenta las deshechas por tipo.
+    """
+    abiertos = {}
+    for evento in eventos:
+        sesion, tipo = evento["sesion"], evento["tipo"]
+        intento = abiertos.get(sesion)
+        if intento is not None:
+            intento["fin"] = evento.get("t", intento["fin"])
+
+        if tipo == "inicio":
+            if intento is not None:
+                yield abiertos.pop(sesion)
+            abiertos[sesion] = {
+                "sesion": sesion, "nivel": int(evento["nivel"]), "matriz": evento["matriz"],
+                "columnas_a": int(evento["columnas_a"]), "operaciones": [], "rehacer": [],
+                "deshechas": Counter(), "completado": False,
+                "inicio": evento.get("t"), "fin": evento.get("t"),
+            }
+        elif intento is None:
+            continue
+        elif tipo == "operacion":
+            intento["operaciones"].append(
+                (evento["operacion"], int(evento["fila1"]), evento.get("fila2"), str(evento.get("factor", "1"))))
+            intento["rehacer"].clear()
+        elif tipo == "deshacer" and intento["operaciones"]:
+            operacion = intento["operaciones"].pop()
+            intento["rehacer"].append(operacion)
+            intento["deshechas"][operacion[0]] += 1
+        elif tipo == "rehacer" and intento["rehacer"]:
+            intento["operaciones"].append(intento["rehacer"].pop())
+        elif tipo == "matriz":
+            # Matriz digitada: el intento sigue con la nueva matriz
+            intento.update(matriz=evento["matriz"], columnas_a=int(evento["columnas_a"]), operaciones=[])
+            intento["rehacer"].clear()
+        elif tipo == "completado":
+            intento["completado"] = True
+            yield abiertos.pop(sesion)
+        elif tipo in ("salir", "reinicio"):
+            yield abiertos.pop(sesion)
+    yield from abiertos.values()
+
+
+def lotes(iterable, tamano):
+    lote = []
+    for elemento in iterable:
+        lote.append(elemento)
+        if len(lote) == tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+# ==================== REPRODUCCIÓN ====================
+
+def analizar_intento(intento):
+    """
+    Reproduce un intento con aplicar_operacion_elemental y retorna un
+    resumen pequeño y serializable.
+    """
+    valores = [[interpretar_valor(str(x)) for x in fila] for fila in intento["matriz"]]
+    if all(v.denominator == 1 and abs(v) < LIMITE_INT64 for fila in valores for v in fila):
+        # Matriz entera: la reproducción toma el camino int64 de aplicar_operacion_elemental
+        matriz = np.array([[int(v) for v in fila] for fila in valores], dtype=np.int64)
+    else:
+        matriz = np.array(valores, dtype=object)
+    columnas_a = intento["columnas_a"]
+    A, B = matriz[:, :columnas_a], matriz[:, columnas_a:]
+    B = B if B.shape[1] else None
+    original = A.copy()
+    nivel = intento["nivel"]
+    eliminacion = nivel in (NIVEL_GAUSS, NIVEL_INVERSA)
+
+    pasos_a_rref = 0 if eliminacion and verificar_forma_escalonada_reducida(A) else None
+    for paso, (tipo, fila1, fila2, factor) in enumerate(intento["operaciones"], start=1):
+        A, B = aplicar_operacion_elemental(A, tipo, fila1, fila2, interpretar_valor(factor), B)
+        if eliminacion and pasos_a_rref is None and verificar_forma_escalonada_reducida(A):
+            pasos_a_rref = paso
+
+    resultado = {
+        "nivel": nivel,
+        "completado": intento["completado"],
+        "operaciones": len(intento["operaciones"]),
+        "deshechas": dict(intento["deshechas"]),
+        "segundos": (intento["fin"] - intento["inicio"]) if intento["inicio"] is not None else None,
+        "pasos_a_rref": pasos_a_rref,
+        "correcto": None,
+    }
+    if nivel == NIVEL_GAUSS:
+        resultado["correcto"] = bool(verificar_forma_escalonada_reducida(A))
+    elif nivel == NIVEL_INVERSA:
+        identidad = np.array_equal(A, np.eye(len(A), dtype=int))
+        resultado["correcto"] = identidad and B is not None and verificar_producto_es_identidad(original, B)[0]
+    if pasos_a_rref is not None:
+        # Operaciones aplicadas después de llegar a la forma reducida
+        resultado["sobrantes"] = len(intento["operaciones"]) - pasos_a_rref
+    return resultado
+
+
+def analizar_lote(intentos):
+    # Un intento mal formado (fila fuera de rango, factor ilegible) no detiene el lote
+    resultados = []
+    for intento in intentos:
+        try:
+            resultados.append(analizar_intento(intento))
+        except Exception as e:
+            resultados.append({"nivel": intento["nivel"], "invalido": True, "error": f"{type(e).__name__}: {e}"})
+    return resultados
+
+
+# ==================== ESTADÍSTICAS ====================
+
+class Estadisticas:
+    """Acumuladores por nivel; su tamaño no crece con el número de intentos."""
+
+    def __init__(self):
+        self.niveles = {}
+
+    def _nivel(self, nivel):
+        if nivel not in self.niveles:
+            self.niveles[nivel] = {
+                "intentos": 0, "completados": 0, "correctos": 0, "verificados": 0,
+                "discrepancias": 0, "invalidos": 0, "operaciones": 0, "sobrantes": 0,
+                "segundos_completados": 0.0, "con_tiempo": 0,
+                "deshechas": Counter(), "pasos_a_rref": Counter(),
+            }
+        return self.niveles[nivel]
+
+    def agregar(self, resultado):
+        datos = self._nivel(resultado["nivel"])
+        if resultado.get("invalido"):
+            # No se pudo reproducir: se cuenta aparte y no entra en los promedios
+            datos["invalidos"] += 1
+            return
+        datos["intentos"] += 1
+        datos["operaciones"] += resultado["operaciones"]
+        datos["sobrantes"] += resultado.get("sobrantes", 0)
+        datos["deshechas"].update(resultado["deshechas"])
+        if resultado["pasos_a_rref"] is not None:
+            datos["pasos_a_rref"][resultado["pasos_a_rref"]] += 1
+        if resultado["correcto"] is not None:
+            datos["verificados"] += 1
+            datos["correctos"] += resultado["correcto"]
+        if resultado["completado"]:
+            datos["completados"] += 1
+            # Completado según el registro pero incorrecto al reproducirlo
+            datos["discrepancias"] += resultado["correcto"] is False
+            if resultado["segundos"] is not None:
+                datos["segundos_completados"] += resultado["segundos"]
+                datos["con_tiempo"] += 1
+
+    def resumen(self):
+        resumen = {}
+        for nivel, datos in sorted(self.niveles.items()):
+            pasos = datos["pasos_a_rref"]
+            total_pasos = sum(pasos.values())
+            intentos = datos["intentos"]
+            resumen[str(nivel)] = {
+                "intentos": datos["intentos"],
+                "completados": datos["completados"],
+                "tasa_completados": datos["completados"] / intentos if intentos else None,
+                "correctos": datos["correctos"],
+                "verificados": datos["verificados"],
+                "discrepancias": datos["discrepancias"],
+                "invalidos": datos["invalidos"],
+                "operaciones_promedio": datos["operaciones"] / intentos if intentos else None,
+                "operaciones_sobrantes": datos["sobrantes"],
+                "segundos_promedio": (datos["segundos_completados"] / datos["con_tiempo"]
+                                      if datos["con_tiempo"] else None),
+                "pasos_a_rref_promedio": (sum(k * v for k, v in pasos.items()) / total_pasos
+                                          if total_pasos else None),
+                "pasos_a_rref": {str(k): v for k, v in sorted(pasos.items())},
+                "deshechas_por_tipo": dict(datos["deshechas"].most_common()),
+            }
+        return resumen
+
+    def escribir(self, ruta):
+        # Reemplazo atómico para que el archivo siempre tenga un resumen completo
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(self.resumen(), archivo, indent=2, ensure_ascii=False)
+        os.replace(temporal, ruta)
+
+
+def analizar_registros(rutas, salida, procesos=None, tamano_lote=256, cada=10000):
+    """
+    Reproduce todos los intentos de `rutas` en `procesos` procesos y
+    escribe el resumen en `salida` cada `cada` intentos y al terminar.
+    Retorna las Estadisticas.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    estadisticas = Estadisticas()
+    pendientes_lotes = lotes(armar_intentos(leer_eventos(rutas)), tamano_lote)
+    analizados, ultimo_escrito = 0, 0
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        # Se mantienen dos lotes en vuelo por proceso
+        pendientes = set()
+        for lote in pendientes_lotes:
+            pendientes.add(ejecutor.submit(analizar_lote, lote))
+            if len(pendientes) >= 2 * procesos:
+                break
+        while pendientes:
+            listas, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for tarea in listas:
+                for resultado in tarea.result():
+                    estadisticas.agregar(resultado)
+                    analizados += 1
+                siguiente = next(pendientes_lotes, None)
+                if siguiente is not None:
+                    pendientes.add(ejecutor.submit(analizar_lote, siguiente))
+            if analizados - ultimo_escrito >= cada:
+                estadisticas.escribir(salida)
+                ultimo_escrito = analizados
+
+    estadisticas.escribir(salida)
+    return estadisticas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduce registros de partidas y resume estadísticas por nivel.")
+    parser.add_argument("registros", nargs="+", help="archivos JSONL o bitácoras binarias")
+    parser.add_argument("--salida", required=True, help="archivo JSON con el resumen")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--lote", type=int, default=256, help="intentos por tarea")
+    parser.add_argument("--cada", type=int, default=10000, help="reescribe el resumen cada tantos intentos")
+    args = parser.parse_args(argv)
+
+    estadisticas = analizar_registros(args.registros, args.salida, args.procesos, args.lote, args.cada)
+    for nivel, datos in estadisticas.resumen().items():
+        promedio = datos["operaciones_promedio"]
+        print(f"Nivel {nivel}: {datos['intentos']} intentos, {datos['completados']} completados, "
+              f"{promedio if promedio is None else round(promedio, 1)} operaciones en promedio"
+              + (f", {datos['invalidos']} inválidos" if datos["invalidos"] else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Generación masiva de bancos de ejercicios con varios procesos.
+
+Algunas restricciones de dificultad necesitan una solución exacta por
+candidata y rechazan la gran mayoría, así que la búsqueda se reparte entre
+los núcleos con un ProcessPoolExecutor. Las matrices aceptadas se escriben
+en disco a medida que llegan (una por línea, en JSON).
+
+Uso:
+    python -m logic.banco --n 4 --cantidad 1000 --restriccion denominador:6 \\
+        --salida banco.jsonl --procesos 4 --semilla 1
+
+Restricciones:
+- denominador:D  inversa con todos los denominadores ≤ D
+- pivotes:K      exactamente K pivotes (rango K)
+- unimodular     determinante ±1 (inversa entera)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+from logic.eliminacion import obtener_matriz_inversa, rango, determinante
+from logic.generador import generar_candidatas
+
+
+def interpretar_restriccion(texto, n=None):
+    """
+    Convierte 'denominador:6', 'pivotes:3' o 'unimodular' en (nombre, valor).
+    Con `n`, además la valida para matrices n×n (ver validar_restriccion).
+    """
+    nombre, _, valor = texto.partition(":")
+    if nombre == "unimodular" and not valor:
+        restriccion = nombre, None
+    elif nombre in ("denominador", "pivotes") and valor.isdigit():
+        restriccion = nombre, int(valor)
+    else:
+        raise ValueError(f"Restricción no reconocida: {texto}")
+    if n is not None:
+        validar_restriccion(restriccion, n)
+    return restriccion
+
+
+def validar_restriccion(restriccion, n):
+    """
+    Lanza ValueError si ninguna matriz n×n puede cumplir la restricción;
+    sin esta revisión la búsqueda rechazaría candidatas para siempre.
+    """
+    nombre, valor = restriccion
+    if n < 1:
+        raise ValueError(f"El tamaño de las matrices debe ser al menos 1 (se pidió {n}).")
+    if nombre == "pivotes" and not 1 <= valor <= n:
+        raise ValueError(f"Una matriz {n}×{n} no nula tiene entre 1 y {n} pivotes (se pidieron {valor}).")
+    if nombre == "denominador" and valor < 1:
+        raise ValueError(f"Los denominadores son al menos 1 (se pidió denominador:{valor}).")
+
+
+def cumple_restriccion(matriz, restriccion):
+    # Verificación exacta de una candidata
+    nombre, valor = restriccion
+    if nombre == "pivotes":
+        return rango(matriz) == valor
+    if nombre == "unimodular":
+        return abs(determinante(matriz)) == 1
+    inversa = obtener_matriz_inversa(matriz)
+    if inversa is None:
+        return False
+    return all(f.denominator <= valor for f in inversa.a_fracciones().flat)
+
+
+def buscar_lote(semilla, n, restriccion, candidatas, bajo=-10, alto=10):
+    """
+    Tarea de un proceso: genera `candidatas` matrices y retorna
+    (aceptadas como listas, candidatas revisadas, segundos de CPU).
+    """
+    inicio = time.process_time()
+    rng = np.random.default_rng(semilla)
+    lote = generar_candidatas(rng, candidatas, n, bajo, alto)
+    aceptadas = [m.tolist() for m in lote if cumple_restriccion(m, restriccion)]
+    return aceptadas, candidatas, time.process_time() - inicio
+
+
+def generar_banco(salida, n, cantidad, restriccion, procesos=None, semilla=None,
+                  candidatas_por_tarea=2000):
+    """
+    Reparte la búsqueda entre procesos y escribe las matrices aceptadas
+    en `salida` (JSONL) a medida que llegan.
+
+    Retorna un diccionario con las métricas de rendimiento. Lanza
+    ValueError si la restricción no se puede cumplir con matrices n×n.
+    """
+    validar_restriccion(restriccion, n)
+    procesos = procesos or os.cpu_count() or 1
+    semillas = np.random.SeedSequence(semilla)
+    escritas, revisadas, cpu = 0, 0, 0.0
+    inicio = time.perf_counter()
+
+    with open(salida, "w", encoding="utf-8") as archivo, \
+            ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        def enviar():
+            return ejecutor.submit(buscar_lote, semillas.spawn(1)[0], n, restriccion, candidatas_por_tarea)
+
+        # Se mantienen dos tareas en vuelo por proceso
+        pendientes = {enviar() for _ in range(2 * procesos)}
+        while escritas < cantidad:
+            listas, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for tarea in listas:
+                aceptadas, vistas, segundos = tarea.result()
+                revisadas += vistas
+                cpu += segundos
+                for matriz in aceptadas[:cantidad - escritas]:
+                    archivo.write(json.dumps({"n": n, "matriz": matriz}) + "\n")
+                    escritas += 1
+                archivo.flush()
+                if escritas < cantidad:
+                    pendientes.add(enviar())
+        for tarea in pendientes:
+            tarea.cancel()
+
+    transcurrido = time.perf_counter() - inicio
+    return {
+        "aceptadas": escritas,
+        "revisadas": revisadas,
+        "tasa_aceptacion": escritas / revisadas if revisadas else 0.0,
+        "segundos": transcurrido,
+        "procesos": procesos,
+        "por_segundo": escritas / transcurrido if transcurrido else 0.0,
+        "por_segundo_por_nucleo": escritas / cpu if cpu else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera un banco de matrices con restricciones de dificultad.")
+    parser.add_argument("--n", type=int, required=True, help="tamaño de las matrices")
+    parser.add_argument("--cantidad", type=int, required=True, help="número de matrices a generar")
+    parser.add_argument("--restriccion", required=True, help="denominador:D, pivotes:K o unimodular")
+    parser.add_argument("--salida", required=True, help="archivo JSONL de salida")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--candidatas-por-tarea", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    try:
+        restriccion = interpretar_restriccion(args.restriccion, args.n)
+    except ValueError as e:
+        parser.error(str(e))
+
+    metricas = generar_banco(args.salida, args.n, args.cantidad, restriccion,
+                             args.procesos, args.semilla, args.candidatas_por_tarea)
+    print(f"{metricas['aceptadas']} matrices en {metricas['segundos']:.2f} s "
+          f"({metricas['revisadas']} candidatas, aceptación {metricas['tasa_aceptacion']:.2%})")
+    print(f"{metricas['por_segundo']:.1f} matrices/s en total, "
+          f"{metricas['por_segundo_por_nucleo']:.1f} matrices/s por núcleo "
+          f"con {metricas['procesos']} procesos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
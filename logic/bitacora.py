@@ -0,0 +1,255 @@
+"""
+Bitácora binaria de la partida, mapeada en memoria.
+
+Cada operación elemental y cada cambio de nivel se agrega como un registro
+de tamaño fijo (32 bytes) a un archivo mapeado con mmap, así escribir un
+registro es un struct.pack_into sobre memoria (unos pocos microsegundos) y
+el sistema operativo se encarga de llevarlo a disco.
+
+Formato del archivo:
+- cabecera de 32 bytes: firma FIRMA, número de registros y generación
+  (uint64; ver la compactación más abajo)
+- registros de 32 bytes según FORMATO_REGISTRO (ver TIPO_REGISTRO), con la
+  hora de escritura en segundos
+
+Al iniciar un nivel (o digitar una matriz) se escribe un registro INICIO
+(o MATRIZ) seguido de un registro VALOR por elemento de la matriz
+aumentada, así la bitácora sola basta para reproducir cada intento.
+
+El contador de la cabecera se actualiza después de escribir el registro,
+de modo que un corte a mitad de escritura nunca deja un registro a medias
+visible. El archivo crece por bloques duplicando su tamaño.
+
+Cada cierto número de registros (y al iniciar un nivel) se guarda una
+instantánea del estado completo en un archivo aparte, como JSON con solo
+números y textos (ver logic.serializacion): leerla nunca ejecuta código.
+Al arrancar se carga la última instantánea y solo se reproducen los
+registros posteriores, leídos de una vez con np.frombuffer, por lo que la
+recuperación no crece con la historia.
+
+Compactación: si después de una instantánea la bitácora pasa de
+`limite_registros`, sus registros se mueven a `ruta + ".1"` (la anterior
+pasa a ".2" y así hasta `rotaciones`; son bitácoras válidas para
+logic.analisis) y la bitácora vuelve a cero con la generación siguiente.
+Una instantánea de la generación anterior se tomó justo antes de rotar,
+así que describe el estado al comienzo de la generación actual.
+"""
+import json
+import mmap
+import os
+import struct
+import time
+from fractions import Fraction
+import numpy as np
+from logic.rational_matrix import RationalMatrix
+from logic.serializacion import ERRORES_LECTURA
+
+FIRMA = b"QLBITAC1"
+CABECERA = struct.Struct("<8sQQ8x")
+VERSION_INSTANTANEA = 1
+FORMATO_REGISTRO = struct.Struct("<BBbbhhqqII")
+TAMANO_REGISTRO = FORMATO_REGISTRO.size
+
+# Mismo formato que FORMATO_REGISTRO, para leer registros en bloque
+TIPO_REGISTRO = np.dtype([
+    ("tipo", "u1"), ("nivel", "u1"), ("codigo", "i1"), ("reservado", "i1"),
+    ("fila1", "<i2"), ("fila2", "<i2"), ("num", "<i8"), ("den", "<i8"),
+    ("secuencia", "<u4"), ("instante", "<u4"),
+])
+
+# Tipos de registro
+OPERACION = 1
+DESHACER = 2
+REHACER = 3
+COMPLETADO = 4
+INICIO = 5
+SALIR = 6
+REINICIO = 7
+MATRIZ = 8
+VALOR = 9
+
+LIMITE_FACTOR = 2 ** 63
+
+
+class Bitacora:
+    """
+    Bitácora de registros fijos en `ruta`, con instantáneas en
+    `ruta + ".instantanea"` cada `intervalo_instantanea` registros. Se
+    compacta después de una instantánea si supera `limite_registros`
+    (2 MiB con el valor por defecto), conservando `rotaciones` archivos.
+    """
+
+    def __init__(self, ruta, capacidad_inicial=4096, intervalo_instantanea=500,
+                 limite_registros=65536, rotaciones=2):
+        self.ruta = ruta
+        self.ruta_instantanea = ruta + ".instantanea"
+        self.capacidad_inicial = capacidad_inicial
+        self.intervalo_instantanea = intervalo_instantanea
+        self.limite_registros = limite_registros
+        self.rotaciones = rotaciones
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        os.makedirs(directorio, exist_ok=True)
+
+        nuevo = not os.path.exists(ruta) or os.path.getsize(ruta) < CABECERA.size
+        self._archivo = open(ruta, "w+b" if nuevo else "r+b")
+        if nuevo:
+            self._archivo.truncate(CABECERA.size + capacidad_inicial * TAMANO_REGISTRO)
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0)
+        if nuevo:
+            CABECERA.pack_into(self._mapa, 0, FIRMA, 0, 0)
+        # Las bitácoras sin generación tienen ceros en esos bytes: generación 0
+        firma, self._cantidad, self.generacion = CABECERA.unpack_from(self._mapa, 0)
+        if firma != FIRMA:
+            self.cerrar()
+            raise ValueError(f"El archivo {ruta} no es una bitácora válida.")
+        self._ultima_instantanea = self._leer_instantanea()[0]
+
+    def __len__(self):
+        return self._cantidad
+
+    # -------------------- Escritura --------------------
+
+    @staticmethod
+    def validar_factor(factor):
+        # Los factores y valores se guardan como numerador y denominador int64
+        if abs(factor.numerator) >= LIMITE_FACTOR or factor.denominator >= LIMITE_FACTOR:
+            raise ValueError("El factor es demasiado grande para guardarse en la bitácora.")
+
+    def _agregar(self, tipo, nivel=0, codigo=0, fila1=-1, fila2=-1, num=0, den=1):
+        desplazamiento = CABECERA.size + self._cantidad * TAMANO_REGISTRO
+        if desplazamiento + TAMANO_REGISTRO > len(self._mapa):
+            self._mapa.resize(CABECERA.size + 2 * (len(self._mapa) - CABECERA.size))
+        FORMATO_REGISTRO.pack_into(self._mapa, desplazamiento, tipo, nivel, codigo, 0,
+                                   fila1, fila2, num, den, self._cantidad & 0xFFFFFFFF, int(time.time()))
+        self._cantidad += 1
+        struct.pack_into("<Q", self._mapa, len(FIRMA), self._cantidad)
+
+    def registrar_operacion(self, nivel, codigo, fila1, fila2, factor):
+        """Agrega una operación elemental (factor como Fraction)."""
+        self._agregar(OPERACION, nivel, codigo, fila1, -1 if fila2 is None else fila2,
+                      factor.numerator, factor.denominator)
+
+    def registrar_evento(self, tipo, nivel=0):
+        # Deshacer, rehacer, nivel completado, salida...
+        self._agregar(tipo, nivel)
+
+    def registrar_matriz(self, tipo, nivel, matriz, columnas_a=None):
+        """
+        Agrega un registro INICIO o MATRIZ con la forma de la matriz
+        (fila1 = filas, fila2 = columnas de A, num = columnas totales)
+        y un registro VALOR por elemento.
+        """
+        matriz = RationalMatrix.desde(matriz)
+        filas, columnas = matriz.shape
+        valores = [(i, j, Fraction(int(x), int(d)))
+                   for i, (fila, d) in enumerate(zip(matriz.num, matriz.den)) for j, x in enumerate(fila)]
+        for _, _, valor in valores:
+            self.validar_factor(valor)
+        self._agregar(tipo, nivel, 0, filas, columnas if columnas_a is None else columnas_a, columnas)
+        for i, j, valor in valores:
+            self._agregar(VALOR, nivel, 0, i, j, valor.numerator, valor.denominator)
+
+    @property
+    def necesita_instantanea(self):
+        return self._cantidad - self._ultima_instantanea >= self.intervalo_instantanea
+
+    def guardar_instantanea(self, estado):
+        """
+        Guarda el estado completo (datos JSON) junto con el número de
+        registros que ya refleja. Se escribe en un temporal, se lleva a
+        disco y se reemplaza de forma atómica; luego se compacta si hace
+        falta.
+        """
+        self._escribir_instantanea(estado)
+        if self._cantidad >= self.limite_registros:
+            self._rotar()
+            self._escribir_instantanea(estado)
+
+    def _escribir_instantanea(self, estado):
+        datos = {"version": VERSION_INSTANTANEA, "generacion": self.generacion,
+                 "secuencia": self._cantidad, "estado": estado}
+        temporal = self.ruta_instantanea + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, separators=(",", ":"))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        self.sincronizar()
+        os.replace(temporal, self.ruta_instantanea)
+        self._ultima_instantanea = self._cantidad
+
+    def _rotar(self):
+        # Mueve los registros a ruta.1 (corriendo las anteriores) y deja la bitácora vacía
+        for k in range(self.rotaciones - 1, 0, -1):
+            if os.path.exists(f"{self.ruta}.{k}"):
+                os.replace(f"{self.ruta}.{k}", f"{self.ruta}.{k + 1}")
+        fin = CABECERA.size + self._cantidad * TAMANO_REGISTRO
+        if self.rotaciones > 0:
+            temporal = f"{self.ruta}.1.tmp"
+            with open(temporal, "wb") as archivo:
+                archivo.write(self._mapa[:fin])
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, f"{self.ruta}.1")
+
+        self.generacion += 1
+        self._cantidad = 0
+        CABECERA.pack_into(self._mapa, 0, FIRMA, 0, self.generacion)
+        self._mapa.resize(CABECERA.size + self.capacidad_inicial * TAMANO_REGISTRO)
+        self.sincronizar()
+
+    # -------------------- Lectura --------------------
+
+    def _leer_instantanea(self):
+        """
+        (registros que ya refleja la instantánea, sus datos) o (0, None) si
+        falta, está dañada o no corresponde a esta bitácora.
+        """
+        try:
+            with open(self.ruta_instantanea, encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            if datos["version"] != VERSION_INSTANTANEA:
+                return 0, None
+            generacion, secuencia = datos["generacion"], datos["secuencia"]
+            if type(generacion) is not int or type(secuencia) is not int or secuencia < 0:
+                return 0, None
+        except (OSError, *ERRORES_LECTURA):
+            return 0, None
+        if generacion == self.generacion:
+            return min(secuencia, self._cantidad), datos["estado"]
+        if generacion == self.generacion - 1:
+            # Tomada justo antes de compactar: vale para el comienzo de esta generación
+            return 0, datos["estado"]
+        return 0, None
+
+    def registros(self, desde=0):
+        """Registros desde el índice dado como arreglo estructurado (copia)."""
+        inicio = CABECERA.size + desde * TAMANO_REGISTRO
+        fin = CABECERA.size + self._cantidad * TAMANO_REGISTRO
+        return np.frombuffer(self._mapa[inicio:fin], dtype=TIPO_REGISTRO)
+
+    def cargar(self, leer_estado=None):
+        """
+        Retorna (estado de la última instantánea o None, registros posteriores)
+        para reconstruir la partida al arrancar. `leer_estado` convierte los
+        datos JSON en el estado; si lanza un error de lectura (ArchivoInvalido,
+        KeyError...) la instantánea se ignora y se retornan todos los registros.
+        """
+        secuencia, estado = self._leer_instantanea()
+        if estado is not None and leer_estado is not None:
+            try:
+                estado = leer_estado(estado)
+            except ERRORES_LECTURA:
+                return None, self.registros(0)
+        return estado, self.registros(secuencia if estado is not None else 0)
+
+    # -------------------- Cierre --------------------
+
+    def sincronizar(self):
+        # Fuerza la escritura a disco (no hace falta por operación)
+        self._mapa.flush()
+
+    def cerrar(self):
+        if not self._mapa.closed:
+            self._mapa.flush()
+            self._mapa.close()
+        self._archivo.close()
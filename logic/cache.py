@@ -0,0 +1,251 @@
+"""
+Caché de resultados esperados (transpuesta, forma escalonada reducida,
+rango, determinante e inversa) direccionada por contenido.
+
+La clave de una matriz es un hash BLAKE2 de sus bytes, su dtype y su forma,
+así dos sesiones con la misma matriz comparten los resultados aunque sean
+objetos distintos. Las matrices dtype=object (Fraction) y las
+RationalMatrix se llevan antes a numeradores y denominadores por fila, de
+modo que su clave no depende de cómo se construyeron.
+
+La memoria está acotada: cada entrada estima su tamaño en bytes y, al
+superar max_bytes, se desalojan las usadas hace más tiempo (LRU). Con una
+ruta, guardar() escribe las entradas en disco (en orden de uso, de forma
+atómica) y al crear la caché se cargan de nuevo, así la caché arranca
+caliente después de reiniciar el juego o el servidor. El archivo es JSON
+con solo números enteros (numeradores y denominadores) y flotantes: cargar
+uno ajeno o dañado nunca ejecuta código, y si no tiene la forma esperada la
+caché arranca vacía.
+
+Es segura para usar desde varios hilos (servidor, ejecutor de la GUI).
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+from fractions import Fraction
+import numpy as np
+from logic.rational_matrix import RationalMatrix
+from logic.serializacion import ArchivoInvalido, codificar, decodificar, ERRORES_LECTURA
+from logic.eliminacion import forma_escalonada_reducida, rango, determinante, obtener_matriz_inversa
+
+TRANSPUESTA = "transpuesta"
+RREF = "rref"
+RANGO = "rango"
+DETERMINANTE = "determinante"
+INVERSA = "inversa"
+
+CALCULOS = {
+    TRANSPUESTA: lambda A: np.array(A).T.copy(),
+    RREF: forma_escalonada_reducida,
+    RANGO: rango,
+    DETERMINANTE: determinante,
+    INVERSA: obtener_matriz_inversa,
+}
+
+MAX_BYTES = 64 * 2 ** 20
+BYTES_POR_OBJETO = 48  # Estimación para enteros de Python y Fraction pequeños
+VERSION_ARCHIVO = 1
+
+
+def clave(A):
+    """Hash del contenido de A (bytes, dtype y forma) como texto hexadecimal."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(A, np.ndarray) and A.dtype != object:
+        A = np.ascontiguousarray(A)
+        h.update(f"{A.dtype.str}{A.shape}".encode())
+        h.update(A.tobytes())
+        return h.hexdigest()
+    racional = RationalMatrix.desde(A)
+    h.update(f"racional{racional.shape}".encode())
+    for parte in (racional.num, racional.den):
+        if parte.dtype == object:
+            h.update(",".join(map(str, parte.flat)).encode())
+        else:
+            h.update(parte.astype(np.int64).tobytes())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def _tamano(valor):
+    # Bytes aproximados que ocupa un resultado
+    if isinstance(valor, RationalMatrix):
+        return _tamano(valor.num) + _tamano(valor.den)
+    if isinstance(valor, np.ndarray):
+        return valor.size * BYTES_POR_OBJETO if valor.dtype == object else valor.nbytes
+    if isinstance(valor, Fraction):
+        return BYTES_POR_OBJETO * 2
+    return BYTES_POR_OBJETO
+
+
+def _copia(valor):
+    # Los resultados se entregan como copias: quien los recibe puede modificarlos
+    if isinstance(valor, (RationalMatrix, np.ndarray)):
+        return valor.copy()
+    return valor
+
+
+def _leer_entradas(archivo):
+    # Lista [((tipo, clave), valor)] de la menos a la más usada; ArchivoInvalido si algo no encaja
+    datos = json.load(archivo)
+    if not isinstance(datos, dict) or datos.get("version") != VERSION_ARCHIVO:
+        raise ArchivoInvalido("Versión de archivo desconocida.")
+    entradas = datos.get("entradas")
+    if not isinstance(entradas, list):
+        raise ArchivoInvalido("Faltan las entradas.")
+    leidas = []
+    for entrada in entradas:
+        if not isinstance(entrada, list) or len(entrada) != 3:
+            raise ArchivoInvalido("Entrada mal formada.")
+        tipo, llave, valor = entrada
+        if tipo not in CALCULOS or not isinstance(llave, str):
+            raise ArchivoInvalido("Clave de entrada inválida.")
+        leidas.append(((tipo, llave), decodificar(valor)))
+    return leidas
+
+
+class CacheResultados:
+    """
+    Caché LRU de resultados por (tipo de cálculo, clave de la matriz).
+    `ruta` (opcional) es el archivo donde se guardan y cargan las entradas.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, ruta=None):
+        self.max_bytes = max_bytes
+        self.ruta = ruta
+        self._entradas = OrderedDict()  # (tipo, clave) → (valor, bytes), de la menos a la más usada
+        self._bytes = 0
+        self._cerrojo = threading.Lock()
+        self.aciertos = Counter()
+        self.fallos = Counter()
+        self.desalojos = 0
+        if ruta is not None:
+            self.cargar()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @property
+    def bytes(self):
+        return self._bytes
+
+    # -------------------- Consulta --------------------
+
+    def buscar(self, tipo, A):
+        """
+        Retorna (encontrado, valor) sin calcular nada; cuenta acierto o fallo.
+        Sirve cuando calcular es más caro que verificar de otra forma.
+        """
+        llave = (tipo, clave(A))
+        with self._cerrojo:
+            entrada = self._entradas.get(llave)
+            if entrada is None:
+                self.fallos[tipo] += 1
+                return False, None
+            self._entradas.move_to_end(llave)
+            self.aciertos[tipo] += 1
+            return True, _copia(entrada[0])
+
+    def obtener(self, tipo, A):
+        """Resultado `tipo` (uno de CALCULOS) para A, calculándolo solo si falta."""
+        if tipo not in CALCULOS:
+            raise ValueError(f"Cálculo desconocido: {tipo}.")
+        encontrado, valor = self.buscar(tipo, A)
+        if encontrado:
+            return valor
+        # Se calcula fuera del cerrojo: otro hilo puede calcular lo mismo a la vez
+        valor = CALCULOS[tipo](A)
+        self._guardar_entrada((tipo, clave(A)), valor)
+        return _copia(valor)
+
+    def _guardar_entrada(self, llave, valor):
+        tamano = _tamano(valor)
+        if tamano > self.max_bytes:
+            return
+        with self._cerrojo:
+            anterior = self._entradas.pop(llave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            self._entradas[llave] = (valor, tamano)
+            self._bytes += tamano
+            while self._bytes > self.max_bytes:
+                _, (_, liberado) = self._entradas.popitem(last=False)
+                self._bytes -= liberado
+                self.desalojos += 1
+
+    def limpiar(self):
+        with self._cerrojo:
+            self._entradas.clear()
+            self._bytes = 0
+
+    # -------------------- Métricas --------------------
+
+    def metricas(self):
+        """Aciertos, fallos y tasa por tipo, más ocupación y desalojos."""
+        with self._cerrojo:
+            por_tipo = {}
+            for tipo in CALCULOS:
+                aciertos, fallos = self.aciertos[tipo], self.fallos[tipo]
+                consultas = aciertos + fallos
+                por_tipo[tipo] = {
+                    "aciertos": aciertos,
+                    "fallos": fallos,
+                    "tasa_aciertos": aciertos / consultas if consultas else None,
+                }
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "desalojos": self.desalojos,
+                "por_tipo": por_tipo,
+            }
+
+    # -------------------- Persistencia --------------------
+
+    def guardar(self):
+        """Escribe las entradas en self.ruta (temporal y reemplazo atómico)."""
+        if self.ruta is None:
+            return
+        with self._cerrojo:
+            entradas = [(llave, valor) for llave, (valor, _) in self._entradas.items()]
+        datos = {
+            "version": VERSION_ARCHIVO,
+            "entradas": [[tipo, llave, codificar(valor)] for (tipo, llave), valor in entradas],
+        }
+        directorio = os.path.dirname(os.path.abspath(self.ruta))
+        os.makedirs(directorio, exist_ok=True)
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, separators=(",", ":"))
+        os.replace(temporal, self.ruta)
+
+    def cargar(self):
+        """
+        Agrega las entradas guardadas en self.ruta, respetando max_bytes.
+        Retorna cuántas se cargaron. Si el archivo falta, está dañado o no
+        tiene la forma esperada no se carga ninguna.
+        """
+        try:
+            with open(self.ruta, encoding="utf-8") as archivo:
+                entradas = _leer_entradas(archivo)
+        except (OSError, *ERRORES_LECTURA):
+            # ValueError incluye JSON y UTF-8 inválidos y ArchivoInvalido
+            return 0
+        # Se guardaron de la menos a la más usada: el orden LRU se conserva
+        for llave, valor in entradas:
+            self._guardar_entrada(llave, valor)
+        return len(entradas)
+
+
+_compartida = None
+_cerrojo_compartida = threading.Lock()
+
+
+def compartida():
+    """Caché del proceso que usan las sesiones creadas sin una caché propia."""
+    global _compartida
+    with _cerrojo_compartida:
+        if _compartida is None:
+            _compartida = CacheResultados()
+        return _compartida
@@ -0,0 +1,268 @@
+from fractions import Fraction
+import numpy as np
+from logic.rational_matrix import RationalMatrix, LIMITE_INT64, _max_abs
+from logic.modular import determinante_modular, adjunta_modular
+from logic.instrumentacion import medir
+
+# A partir de este tamaño, determinante e inversa de matrices con
+# numeradores int64 usan la eliminación multimodular (logic.modular)
+UMBRAL_MODULAR = 40
+
+# ==================== ELIMINACIÓN LIBRE DE FRACCIONES (BAREISS) ====================
+# El algoritmo de Bareiss elimina sobre enteros sin introducir fracciones:
+# en cada paso se multiplica por el pivote actual y se divide de forma exacta
+# por el pivote anterior. Todos los valores intermedios son menores
+# (subdeterminantes) de la matriz original, así que siempre son enteros y
+# su tamaño crece de forma controlada, sin cálculos de mcd en cada celda.
+#
+# Se usa la variante Gauss-Jordan: en cada pivote se eliminan también las
+# filas de arriba, de modo que al final cada fila pivote tiene un único
+# valor no nulo en su columna pivote.
+
+
+def _a_enteros(A):
+    """
+    Lleva A a una matriz entera N con A = diag(1/d)·N.
+    Retorna (N, d) donde d es el vector de denominadores por fila.
+    """
+    racional = RationalMatrix.desde(A)
+    return racional.num.copy(), racional.den.copy()
+
+
+def _gauss_jordan_bareiss(M, columnas_pivote=None, solo_abajo=False):
+    """
+    Gauss-Jordan libre de fracciones sobre la matriz entera M (se modifica).
+
+    Parámetros:
+    - M: arreglo entero (int64 u object)
+    - columnas_pivote: número de columnas donde se buscan pivotes
+      (por defecto todas; para [N | I] solo las de N)
+    - solo_abajo: si es True solo se eliminan las filas bajo el pivote
+      (Bareiss clásico, suficiente para rango y determinante y unas
+      tres veces más barato que la reducción completa)
+
+    Retorna (M, pivotes, signo) donde pivotes es la lista de columnas
+    pivote en orden de filas y signo es (-1)^(intercambios).
+    """
+    filas, columnas = M.shape
+    if columnas_pivote is None:
+        columnas_pivote = columnas
+    pivotes = []
+    signo = 1
+    anterior = 1
+    r = 0
+
+    for c in range(columnas_pivote):
+        if r == filas:
+            break
+        # Primer pivote no nulo en la columna, desde la fila r
+        candidatos = np.flatnonzero(M[r:, c])
+        if candidatos.size == 0:
+            continue
+        k = r + int(candidatos[0])
+        if k != r:
+            M[[r, k]] = M[[k, r]]
+            signo = -signo
+
+        pivote = int(M[r, c])
+        # Bloque afectado: todas las filas o solo las de abajo (desde la columna c)
+        bloque = M[r:, c:] if solo_abajo else M
+        fila_r = (M[r, c:] if solo_abajo else M[r]).copy()
+        columna = bloque[:, 0].copy() if solo_abajo else M[:, c].copy()
+        columna[0 if solo_abajo else r] = 0
+        # Cota del paso pivote·M - columna⊗fila_r antes de la división exacta
+        cota = abs(pivote) * _max_abs(bloque) + _max_abs(columna) * _max_abs(fila_r)
+        if M.dtype != object and cota >= LIMITE_INT64:
+            M = M.astype(object)
+            bloque = M[r:, c:] if solo_abajo else M
+            columna = columna.astype(object)
+            fila_r = fila_r.astype(object)
+
+        bloque *= pivote
+        bloque -= np.outer(columna, fila_r)
+        bloque //= anterior
+        bloque[0 if solo_abajo else r] = fila_r
+
+        pivotes.append(c)
+        anterior = pivote
+        r += 1
+
+    return M, pivotes, signo
+
+
+@medir
+def forma_escalonada_reducida(A):
+    """
+    Calcula la forma escalonada reducida exacta de A.
+    Retorna una RationalMatrix.
+    """
+    N, _ = _a_enteros(A)
+    M, pivotes, _ = _gauss_jordan_bareiss(N)
+    # Cada fila pivote se divide por su pivote; el signo va al numerador
+    den = np.ones(M.shape[0], dtype=M.dtype)
+    for r, c in enumerate(pivotes):
+        p = M[r, c]
+        if p < 0:
+            M[r] = -M[r]
+            p = -p
+        den[r] = p
+    return RationalMatrix(M, den)
+
+
+@medir
+def rango(A):
+    """Rango de A: número de pivotes de la eliminación."""
+    N, _ = _a_enteros(A)
+    _, pivotes, _ = _gauss_jordan_bareiss(N, solo_abajo=True)
+    return len(pivotes)
+
+
+@medir
+def determinante(A):
+    """
+    Determinante exacto de una matriz cuadrada.
+
+    Con Bareiss, el último pivote es det(N) salvo el signo de los
+    intercambios. Como A = diag(1/d)·N, det(A) = det(N) / Πd.
+    Retorna un Fraction (entero si los datos lo son).
+    """
+    N, d = _a_enteros(A)
+    n, m = N.shape
+    if n != m:
+        raise ValueError("El determinante solo está definido para matrices cuadradas.")
+    if n == 0:
+        return Fraction(1)
+    producto_den = 1
+    for x in d:
+        producto_den *= int(x)
+    if n >= UMBRAL_MODULAR and N.dtype != object:
+        return Fraction(determinante_modular(N), producto_den)
+    M, pivotes, signo = _gauss_jordan_bareiss(N, solo_abajo=True)
+    if len(pivotes) < n:
+        return Fraction(0)
+    return Fraction(signo * int(M[n - 1, n - 1]), producto_den)
+
+
+@medir
+def obtener_matriz_inversa(A):
+    """
+    Calcula la inversa exacta de A eliminando sobre [N | I].
+
+    Al terminar, la parte izquierda es det·I y la derecha es det·N⁻¹.
+    Como A = diag(1/d)·N, A⁻¹ = N⁻¹·diag(d): cada columna j se multiplica
+    por d_j. Retorna una RationalMatrix, o None si A es singular.
+
+    Para n ≥ UMBRAL_MODULAR se obtienen det y adj(N) = det·N⁻¹ por
+    eliminación multimodular, que es mucho más rápida en ese rango.
+    """
+    N, d = _a_enteros(A)
+    n, m = N.shape
+    if n != m:
+        raise ValueError("Solo las matrices cuadradas pueden tener inversa.")
+    if n >= UMBRAL_MODULAR and N.dtype != object:
+        det, derecha = adjunta_modular(N)
+        if det == 0:
+            return None
+        d = d.astype(object)
+    else:
+        aumentada = np.hstack((N, np.eye(n, dtype=N.dtype)))
+        M, pivotes, _ = _gauss_jordan_bareiss(aumentada, columnas_pivote=n)
+        if len(pivotes) < n:
+            return None
+        derecha = M[:, n:]
+        det = M[n - 1, n - 1] if n else 1
+
+    if det < 0:
+        derecha, det = -derecha, -det
+    if np.any(d != 1):
+        cota = _max_abs(derecha) * _max_abs(d)
+        if derecha.dtype != object and cota >= LIMITE_INT64:
+            derecha, d = derecha.astype(object), d.astype(object)
+        derecha = derecha * d[None, :]
+    return RationalMatrix(derecha, np.full(n, det, dtype=derecha.dtype))
+
+
+# ==================== SISTEMAS CON VARIAS PARTES DERECHAS ====================
+# A·X = B se resuelve para todas las columnas de B a la vez: una sola
+# eliminación de Bareiss sobre [N_A | N_B] (pivotes solo en las columnas de
+# A), donde cada paso actualiza las k columnas derechas con las mismas
+# operaciones vectorizadas. El costo extra por columna de B es lineal.
+
+UNICA = "única"
+INFINITAS = "infinitas"
+SIN_SOLUCION = "sin solución"
+
+
+class SolucionSistemas:
+    """
+    Resultado de resolver_sistemas(A, B) para las k columnas de B.
+
+    - X: RationalMatrix (columnas de A × k) con una solución por columna;
+      las variables libres valen 0 y las columnas sin solución quedan en 0
+    - rango: rango de A
+    - pivotes: columnas pivote de A (las demás son variables libres)
+    - consistentes: arreglo booleano de largo k
+    """
+
+    __slots__ = ("X", "rango", "pivotes", "consistentes")
+
+    def __init__(self, X, rango, pivotes, consistentes):
+        self.X = X
+        self.rango = rango
+        self.pivotes = pivotes
+        self.consistentes = consistentes
+
+    @property
+    def incognitas(self):
+        return self.X.shape[0]
+
+    @property
+    def inconsistentes(self):
+        # Índices de los sistemas sin solución
+        return np.flatnonzero(~self.consistentes)
+
+    @property
+    def indeterminados(self):
+        # Índices de los sistemas con infinitas soluciones
+        return np.flatnonzero(self.consistentes & (self.rango < self.incognitas))
+
+    def estado(self, j):
+        """UNICA, INFINITAS o SIN_SOLUCION para el sistema j."""
+        if not self.consistentes[j]:
+            return SIN_SOLUCION
+        return UNICA if self.rango == self.incognitas else INFINITAS
+
+
+@medir
+def resolver_sistemas(A, B):
+    """
+    Resuelve A·X = B de forma exacta para cada columna de B (un vector se
+    toma como una sola columna). Retorna un SolucionSistemas.
+
+    Llevar cada fila de [A | B] a un denominador común no cambia las
+    soluciones, así que se elimina directamente sobre los numeradores.
+    """
+    A = RationalMatrix.desde(A)
+    B = RationalMatrix.desde(B)
+    filas, incognitas = A.shape
+    if len(B) != filas:
+        raise ValueError("A y B deben tener el mismo número de filas.")
+    k = B.shape[1]
+
+    M, pivotes, _ = _gauss_jordan_bareiss(A.hstack(B).num, columnas_pivote=incognitas)
+    rango = len(pivotes)
+    # Una fila nula en A con parte derecha no nula es una ecuación 0 = b
+    consistentes = ~np.any(M[rango:, incognitas:] != 0, axis=0)
+
+    num = np.zeros((incognitas, k), dtype=M.dtype)
+    den = np.ones(incognitas, dtype=M.dtype)
+    for r, c in enumerate(pivotes):
+        # En Gauss-Jordan la fila r fija la incógnita c: p·x_c + (libres) = derecha
+        p = M[r, c]
+        derecha = M[r, incognitas:]
+        if p < 0:
+            p, derecha = -p, -derecha
+        num[c] = derecha
+        den[c] = p
+    num[:, ~consistentes] = 0
+    return SolucionSistemas(RationalMatrix(num, den), rango, pivotes, consistentes)
@@ -0,0 +1,63 @@
+import re
+from fractions import Fraction
+from functools import lru_cache
+import numpy as np
+from logic.instrumentacion import medir
+
+# ==================== LECTURA DE VALORES INGRESADOS ====================
+# Las celdas y diálogos aceptan enteros, decimales y fracciones con signo:
+#   3   -2   +7   0.5   -.25   1/3   -3/4   1.5/2
+# Cada texto se convierte directamente en un Fraction exacto, sin eval()
+# ni paso por float. Los textos ya vistos se sirven desde una caché LRU,
+# lo que abarata mucho las matrices con valores repetidos.
+
+_NUMERO = r"(\d+(?:\.\d*)?|\.\d+)"
+_PATRON = re.compile(
+    rf"\s*([+-]?)\s*{_NUMERO}\s*(?:/\s*([+-]?)\s*{_NUMERO}\s*)?"
+)
+
+
+@lru_cache(maxsize=4096)
+def interpretar_valor(texto):
+    """
+    Convierte un texto como '-3/4' o '0.5' en un Fraction exacto.
+    Lanza ValueError si el texto no es un número válido.
+    """
+    coincidencia = _PATRON.fullmatch(texto)
+    if coincidencia is None:
+        raise ValueError(f"'{texto.strip()}' no es un número válido.")
+    signo, numerador, signo_den, denominador = coincidencia.groups()
+    valor = Fraction(numerador)
+    if denominador is not None:
+        divisor = Fraction(denominador)
+        if divisor == 0:
+            raise ValueError(f"'{texto.strip()}' tiene denominador cero.")
+        valor /= divisor
+        if signo_den == "-":
+            valor = -valor
+    return -valor if signo == "-" else valor
+
+
+@medir
+def interpretar_matriz(celdas):
+    """
+    Convierte una cuadrícula de textos (lista de filas) en un arreglo
+    dtype=object de Fraction, en una sola llamada.
+
+    Los errores indican la fila y columna de la celda (base 1).
+    """
+    filas = []
+    for i, fila in enumerate(celdas):
+        valores = []
+        for j, texto in enumerate(fila):
+            if not texto.strip():
+                raise ValueError(f"El campo en fila {i+1}, columna {j+1} está vacío.")
+            try:
+                valores.append(interpretar_valor(texto))
+            except ValueError:
+                raise ValueError(f"Valor inválido en fila {i+1}, columna {j+1}: '{texto}'")
+        filas.append(valores)
+    resultado = np.empty((len(filas), len(filas[0]) if filas else 0), dtype=object)
+    for i, valores in enumerate(filas):
+        resultado[i, :] = valores
+    return resultado
@@ -0,0 +1,198 @@
+import threading
+from collections import deque
+import numpy as np
+
+# ==================== GENERACIÓN DE MATRICES POR LOTES ====================
+# En lugar de generar una matriz al iniciar cada nivel y esperar que sirva,
+# se generan lotes de candidatas como un único arreglo 3D (k, n, n) y se
+# filtran de forma vectorizada. Las aceptadas se guardan en una reserva por
+# (nivel, n) de donde los niveles toman una matriz lista en O(1).
+
+# Nivel del juego: 1 = Transpuesta, 2 = Gauss Jordan, 3 = Inversa
+NIVEL_TRANSPUESTA = 1
+NIVEL_GAUSS = 2
+NIVEL_INVERSA = 3
+
+# Hasta este tamaño (el máximo original del juego) se filtran lotes; más
+# allá casi ninguna candidata tiene inversa con denominadores chicos (con
+# n = 8 una reserva tardaba más de un minuto) y se construyen las matrices
+UMBRAL_FILTRO = 5
+# Elementos por bloque de matrices construidas (n > UMBRAL_FILTRO)
+ELEMENTOS_POR_BLOQUE = 2 ** 18
+
+
+def generar_candidatas(rng, k, n, bajo=-10, alto=10):
+    """Genera k matrices enteras n×n con valores en [bajo, alto) como arreglo (k, n, n)."""
+    return rng.integers(bajo, alto, size=(k, n, n), dtype=np.int64)
+
+
+def generar_unimodulares(rng, k, n, densidad=None):
+    """
+    Genera k matrices enteras n×n con determinante ±1 (inversa entera).
+
+    Cada una es P·L·U con L y U unitriangulares de entradas pequeñas y
+    dispersas y P una permutación de filas, así que el nivel Inversa sigue
+    siendo exacto y con denominador 1 aunque n sea grande.
+    """
+    densidad = min(1.0, 3 / n) if densidad is None else densidad
+    dispersas = rng.integers(-2, 3, size=(k, n, n), dtype=np.int64) * (rng.random((k, n, n)) < densidad)
+    identidad = np.eye(n, dtype=np.int64)
+    L = np.tril(dispersas, -1) + identidad
+    U = np.triu(dispersas.transpose(0, 2, 1), 1) + identidad
+    lote = L @ U
+    for matriz in lote:
+        matriz[:] = matriz[rng.permutation(n)]
+    return lote
+
+
+def determinantes_lote(lote):
+    """
+    Determinantes de un lote (k, n, n) de matrices enteras.
+
+    Se calculan en punto flotante y se redondean: para las matrices pequeñas
+    del juego el determinante es muy inferior a 2⁵³ y el redondeo es exacto.
+    """
+    return np.rint(np.linalg.det(lote.astype(float))).astype(np.int64)
+
+
+def rangos_lote(lote):
+    """Rango de cada matriz de un lote (k, n, m)."""
+    return np.linalg.matrix_rank(lote.astype(float))
+
+
+def max_denominador_inversa_lote(lote, dets):
+    """
+    Mayor denominador de la inversa de cada matriz invertible del lote.
+
+    A⁻¹ = adj(A)/det, así que el denominador de cada entrada es
+    |det| / mcd(adj_ij, det). adj se obtiene redondeando det·A⁻¹.
+    Las matrices singulares reciben 0.
+    """
+    resultado = np.zeros(len(lote), dtype=np.int64)
+    invertibles = dets != 0
+    if not np.any(invertibles):
+        return resultado
+    d = dets[invertibles]
+    adj = np.rint(d[:, None, None] * np.linalg.inv(lote[invertibles].astype(float))).astype(np.int64)
+    denominadores = np.abs(d)[:, None, None] // np.gcd(adj, d[:, None, None])
+    resultado[invertibles] = denominadores.reshape(len(d), -1).max(axis=1)
+    return resultado
+
+
+def filtrar_lote(lote, nivel, max_denominador=12, max_det=None):
+    """
+    Máscara booleana de las matrices del lote aptas para el nivel.
+
+    - Transpuesta: cualquier matriz
+    - Gauss Jordan: rango al menos 1 (no la matriz nula)
+    - Inversa: invertible, con |det| ≤ max_det (si se da) y denominadores
+      de la inversa ≤ max_denominador
+    """
+    if nivel == NIVEL_TRANSPUESTA:
+        return np.ones(len(lote), dtype=bool)
+    if nivel == NIVEL_GAUSS:
+        return rangos_lote(lote) >= 1
+    dets = determinantes_lote(lote)
+    mascara = dets != 0
+    if max_det is not None:
+        mascara &= np.abs(dets) <= max_det
+    mascara &= max_denominador_inversa_lote(lote, dets) <= max_denominador
+    return mascara
+
+
+class PoolMatrices:
+    """
+    Reserva de matrices listas por (nivel, n).
+
+    - obtener() saca una matriz en O(1) si la reserva tiene existencias;
+      si está vacía, genera un lote en el momento.
+    - Cuando la reserva baja de `minimo`, un hilo en segundo plano la
+      rellena hasta `capacidad`.
+    - Cada (nivel, n) tiene su propio generador derivado de la semilla y
+      lo consume siempre en bloques del mismo tamaño (ver _bloque), y todas
+      las matrices aceptadas de un bloque entran a la reserva, aunque
+      sobren. Así, con una semilla, la secuencia de matrices que entrega
+      obtener() es reproducible sin importar cuándo corran los rellenos.
+    """
+
+    def __init__(self, semilla=None, capacidad=32, minimo=8, tamano_lote=256,
+                 max_denominador=12, en_segundo_plano=True):
+        self.semilla = semilla
+        self.capacidad = capacidad
+        self.minimo = minimo
+        self.tamano_lote = tamano_lote
+        self.max_denominador = max_denominador
+        self.en_segundo_plano = en_segundo_plano
+        self._reservas = {}
+        self._generadores = {}
+        self._cerrojos = {}
+        self._rellenando = set()
+        self._cerrojo_global = threading.Lock()
+
+    def _clave(self, nivel, n):
+        clave = (nivel, n)
+        with self._cerrojo_global:
+            if clave not in self._reservas:
+                self._reservas[clave] = deque()
+                self._cerrojos[clave] = threading.Lock()
+                entropia = None if self.semilla is None else [self.semilla, nivel, n]
+                self._generadores[clave] = np.random.default_rng(entropia)
+        return clave
+
+    def _bloque(self, clave):
+        """
+        Matrices aptas de un bloque de candidatas. El tamaño del bloque solo
+        depende de (nivel, n), nunca de cuántas matrices falten.
+        """
+        nivel, n = clave
+        rng = self._generadores[clave]
+        if n > UMBRAL_FILTRO:
+            # Matrices grandes: se construyen ya aptas, sin filtrar
+            k = max(1, min(self.tamano_lote, ELEMENTOS_POR_BLOQUE // (n * n)))
+            if nivel == NIVEL_INVERSA:
+                return list(generar_unimodulares(rng, k, n))
+            return list(generar_candidatas(rng, k, n))
+        lote = generar_candidatas(rng, self.tamano_lote, n)
+        return list(lote[filtrar_lote(lote, nivel, self.max_denominador)])
+
+    def _generar(self, clave, cantidad):
+        # Agrega bloques a la reserva hasta tener `cantidad` (con el cerrojo de la clave)
+        reserva = self._reservas[clave]
+        while len(reserva) < cantidad:
+            reserva.extend(self._bloque(clave))
+
+    def rellenar(self, nivel, n):
+        """Rellena la reserva de (nivel, n) hasta al menos su capacidad."""
+        clave = self._clave(nivel, n)
+        with self._cerrojos[clave]:
+            self._generar(clave, self.capacidad)
+        with self._cerrojo_global:
+            self._rellenando.discard(clave)
+
+    def _rellenar_en_segundo_plano(self, clave):
+        with self._cerrojo_global:
+            if clave in self._rellenando:
+                return
+            self._rellenando.add(clave)
+        threading.Thread(target=self.rellenar, args=clave, daemon=True).start()
+
+    def obtener(self, nivel, n):
+        """Saca una matriz lista para el nivel y tamaño dados."""
+        clave = self._clave(nivel, n)
+        reserva = self._reservas[clave]
+        try:
+            matriz = reserva.popleft()
+        except IndexError:
+            # Reserva vacía: se genera en el momento respetando el orden del generador
+            with self._cerrojos[clave]:
+                self._generar(clave, 1)
+                matriz = reserva.popleft()
+        if len(reserva) < self.minimo:
+            if self.en_segundo_plano:
+                self._rellenar_en_segundo_plano(clave)
+            else:
+                self.rellenar(nivel, n)
+        return matriz.copy()
+
+    def existencias(self, nivel, n):
+        return len(self._reservas.get((nivel, n), ()))
@@ -0,0 +1,291 @@
+"""
+Instrumentación ligera para saber en qué se va el tiempo del juego.
+
+Las funciones de la lógica y los métodos de Linealgame se marcan con
+@medir (o con @medir_metodos sobre una clase) y los tramos sueltos con
+`with seccion("nombre"):`. Mientras la instrumentación está apagada, que es
+lo normal, cada llamada marcada solo revisa una variable global y llama a
+la función original; seccion() retorna un contexto vacío compartido.
+
+Con la instrumentación activa se acumula, por nombre:
+- número de llamadas, tiempo total, mínimo y máximo
+- un histograma de duraciones en cubetas de potencias de dos (ns)
+- el tiempo propio de cada pila de llamadas marcadas, en el formato
+  "a;b;c microsegundos" que leen flamegraph.pl, speedscope e inferno
+
+Además se puede encender cProfile para una traza completa (.prof). Como
+cProfile solo mide el hilo donde se enciende, activar() deja además un
+gancho con threading.setprofile que enciende un perfilador propio en cada
+hilo que se cree después (el del EjecutorTareas, donde corre la lógica);
+al volcar se juntan todos. Las mediciones acumuladas se protegen con un
+cerrojo porque se anotan desde ambos hilos.
+
+Desde la línea de comandos basta con definir la variable de entorno:
+    QUIZLINEAL_PERFIL=perfil python main.py
+que al salir escribe perfil.json, perfil.folded y perfil.txt (y perfil.prof
+si QUIZLINEAL_CPROFILE=1).
+"""
+import atexit
+import functools
+import os
+import threading
+import types
+from array import array
+from collections import Counter
+from contextlib import nullcontext
+from time import perf_counter_ns
+
+CUBETAS = 48  # 2⁴⁷ ns ≈ 39 horas
+
+_activa = False
+_mediciones = {}
+_pilas_plegadas = Counter()
+_local = threading.local()
+_cerrojo = threading.Lock()
+_perfiladores = []  # Uno por hilo; el primero es el del hilo que activó
+_NULA = nullcontext()
+
+
+class Medicion:
+    """Acumulador de duraciones de un nombre."""
+
+    __slots__ = ("llamadas", "total", "minimo", "maximo", "cubetas")
+
+    def __init__(self):
+        self.llamadas = 0
+        self.total = 0
+        self.minimo = None
+        self.maximo = 0
+        self.cubetas = array("Q", bytes(8 * CUBETAS))
+
+    def anotar(self, duracion):
+        self.llamadas += 1
+        self.total += duracion
+        self.minimo = duracion if self.minimo is None else min(self.minimo, duracion)
+        self.maximo = max(self.maximo, duracion)
+        # La cubeta b cuenta duraciones en [2^(b-1), 2^b) ns
+        self.cubetas[min(duracion.bit_length(), CUBETAS - 1)] += 1
+
+    def percentil(self, p):
+        # Cota superior (ns) del percentil p según el histograma
+        objetivo = p / 100 * self.llamadas
+        acumulado = 0
+        for cubeta, cantidad in enumerate(self.cubetas):
+            acumulado += cantidad
+            if cantidad and acumulado >= objetivo:
+                return min(2 ** cubeta, self.maximo)
+        return self.maximo
+
+    def a_diccionario(self):
+        return {
+            "llamadas": self.llamadas,
+            "total_ns": self.total,
+            "minimo_ns": self.minimo,
+            "maximo_ns": self.maximo,
+            "p50_ns": self.percentil(50),
+            "p99_ns": self.percentil(99),
+            "histograma_ns": {f"<{2 ** b}": c for b, c in enumerate(self.cubetas) if c},
+        }
+
+
+# ==================== ENCENDIDO Y APAGADO ====================
+
+def activa():
+    return _activa
+
+
+def _perfilar_hilo(*_):
+    # Gancho de threading.setprofile: corre en el hilo nuevo con su primer evento
+    import cProfile
+    perfilador = cProfile.Profile()
+    try:
+        perfilador.enable()  # Reemplaza este gancho en el hilo actual
+    except ValueError:
+        # Python 3.12+: el perfilador ya encendido cubre todos los hilos
+        import sys
+        sys.setprofile(None)
+        return
+    with _cerrojo:
+        _perfiladores.append(perfilador)
+
+
+def activar(cprofile=False):
+    """
+    Enciende la instrumentación y, si se pide, cProfile en este hilo y en
+    los hilos que se creen a partir de ahora.
+    """
+    global _activa
+    _activa = True
+    if cprofile and not _perfiladores:
+        import cProfile
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+        _perfiladores.append(perfilador)
+        threading.setprofile(_perfilar_hilo)
+
+
+def _apagar_perfiladores():
+    threading.setprofile(None)
+    with _cerrojo:
+        perfiladores = list(_perfiladores)
+    for perfilador in perfiladores:
+        perfilador.disable()
+
+
+def desactivar():
+    global _activa
+    _activa = False
+    _apagar_perfiladores()
+
+
+def reiniciar():
+    # Descarta todo lo medido hasta ahora
+    _apagar_perfiladores()
+    with _cerrojo:
+        _mediciones.clear()
+        _pilas_plegadas.clear()
+        _perfiladores.clear()
+
+
+# ==================== MEDICIÓN ====================
+
+def _pila():
+    pila = getattr(_local, "pila", None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+
+def _entrar(nombre):
+    pila = _pila()
+    # Cada marco lleva [nombre, tiempo de sus hijos]
+    pila.append([nombre, 0])
+    return pila, perf_counter_ns()
+
+
+def _salir(nombre, pila, inicio):
+    duracion = perf_counter_ns() - inicio
+    _, hijos = pila.pop()
+    ruta = ";".join([marco[0] for marco in pila] + [nombre])
+    # La pila es del hilo, pero las mediciones se comparten entre hilos
+    with _cerrojo:
+        medicion = _mediciones.get(nombre)
+        if medicion is None:
+            medicion = _mediciones[nombre] = Medicion()
+        medicion.anotar(duracion)
+        _pilas_plegadas[ruta] += duracion - hijos
+    if pila:
+        pila[-1][1] += duracion
+
+
+def medir(nombre=None):
+    """
+    Decorador que mide cada llamada bajo `nombre` (por defecto, el
+    __qualname__ de la función). Se usa como @medir o @medir("nombre").
+    """
+    def decorar(funcion):
+        etiqueta = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activa:
+                return funcion(*args, **kwargs)
+            pila, inicio = _entrar(etiqueta)
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _salir(etiqueta, pila, inicio)
+        return envoltura
+
+    if callable(nombre):
+        funcion, nombre = nombre, None
+        return decorar(funcion)
+    return decorar
+
+
+def medir_metodos(clase):
+    """Decorador de clase: aplica @medir a todos los métodos públicos."""
+    for nombre, atributo in list(vars(clase).items()):
+        if isinstance(atributo, types.FunctionType) and not nombre.startswith("_"):
+            setattr(clase, nombre, medir(f"{clase.__name__}.{nombre}")(atributo))
+    return clase
+
+
+class _Seccion:
+    __slots__ = ("nombre", "pila", "inicio")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.pila, self.inicio = _entrar(self.nombre)
+        return self
+
+    def __exit__(self, *excepcion):
+        _salir(self.nombre, self.pila, self.inicio)
+        return False
+
+
+def seccion(nombre):
+    """Contexto que mide un tramo de código; vacío si la instrumentación está apagada."""
+    return _Seccion(nombre) if _activa else _NULA
+
+
+# ==================== RESULTADOS ====================
+
+def mediciones():
+    """Diccionario nombre → estadísticas e histograma."""
+    with _cerrojo:
+        return {nombre: medicion.a_diccionario() for nombre, medicion in sorted(_mediciones.items())}
+
+
+def reporte():
+    """Tabla de texto ordenada por tiempo total."""
+    lineas = [f"{'nombre':<48} {'llamadas':>9} {'total ms':>10} {'media µs':>10} {'p50 µs':>9} {'p99 µs':>9}"]
+    with _cerrojo:
+        ordenadas = sorted(_mediciones.items(), key=lambda par: -par[1].total)
+    for nombre, medicion in ordenadas:
+        lineas.append(
+            f"{nombre:<48} {medicion.llamadas:>9} {medicion.total / 1e6:>10.2f} "
+            f"{medicion.total / medicion.llamadas / 1e3:>10.1f} "
+            f"{medicion.percentil(50) / 1e3:>9.1f} {medicion.percentil(99) / 1e3:>9.1f}"
+        )
+    return "\n".join(lineas)
+
+
+def volcar(ruta_base):
+    """
+    Escribe ruta_base.json (mediciones), ruta_base.folded (pilas plegadas,
+    tiempo propio en µs), ruta_base.txt (reporte) y, si cProfile estaba
+    encendido, ruta_base.prof con los perfiles de todos los hilos juntos.
+    """
+    import json
+    with open(ruta_base + ".json", "w", encoding="utf-8") as archivo:
+        json.dump(mediciones(), archivo, indent=2, ensure_ascii=False)
+    with _cerrojo:
+        pilas = sorted(_pilas_plegadas.items())
+    with open(ruta_base + ".folded", "w", encoding="utf-8") as archivo:
+        for ruta, duracion in pilas:
+            archivo.write(f"{ruta} {max(duracion // 1000, 1)}\n")
+    with open(ruta_base + ".txt", "w", encoding="utf-8") as archivo:
+        archivo.write(reporte() + "\n")
+    if _perfiladores:
+        import pstats
+        _apagar_perfiladores()
+        estadisticas = pstats.Stats(_perfiladores[0])
+        for perfilador in _perfiladores[1:]:
+            estadisticas.add(perfilador)
+        estadisticas.dump_stats(ruta_base + ".prof")
+
+
+def activar_desde_entorno():
+    """
+    Enciende la instrumentación si QUIZLINEAL_PERFIL está definida y
+    programa el volcado al salir. Retorna True si quedó activa.
+    """
+    ruta_base = os.environ.get("QUIZLINEAL_PERFIL")
+    if not ruta_base:
+        return False
+    activar(cprofile=os.environ.get("QUIZLINEAL_CPROFILE") == "1")
+    atexit.register(volcar, ruta_base)
+    return True
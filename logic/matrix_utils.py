@@ -1,45 +1,142 @@
 from fractions import Fraction
+from functools import lru_cache
 import numpy as np
+from logic.rational_matrix import RationalMatrix
+from logic.instrumentacion import medir
 
-def formatear_matriz_para_mostrar(A):
+@lru_cache(maxsize=8192)
+def _formatear_racional(numerador, denominador):
+    # Formatea num/den sin pasar por flotantes
+    if numerador % denominador == 0:
+        return str(numerador // denominador)
+    return str(Fraction(numerador, denominador))
+
+@medir
+def formatear_matriz_para_mostrar(A, columna_separador=None):
     # Formatea matriz para mostrar en la interfaz gráfica
+    # columna_separador: para matrices aumentadas, inserta "|" antes de esa columna
     if A is None:
         return "Matriz no disponible."
+    if isinstance(A, RationalMatrix):
+        lineas = []
+        for fila, d in zip(A.num, A.den):
+            celdas = [_formatear_racional(int(x), int(d)) for x in fila]
+            if columna_separador is not None:
+                celdas.insert(columna_separador, "|")
+            lineas.append("  ".join(celdas))
+        return "\n".join(lineas)
     return "\n".join(
-        ["  ".join(f"{Fraction(x).limit_denominator()}" if x != "|" else "|" for x in fila) for fila in A]
+        ["  ".join(_formatear_valor(x) if x != "|" else "|" for x in fila) for fila in A]
     )
 
-def verificar_forma_escalonada_reducida(matriz):
-    # Verifica si la matriz está en forma escalonada reducida por filas
-    filas, columnas = matriz.shape
+@lru_cache(maxsize=8192)
+def _formatear_valor(x):
+    # Texto de una celda cualquiera (int, float, Fraction), con caché por valor
+    return f"{Fraction(x).limit_denominator()}"
+
+def formatear_elemento(A, i, j):
+    # Texto de una sola celda, para las vistas que solo dibujan lo visible
+    if isinstance(A, RationalMatrix):
+        return _formatear_racional(int(A.num[i, j]), int(A.den[i]))
+    return _formatear_valor(A[i, j])
+
+class FormateadorMatriz:
+    """
+    Formateador incremental para matrices (aumentadas) que cambian fila a fila.
+
+    - El texto de cada celda sale de una caché por valor (numerador, denominador).
+    - Se guardan las celdas y la línea ya alineada de cada fila; tras una
+      operación elemental solo se vuelven a formatear las filas indicadas.
+    - Las columnas se alinean a la derecha. Si el ancho de alguna columna
+      cambia, se rehacen las líneas (sin volver a formatear las celdas).
+    """
 
-    ultimo_pivote_col = -1
+    def __init__(self, columna_separador=None):
+        self.columna_separador = columna_separador
+        self._celdas = []
+        self._anchos = None
+        self._anchos_columna = None
+        self._lineas = []
 
-    for i in range(filas):
-        # Busca primer elemento no cero
-        pivote_col = None
-        for j in range(columnas):
-            if not np.isclose(matriz[i, j], 0):
-                pivote_col = j
-                break
+    def _linea(self, i):
+        celdas = [c.rjust(a) for c, a in zip(self._celdas[i], self._anchos_columna)]
+        if self.columna_separador is not None:
+            celdas.insert(self.columna_separador, "|")
+        return "  ".join(celdas)
 
-        # Fila de ceros
-        if pivote_col is None:
-            continue
+    @medir
+    def formatear(self, matriz, filas=None):
+        """
+        Retorna el texto de la RationalMatrix `matriz`.
+        `filas`: índices de las filas que cambiaron desde la última llamada
+        (None para formatear todo).
+        """
+        if not isinstance(matriz, RationalMatrix):
+            matriz = RationalMatrix.desde(matriz)
+        n, m = matriz.shape
+        if filas is None or self._anchos is None or self._anchos.shape != (n, m):
+            filas = range(n)
+            self._celdas = [None] * n
+            self._anchos = np.zeros((n, m), dtype=np.int64)
+            self._anchos_columna = None
+            self._lineas = [""] * n
+
+        for i in filas:
+            d = int(matriz.den[i])
+            self._celdas[i] = [_formatear_racional(int(x), d) for x in matriz.num[i]]
+            self._anchos[i] = [len(c) for c in self._celdas[i]]
+
+        anchos_columna = self._anchos.max(axis=0) if n else self._anchos.sum(axis=0)
+        if self._anchos_columna is None or not np.array_equal(anchos_columna, self._anchos_columna):
+            self._anchos_columna = anchos_columna
+            filas = range(n)
+        for i in filas:
+            self._lineas[i] = self._linea(i)
+        return "\n".join(self._lineas)
+
+def _mascaras(matriz):
+    # Máscaras (no cero, igual a uno) exactas o con tolerancia según el tipo
+    if isinstance(matriz, RationalMatrix):
+        return matriz.mascara_no_cero(), matriz.mascara_uno()
+    if isinstance(matriz, (list, tuple)) and matriz and isinstance(matriz[0], RationalMatrix):
+        return (np.stack([m.mascara_no_cero() for m in matriz]),
+                np.stack([m.mascara_uno() for m in matriz]))
+    matriz = np.asarray(matriz)
+    if matriz.dtype.kind == "f":
+        return ~np.isclose(matriz, 0), np.isclose(matriz, 1)
+    # Enteros y Fraction (dtype=object): comparación exacta
+    return np.asarray(matriz != 0, dtype=bool), np.asarray(matriz == 1, dtype=bool)
+
+@medir
+def verificar_forma_escalonada_reducida(matriz):
+    # Verifica si la matriz está en forma escalonada reducida por filas
+    # Acepta una matriz (n, m), una pila (k, n, m) o una lista de RationalMatrix;
+    # con una pila retorna un arreglo de k booleanos
+    no_cero, uno = _mascaras(matriz)
+    individual = no_cero.ndim == 2
+    if individual:
+        no_cero, uno = no_cero[None], uno[None]
+    k, filas, columnas = no_cero.shape
+    if filas == 0 or columnas == 0:
+        resultado = np.ones(k, dtype=bool)
+        return bool(resultado[0]) if individual else resultado
 
-        # Pivote a la derecha del anterior
-        if pivote_col <= ultimo_pivote_col:
-            return False
+    # Columna del primer elemento no cero de cada fila (las filas de ceros se ignoran)
+    tiene_pivote = no_cero.any(axis=2)
+    pivote_col = np.argmax(no_cero, axis=2)
 
-        # Pivote debe ser 1
-        if not np.isclose(matriz[i, pivote_col], 1):
-            return False
+    # Pivote a la derecha del anterior
+    columnas_validas = np.where(tiene_pivote, pivote_col, -1)
+    anterior = np.maximum.accumulate(columnas_validas, axis=1)
+    anterior = np.concatenate((np.full((k, 1), -1), anterior[:, :-1]), axis=1)
+    orden = pivote_col > anterior
 
-        # Único no-cero en columna
-        for k in range(filas):
-            if k != i and not np.isclose(matriz[k, pivote_col], 0):
-                return False
+    # Pivote debe ser 1
+    unitario = np.take_along_axis(uno, pivote_col[:, :, None], axis=2)[:, :, 0]
 
-        ultimo_pivote_col = pivote_col
+    # Único no-cero en columna
+    no_ceros_por_columna = no_cero.sum(axis=1)
+    unico = np.take_along_axis(no_ceros_por_columna, pivote_col, axis=1) == 1
 
-    return True
+    resultado = np.all(~tiene_pivote | (orden & unitario & unico), axis=1)
+    return bool(resultado[0]) if individual else resultado
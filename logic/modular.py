@@ -0,0 +1,285 @@
+import math
+import numpy as np
+from logic.rational_matrix import RationalMatrix
+
+# ==================== ARITMÉTICA MULTIMODULAR (CRT) ====================
+# Para matrices enteras grandes, la eliminación exacta sobre racionales hace
+# crecer mucho el tamaño de los números. La alternativa es eliminar módulo
+# varios primos de 31 bits, donde todo cabe en int64 (p² < 2⁶³) y NumPy
+# vectoriza cada paso, y luego reconstruir el resultado entero con el
+# Teorema Chino del Resto (CRT).
+#
+# El número de primos se fija con la cota de Hadamard:
+#   |det(A)| ≤ Π ||fila_i||
+# y los cofactores (menores de tamaño n-1) cumplen la misma cota porque toda
+# fila entera no nula tiene norma ≥ 1. Como det(A)·A⁻¹ = adj(A) es entera,
+# basta reconstruir det y adj en el rango simétrico (-M/2, M/2].
+
+BITS_PRIMO = 31
+
+_primos = []
+
+
+def _es_primo(n):
+    # Miller-Rabin determinista para n < 3.4·10¹⁴ (bases 2, 3, 5, 7, 11, 13, 17)
+    if n < 2:
+        return False
+    for q in (2, 3, 5, 7, 11, 13, 17):
+        if n % q == 0:
+            return n == q
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in (2, 3, 5, 7, 11, 13, 17):
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def primo(i):
+    """i-ésimo primo de trabajo, en orden descendente desde 2³¹."""
+    candidato = _primos[-1] - 2 if _primos else 2 ** BITS_PRIMO - 1
+    while len(_primos) <= i:
+        if _es_primo(candidato):
+            _primos.append(candidato)
+        candidato -= 2
+    return _primos[i]
+
+
+def bits_hadamard(N):
+    # Bits necesarios para |det| y |cofactores| según la cota de Hadamard
+    normas = np.sqrt(np.sum(np.asarray(N, dtype=float) ** 2, axis=1))
+    return int(math.ceil(np.sum(np.log2(np.maximum(normas, 1.0))))) + 2
+
+
+def _eliminar_modulo(N, p, aumentar):
+    """
+    Gauss-Jordan módulo p con int64.
+
+    Retorna (det mod p, inversa mod p o None). Si la matriz es singular
+    módulo p, retorna (0, None).
+    """
+    n = N.shape[0]
+    M = np.mod(N, p).astype(np.int64)
+    if aumentar:
+        M = np.hstack((M, np.eye(n, dtype=np.int64)))
+    det = 1
+    for c in range(n):
+        candidatos = np.flatnonzero(M[c:, c])
+        if candidatos.size == 0:
+            return 0, None
+        k = c + int(candidatos[0])
+        if k != c:
+            M[[c, k]] = M[[k, c]]
+            det = -det
+        pivote = int(M[c, c])
+        det = det * pivote % p
+        M[c] = M[c] * pow(pivote, -1, p) % p
+        # Las columnas anteriores a c ya son vectores unitarios y no cambian.
+        # Para el determinante basta eliminar hacia abajo.
+        bloque = M[:, c:] if aumentar else M[c + 1:, c:]
+        columna = bloque[:, 0].copy()
+        if aumentar:
+            columna[c] = 0
+        # bloque ∈ [0, p) y columna·fila < p² < 2⁶², así que la resta cabe en
+        # int64 y basta una sola reducción módulo p por paso
+        bloque -= np.outer(columna, M[c, c:])
+        np.mod(bloque, p, out=bloque)
+    return det % p, (M[:, n:] if aumentar else None)
+
+
+def reconstruir_crt(residuos, primos):
+    """
+    Reconstruye enteros a partir de sus residuos con el algoritmo de Garner.
+
+    Parámetros:
+    - residuos: lista de arreglos int64 (uno por primo), todos de la misma forma
+    - primos: lista de primos correspondientes
+
+    Los dígitos en base mixta se calculan vectorizados en int64; solo la
+    suma final usa enteros de Python. Retorna un arreglo dtype=object con
+    valores en el rango simétrico (-M/2, M/2], M = Πp.
+    """
+    forma = np.shape(residuos[0])
+    residuos = [np.ravel(r).astype(np.int64) for r in residuos]
+    digitos = []
+    for i, (r, p) in enumerate(zip(residuos, primos)):
+        # acumulado = v0 + v1·p0 + ... + v_{i-1}·p0···p_{i-2} (mod p), por Horner
+        acumulado = np.zeros_like(r)
+        for j in range(i - 1, -1, -1):
+            acumulado = (acumulado * (primos[j] % p) + digitos[j]) % p
+        producto_previo = 1
+        for j in range(i):
+            producto_previo = producto_previo * primos[j] % p
+        inverso = pow(producto_previo, -1, p) if i else 1
+        digitos.append((r - acumulado) % p * inverso % p)
+
+    resultado = np.zeros(residuos[0].shape, dtype=object)
+    base = 1
+    for v, p in zip(digitos, primos):
+        resultado += v.astype(object) * base
+        base *= p
+    mitad = base // 2
+    resultado[resultado > mitad] -= base
+    return resultado.reshape(forma)
+
+
+def determinante_modular(N):
+    """
+    Determinante exacto de una matriz entera por eliminación multimodular.
+    Retorna un entero de Python.
+    """
+    N = np.asarray(N)
+    n = N.shape[0]
+    if n == 0:
+        return 1
+    bits = bits_hadamard(N)
+    residuos, primos, i, producto = [], [], 0, 1
+    while producto.bit_length() <= bits:
+        p = primo(i)
+        det, _ = _eliminar_modulo(N, p, aumentar=False)
+        residuos.append(np.array(det, dtype=np.int64))
+        primos.append(p)
+        producto *= p
+        i += 1
+    return int(reconstruir_crt(residuos, primos)[()])
+
+
+def adjunta_modular(N):
+    """
+    Calcula (det, adj) de una matriz entera cuadrada, con adj = det·N⁻¹.
+
+    Los primos que dividen a det (singulares módulo p) se descartan. Un det
+    no nulo de b bits tiene a lo sumo b/30 factores primos mayores que 2³⁰,
+    así que si se descartan más primos que eso, la matriz es singular.
+    Retorna (0, None) si la matriz es singular.
+    """
+    N = np.asarray(N)
+    n = N.shape[0]
+    if n == 0:
+        return 1, np.zeros((0, 0), dtype=object)
+    bits = bits_hadamard(N)
+    maximo_descartes = bits // (BITS_PRIMO - 1) + 1
+    dets, adjs, primos, producto, descartes, i = [], [], [], 1, 0, 0
+    while producto.bit_length() <= bits:
+        p = primo(i)
+        i += 1
+        det, inversa = _eliminar_modulo(N, p, aumentar=True)
+        if inversa is None:
+            descartes += 1
+            if descartes > maximo_descartes:
+                return 0, None
+            continue
+        dets.append(np.array(det, dtype=np.int64))
+        adjs.append(inversa * det % p)
+        primos.append(p)
+        producto *= p
+    det = int(reconstruir_crt(dets, primos)[()])
+    return det, reconstruir_crt(adjs, primos)
+
+
+# ==================== VERIFICACIÓN DE FREIVALDS ====================
+# Para comprobar A·B = I no hace falta formar el producto (O(n³)): basta
+# elegir un vector aleatorio r y comprobar A·(B·r) = r, que cuesta O(n²).
+# Si A·B ≠ I, la igualdad falla para al menos una fracción 1 - 1/p de los
+# vectores r ∈ F_p^n. Eso supone que A·B - I sigue siendo no nula módulo
+# p: con un primo fijo, una B errónea a propósito (por ejemplo
+# (1 + p₁p₂p₃)·A⁻¹) pasaría siempre. Por eso cada ronda sortea su primo en
+# [2³⁰, 2³¹), donde hay unos 5·10⁷; una entrada no nula de b bits es
+# divisible por a lo sumo b/30 de ellos. Todo se hace módulo p con int64,
+# de forma exacta, también para inversas con fracciones.
+
+PRIMOS_EN_RANGO = 50_697_537  # π(2³¹) - π(2³⁰)
+
+
+def primo_aleatorio(rng):
+    """Primo uniforme entre los impares de [2³⁰, 2³¹) que sortea `rng`."""
+    while True:
+        candidato = int(rng.integers(2 ** (BITS_PRIMO - 1), 2 ** BITS_PRIMO)) | 1
+        if _es_primo(candidato):
+            return candidato
+
+
+def _producto_vector_modular(M, x, p):
+    """
+    M·x mod p para pilas M (k, n, n) y x (k, n), con valores en [0, p).
+
+    x se parte en mitades de 16 bits para que cada suma de productos
+    quepa en int64 (n < 2¹⁶).
+    """
+    alto, bajo = x >> 16, x & 0xFFFF
+    y_alto = np.matmul(M, alto[..., None])[..., 0] % p
+    y_bajo = np.matmul(M, bajo[..., None])[..., 0]
+    return (y_alto * 65536 + y_bajo) % p
+
+
+def _preparar_par(A, B):
+    """
+    Lleva A·B = I a una identidad entre enteros.
+
+    Con A = diag(1/dA)·NA, B = diag(1/dB)·NB y L = mcm(dB):
+        A·B = I  ⟺  NA · (diag(L/dB)·NB) = L·diag(dA)
+    Retorna (NA, NB escalada, L·dA) o None si las formas no son compatibles.
+    """
+    A, B = RationalMatrix.desde(A), RationalMatrix.desde(B)
+    n = A.shape[0]
+    if A.shape != (n, n) or B.shape != (n, n):
+        return None
+    L = math.lcm(*(int(d) for d in B.den)) if n else 1
+    escala = np.array([L // int(d) for d in B.den], dtype=object)
+    NB = B.num.astype(object) * escala[:, None]
+    objetivo = np.array([L * int(d) for d in A.den], dtype=object)
+    return A.num, NB, objetivo
+
+
+def verificar_inversas_freivalds_lote(pares, rondas=3, semilla=None):
+    """
+    Verifica con Freivalds un lote de pares (A, B) del mismo tamaño n.
+
+    Retorna un arreglo de booleanos. Un False siempre es correcto. Si las
+    entradas de A·B - I (llevada a enteros) tienen a lo sumo b bits, un True
+    erróneo tiene probabilidad ≤ (b / (30·PRIMOS_EN_RANGO) + 1/2³⁰)^rondas
+    por par: el primo de cada ronda se sortea con `semilla`.
+    """
+    preparados = [_preparar_par(A, B) for A, B in pares]
+    resultado = np.array([p is not None for p in preparados], dtype=bool)
+    indices = np.flatnonzero(resultado)
+    if indices.size == 0:
+        return resultado
+    n = preparados[indices[0]][0].shape[0]
+    if any(preparados[i][0].shape[0] != n for i in indices):
+        raise ValueError("Todas las matrices del lote deben tener el mismo tamaño.")
+    if n >= 2 ** 16:
+        raise ValueError("La verificación modular admite matrices de hasta 65535 filas.")
+
+    rng = np.random.default_rng(semilla)
+    vigentes = indices
+    for _ in range(rondas):
+        # Un primo al azar por ronda: con primos fijos, quien los conozca
+        # puede armar una B errónea con A·B - I divisible por todos ellos
+        p = primo_aleatorio(rng)
+        NA = np.stack([np.mod(preparados[i][0], p).astype(np.int64) for i in vigentes])
+        NB = np.stack([np.mod(preparados[i][1], p).astype(np.int64) for i in vigentes])
+        objetivo = np.stack([np.mod(preparados[i][2], p).astype(np.int64) for i in vigentes])
+        r = rng.integers(0, p, size=(len(vigentes), n), dtype=np.int64)
+        izquierda = _producto_vector_modular(NA, _producto_vector_modular(NB, r, p), p)
+        derecha = objetivo * r % p
+        correctos = np.all(izquierda == derecha, axis=1)
+        resultado[vigentes[~correctos]] = False
+        vigentes = vigentes[correctos]
+        if vigentes.size == 0:
+            break
+    return resultado
+
+
+def verificar_inversa_freivalds(A, B, rondas=3, semilla=None):
+    """Verifica A·B = I con Freivalds modular; ver verificar_inversas_freivalds_lote."""
+    return bool(verificar_inversas_freivalds_lote([(A, B)], rondas, semilla)[0])
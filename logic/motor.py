@@ -0,0 +1,284 @@
+from array import array
+from fractions import Fraction
+import numpy as np
+from logic.rational_matrix import RationalMatrix
+from logic.serializacion import ArchivoInvalido, codificar, decodificar, entero
+from logic.instrumentacion import medir
+
+# Códigos de operación del diario
+INTERCAMBIO = 0
+MULTIPLICACION = 1
+SUMA = 2
+
+CODIGOS = {"intercambio": INTERCAMBIO, "multiplicacion": MULTIPLICACION, "suma": SUMA}
+_NOMBRES = {codigo: tipo for tipo, codigo in CODIGOS.items()}
+
+
+def validar_operacion(tipo, fila1, fila2, factor, filas):
+    """
+    Valida una operación elemental sobre una matriz de `filas` filas.
+    Retorna (código, factor como Fraction) o lanza ValueError/IndexError.
+    """
+    if tipo not in CODIGOS:
+        raise ValueError(f"Operación desconocida: {tipo}")
+    codigo = CODIGOS[tipo]
+    if not 0 <= fila1 < filas or (codigo != MULTIPLICACION and not 0 <= fila2 < filas):
+        raise IndexError("Los índices de las filas están fuera del rango de la matriz.")
+    if codigo == SUMA and fila1 == fila2:
+        raise ValueError("La fila destino debe ser distinta de la fila fuente.")
+    factor = Fraction(factor)
+    if codigo == MULTIPLICACION and factor == 0:
+        raise ValueError("El factor de multiplicación no puede ser cero.")
+    return codigo, factor
+
+
+class MotorOperaciones:
+    """
+    Motor de operaciones elementales que trabaja en el lugar sobre la
+    matriz aumentada [A | B].
+
+    A diferencia de aplicar_operacion_elemental, que copia A y B en cada
+    llamada, el motor es dueño de una única RationalMatrix aumentada y la
+    modifica directamente. Cada operación se anota en un diario compacto
+    (código, fila1, fila2, factor) que permite deshacer y rehacer.
+
+    Deshacer aplica la operación inversa, que también es elemental:
+    - Fi ↔ Fj se deshace con Fi ↔ Fj
+    - Fi → k·Fi se deshace con Fi → (1/k)·Fi
+    - Fi → Fi + k·Fj se deshace con Fi → Fi - k·Fj
+    Por eso solo se toca la fila afectada y nunca se copia la matriz.
+    """
+
+    def __init__(self, A, B=None):
+        A = RationalMatrix.desde(A)
+        self.columnas_a = A.shape[1]
+        self.matriz = A if B is None else A.hstack(B)
+        # Diario: códigos y pares de filas en arreglos tipados, factores aparte
+        self._codigos = array("b")
+        self._filas = array("l")
+        self._factores = []
+        self._posicion = 0  # Número de operaciones vigentes (el resto es rehacer)
+        self.filas_sucias = set()  # Filas modificadas desde la última vez que se redibujó
+
+    # -------------------- Datos para las instantáneas --------------------
+
+    def a_datos(self):
+        """Matriz y diario como datos JSON (ver logic.serializacion)."""
+        return {
+            "matriz": codificar(self.matriz),
+            "columnas_a": self.columnas_a,
+            "codigos": self._codigos.tolist(),
+            "filas": self._filas.tolist(),
+            "factores": [[f.numerator, f.denominator] for f in self._factores],
+            "posicion": self._posicion,
+        }
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Inverso de a_datos(); lanza ArchivoInvalido si los datos no encajan."""
+        matriz = decodificar(datos["matriz"])
+        if not isinstance(matriz, RationalMatrix):
+            raise ArchivoInvalido("El motor necesita una matriz racional.")
+        n, columnas = matriz.shape
+        columnas_a = entero(datos["columnas_a"])
+        codigos = [entero(c) for c in datos["codigos"]]
+        filas = [entero(f) for f in datos["filas"]]
+        factores = [Fraction(entero(p), entero(q)) if entero(q) > 0 else None for p, q in datos["factores"]]
+        posicion = entero(datos["posicion"])
+        if (not 0 < columnas_a <= columnas or len(filas) != 2 * len(codigos) or len(factores) != len(codigos)
+                or not 0 <= posicion <= len(codigos)):
+            raise ArchivoInvalido("Diario de operaciones inconsistente.")
+        for k, codigo in enumerate(codigos):
+            if codigo not in CODIGOS.values() or factores[k] is None:
+                raise ArchivoInvalido("Operación inválida en el diario.")
+            fila1, fila2 = filas[2 * k], filas[2 * k + 1]
+            try:
+                validar_operacion(_NOMBRES[codigo], fila1, None if fila2 < 0 else fila2, factores[k], n)
+            except (ValueError, IndexError) as error:
+                raise ArchivoInvalido(f"Operación inválida en el diario: {error}") from None
+
+        motor = cls.__new__(cls)
+        motor.columnas_a = columnas_a
+        motor.matriz = matriz
+        motor._codigos = array("b", codigos)
+        motor._filas = array("l", filas)
+        motor._factores = factores
+        motor._posicion = posicion
+        motor.filas_sucias = set()
+        return motor
+
+    @property
+    def A(self):
+        return self.matriz.columnas(0, self.columnas_a)
+
+    @property
+    def B(self):
+        if self.matriz.shape[1] == self.columnas_a:
+            return None
+        return self.matriz.columnas(self.columnas_a)
+
+    @property
+    def n(self):
+        return self.matriz.shape[0]
+
+    def __len__(self):
+        return self._posicion
+
+    @property
+    def puede_deshacer(self):
+        return self._posicion > 0
+
+    @property
+    def puede_rehacer(self):
+        return self._posicion < len(self._codigos)
+
+    def _ejecutar(self, codigo, fila1, fila2, factor):
+        if codigo == INTERCAMBIO:
+            self.matriz.intercambiar(fila1, fila2)
+            self.filas_sucias.update((fila1, fila2))
+        elif codigo == MULTIPLICACION:
+            self.matriz.escalar(fila1, factor)
+            self.filas_sucias.add(fila1)
+        else:
+            self.matriz.sumar_multiplo(fila1, fila2, factor)
+            self.filas_sucias.add(fila1)
+
+    def tomar_filas_sucias(self):
+        """
+        Retorna y olvida las filas modificadas desde la llamada anterior.
+        Varias operaciones pueden terminar antes de que la vista se redibuje
+        (deshacer y rehacer seguidos), así que se acumulan todas. Se vacía
+        con pop() para no perder una fila que el hilo de trabajo agregue
+        mientras tanto.
+        """
+        filas = set()
+        while self.filas_sucias:
+            filas.add(self.filas_sucias.pop())
+        return sorted(filas)
+
+    @medir
+    def aplicar(self, tipo, fila1, fila2=None, factor=1):
+        """
+        Aplica una operación elemental con la misma convención que
+        aplicar_operacion_elemental y la registra en el diario.
+        """
+        codigo, factor = validar_operacion(tipo, fila1, fila2, factor, self.n)
+        self._ejecutar(codigo, fila1, fila2, factor)
+
+        # Una operación nueva descarta lo que quedaba por rehacer
+        del self._codigos[self._posicion:]
+        del self._filas[2 * self._posicion:]
+        del self._factores[self._posicion:]
+        self._codigos.append(codigo)
+        self._filas.extend((fila1, -1 if fila2 is None else fila2))
+        self._factores.append(factor)
+        self._posicion += 1
+
+    def aplicar_secuencia(self, operaciones):
+        """
+        Aplica una secuencia de tuplas (tipo, fila1, fila2, factor) en una
+        sola pasada. Equivale a llamar aplicar() con cada tupla.
+        """
+        for tipo, fila1, fila2, factor in operaciones:
+            self.aplicar(tipo, fila1, fila2, factor)
+
+    def deshacer(self):
+        # Revierte la última operación; retorna False si no hay nada que deshacer
+        if not self.puede_deshacer:
+            return False
+        self._posicion -= 1
+        codigo = self._codigos[self._posicion]
+        fila1, fila2 = self._filas[2 * self._posicion], self._filas[2 * self._posicion + 1]
+        factor = self._factores[self._posicion]
+        if codigo == MULTIPLICACION:
+            factor = 1 / factor
+        elif codigo == SUMA:
+            factor = -factor
+        self._ejecutar(codigo, fila1, fila2, factor)
+        return True
+
+    def rehacer(self):
+        # Vuelve a aplicar la última operación deshecha
+        if not self.puede_rehacer:
+            return False
+        codigo = self._codigos[self._posicion]
+        fila1, fila2 = self._filas[2 * self._posicion], self._filas[2 * self._posicion + 1]
+        self._ejecutar(codigo, fila1, fila2, self._factores[self._posicion])
+        self._posicion += 1
+        return True
+
+    def diario(self):
+        # Operaciones vigentes como tuplas (tipo, fila1, fila2, factor)
+        for k in range(self._posicion):
+            fila2 = self._filas[2 * k + 1]
+            yield _NOMBRES[self._codigos[k]], self._filas[2 * k], None if fila2 < 0 else fila2, self._factores[k]
+
+
+# ==================== SECUENCIAS DE OPERACIONES ====================
+# Una secuencia de operaciones elementales equivale a multiplicar por la
+# izquierda por una única matriz E = E_k···E_2·E_1. Al componerla una vez,
+# aplicarla a cualquier matriz cuesta un solo producto matricial.
+
+@medir
+def componer_operaciones(operaciones, n):
+    """
+    Compone una secuencia de operaciones (tipo, fila1, fila2, factor)
+    en la matriz de transformación exacta E de tamaño n×n.
+
+    Se obtiene aplicando la secuencia a la identidad: E = E_k···E_1·I.
+    Retorna una RationalMatrix.
+    """
+    motor = MotorOperaciones(RationalMatrix.identidad(n))
+    for tipo, fila1, fila2, factor in operaciones:
+        motor.aplicar(tipo, fila1, fila2, factor)
+    return motor.matriz
+
+
+@medir
+def aplicar_secuencia(A, operaciones, B=None):
+    """
+    Aplica toda una secuencia de operaciones a A (y a B si se da) en una
+    sola pasada sobre la matriz aumentada, sin copias intermedias.
+
+    Retorna (A', B') como RationalMatrix; B' es None si no se dio B.
+    """
+    motor = MotorOperaciones(A, B)
+    motor.aplicar_secuencia(operaciones)
+    return motor.A, motor.B
+
+
+@medir
+def aplicar_secuencia_a_lote(operaciones, matrices):
+    """
+    Aplica la misma secuencia a muchas matrices de n filas.
+
+    La secuencia se compone una sola vez en E. Las matrices con los mismos
+    denominadores por fila (todas las enteras, por ejemplo) se colocan lado
+    a lado juntando sus numeradores de una vez, sin reescalar, y se
+    resuelven con un solo producto E·[M1 | M2 | ...]; así una matriz con
+    denominadores grandes no arrastra al resto a dtype=object.
+    Retorna una lista de RationalMatrix en el mismo orden.
+    """
+    matrices = [RationalMatrix.desde(M) for M in matrices]
+    if not matrices:
+        return []
+    n = matrices[0].shape[0]
+    if any(len(M) != n for M in matrices):
+        raise ValueError("Las matrices deben tener el mismo número de filas.")
+    E = componer_operaciones(operaciones, n)
+
+    grupos = {}
+    for k, M in enumerate(matrices):
+        grupos.setdefault(tuple(int(d) for d in M.den), []).append(k)
+    resultados = [None] * len(matrices)
+    for denominadores, indices in grupos.items():
+        bloque = RationalMatrix.__new__(RationalMatrix)
+        bloque.num = np.hstack([matrices[k].num for k in indices])
+        bloque.den = np.array(denominadores, dtype=bloque.num.dtype)
+        producto = E @ bloque
+        inicio = 0
+        for k in indices:
+            fin = inicio + matrices[k].shape[1]
+            resultados[k] = producto.columnas(inicio, fin)
+            inicio = fin
+    return resultados
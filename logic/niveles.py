@@ -0,0 +1,19 @@
+# Niveles del juego y límites de tamaño. Este módulo no importa NumPy, así
+# la ventana de inicio puede armarse sin cargar la lógica de matrices.
+
+TRANSPUESTA = "Transpuesta"
+GAUSS_JORDAN = "Gauss Jordan"
+INVERSA = "Inversa"
+
+# Nivel que hay que haber completado para entrar a cada nivel
+REQUISITOS = {
+    TRANSPUESTA: (0, None),
+    GAUSS_JORDAN: (1, "Debes completar el Nivel 1 (Transpuesta) antes de avanzar al Nivel 2."),
+    INVERSA: (2, "Debes completar el Nivel 2 (Gauss Jordan) antes de avanzar al Nivel 3."),
+}
+
+TAMANO_MINIMO = 2
+TAMANO_MAXIMO = 200
+
+# Partes derechas (sistemas A·x = b) que lleva la matriz aumentada del nivel Gauss Jordan
+COLUMNAS_DERECHA = 3
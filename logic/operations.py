@@ -1,6 +1,22 @@
 import numpy as np
+from collections import Counter
 from fractions import Fraction
+from logic.rational_matrix import RationalMatrix, LIMITE_INT64, _como_fraccion, _max_abs
+from logic.entrada import interpretar_matriz
+from logic.modular import verificar_inversa_freivalds
+from logic.instrumentacion import medir
 
+# A partir de este tamaño, la verificación exacta de inversas usa Freivalds
+# (O(n²) por ronda) en lugar del producto completo A·B (O(n³))
+UMBRAL_FREIVALDS = 64
+
+# Enteros representables sin pérdida en float64 (mantisa de 53 bits)
+LIMITE_FLOAT_EXACTO = 2 ** 53
+
+# Cuántas veces corrió cada camino de aplicar_operacion_elemental (por matriz)
+CAMINOS = Counter()
+
+@medir
 def crear_matriz_aleatoria(n):
     """
     Genera una matriz aleatoria cuadrada de tamaño n×n.
@@ -19,6 +35,7 @@ def crear_matriz_aleatoria(n):
 # donde las filas de A se convierten en columnas de A^T y viceversa.
 # Matemáticamente: (A^T)_ij = A_ji para todo i,j
 
+@medir
 def comparar_con_transpuesta(matriz, matriz_transpuesta):
     """
     Verifica si una matriz es la transpuesta correcta de otra.
@@ -37,6 +54,7 @@ def comparar_con_transpuesta(matriz, matriz_transpuesta):
         raise ValueError(f"Error al verificar la transpuesta: {e}")
 
 
+@medir
 def evaluar_entrada_transpuesta(matriz, entries):
     """
     Evalúa si la matriz ingresada por el usuario es la transpuesta correcta.
@@ -46,18 +64,11 @@ def evaluar_entrada_transpuesta(matriz, entries):
     2. Construye la matriz con estos valores
     3. Compara con la transpuesta esperada (matriz.T)
 
-    Utilizamos Fraction para manejar entradas como fracciones o decimales,
-    manteniendo precisión exacta.
+    Utilizamos interpretar_matriz para leer enteros, decimales y fracciones
+    directamente como Fraction, manteniendo precisión exacta y sin eval().
     """
     try:
-        matriz_transpuesta = []
-        for i in range(len(entries)):
-            row = []
-            for j in range(len(entries[i])):
-                value = entries[i][j].get()
-                row.append(Fraction(eval(value)))
-            matriz_transpuesta.append(row)
-        matriz_transpuesta = np.array(matriz_transpuesta, dtype=object)
+        matriz_transpuesta = interpretar_matriz([[entry.get() for entry in fila] for fila in entries])
 
         if np.array_equal(matriz_transpuesta, matriz.T):
             return True, "¡Has completado el nivel correctamente!"
@@ -72,48 +83,119 @@ def evaluar_entrada_transpuesta(matriz, entries):
 # para transformar una matriz a su forma escalonada reducida.
 # Este método es fundamental para resolver sistemas de ecuaciones lineales.
 
-def aplicar_operacion_elemental(A, tipo, fila1, fila2=None, factor=1, B=None):
-    """
-    Realiza las tres operaciones elementales por filas en matrices.
+def contadores_caminos():
+    """Copia de CAMINOS: int64, float64, exacta (ya era object) y promovida."""
+    return dict(CAMINOS)
 
-    Fundamentos matemáticos:
-    1. Intercambio de filas: Fi ↔ Fj
-    2. Multiplicación por escalar: Fi → k·Fi (k≠0)
-    3. Suma de múltiplo: Fi → Fi + k·Fj (i≠j)
 
-    Estas operaciones preservan el espacio de soluciones del sistema lineal.
+def reiniciar_contadores_caminos():
+    CAMINOS.clear()
 
-    Parámetros adicionales:
-    - B: matriz opcional que sufrirá las mismas transformaciones
-      (crucial para calcular inversas mediante Gauss-Jordan)
 
-    Utilizamos Fraction para mantener precisión exacta en cálculos
-    con fracciones, evitando errores de redondeo.
+def _operacion_maquina(M, tipo, fila1, fila2, k, limite):
+    """
+    Intenta la operación sobre una copia de M (int64 o float64 con valores
+    enteros) sin salir de enteros exactos menores que `limite`.
+    Retorna la copia modificada, o None si hace falta aritmética exacta.
     """
-    A = A.astype(object)  # Asegura compatibilidad con Fraction
-    if B is not None:
-        B = B.astype(object)
-
+    if tipo == "intercambio":
+        M = M.copy()
+        M[[fila1, fila2]] = M[[fila2, fila1]]
+        return M
+
+    p, q = k.numerator, k.denominator
+    # Un factor que no cabe en el tipo de M no puede entrar en la aritmética de NumPy
+    if abs(p) >= limite or q >= limite:
+        return None
+    if tipo == "multiplicacion":
+        fuente = M[fila1]
+        cota = abs(p) * _max_abs(fuente)
+    else:
+        fuente = M[fila2]
+        cota = _max_abs(M[fila1]) + abs(p) * _max_abs(fuente)
+    if cota >= limite:
+        return None
+    producto = fuente * p
+    # Con factor fraccionario solo se sigue si la división por q es exacta
+    if q != 1:
+        if np.any(producto % q):
+            return None
+        producto = producto // q
+
+    M = M.copy()
+    if tipo == "multiplicacion":
+        M[fila1] = producto
+    else:
+        M[fila1] += producto
+    return M
+
+
+def _operacion_adaptativa(M, tipo, fila1, fila2, factor):
+    # Camino rápido en int64/float64 mientras el resultado sea exacto; si no, Fraction
+    M = np.asarray(M)
+    if M.dtype.kind in "iub":
+        camino, limite = "int64", LIMITE_INT64
+        M = M.astype(np.int64, copy=False)
+    elif M.dtype.kind == "f" and np.all(np.isfinite(M)) and np.all(M == np.round(M)):
+        camino, limite = "float64", LIMITE_FLOAT_EXACTO
+        M = M.astype(np.float64, copy=False)
+    else:
+        camino, limite = "exacta" if M.dtype == object else "promovida", None
+
+    if limite is not None:
+        resultado = _operacion_maquina(M, tipo, fila1, fila2, _como_fraccion(factor), limite)
+        if resultado is not None:
+            CAMINOS[camino] += 1
+            return resultado
+        camino = "promovida"
+    CAMINOS[camino] += 1
+    return _operacion_exacta(M.astype(object), tipo, fila1, fila2, factor)
+
+
+def _operacion_exacta(A, tipo, fila1, fila2, factor):
+    # Utilizamos Fraction para mantener precisión exacta en cálculos
+    # con fracciones, evitando errores de redondeo
     if tipo == "intercambio":
         # Implementación vectorizada del intercambio de filas
         A[[fila1, fila2]] = A[[fila2, fila1]]
-        if B is not None:
-            B[[fila1, fila2]] = B[[fila2, fila1]]
 
     elif tipo == "multiplicacion":
         # Multiplica cada elemento por un factor (k≠0)
         A[fila1] = [Fraction(x) * Fraction(factor) for x in A[fila1]]
-        if B is not None:
-            B[fila1] = [Fraction(x) * Fraction(factor) for x in B[fila1]]
 
     elif tipo == "suma":
         # Operación Fi → Fi + k·Fj
         # Usamos comprensión de listas con zip para operar elemento a elemento
         A[fila1] = [Fraction(x) + Fraction(factor) * Fraction(y)
                     for x, y in zip(A[fila1], A[fila2])]
-        if B is not None:
-            B[fila1] = [Fraction(x) + Fraction(factor) * Fraction(y)
-                        for x, y in zip(B[fila1], B[fila2])]
+
+    return A
+
+
+@medir
+def aplicar_operacion_elemental(A, tipo, fila1, fila2=None, factor=1, B=None):
+    """
+    Realiza las tres operaciones elementales por filas en matrices.
+
+    Fundamentos matemáticos:
+    1. Intercambio de filas: Fi ↔ Fj
+    2. Multiplicación por escalar: Fi → k·Fi (k≠0)
+    3. Suma de múltiplo: Fi → Fi + k·Fj (i≠j)
+
+    Estas operaciones preservan el espacio de soluciones del sistema lineal.
+
+    Parámetros adicionales:
+    - B: matriz opcional que sufrirá las mismas transformaciones
+      (crucial para calcular inversas mediante Gauss-Jordan)
+
+    Las matrices enteras (int64, o float64 con valores enteros) se quedan
+    en su tipo mientras el resultado siga siendo entero y no haya riesgo de
+    desborde; solo entonces pasan a dtype=object con Fraction. Las entradas
+    no se modifican. CAMINOS cuenta cuántas veces corrió cada camino.
+    """
+    A = _operacion_adaptativa(A, tipo, fila1, fila2, factor)
+    if B is not None:
+        B = _operacion_adaptativa(B, tipo, fila1, fila2, factor)
 
     return A, B  # Retorna ambas matrices modificadas
 
@@ -123,7 +205,18 @@ def aplicar_operacion_elemental(A, tipo, fila1, fila2=None, factor=1, B=None):
 # donde I es la matriz identidad. No todas las matrices tienen inversa.
 # Una matriz tiene inversa si y solo si su determinante es no nulo.
 
-def verificar_producto_es_identidad(matriz_original, matriz_inversa):
+def _es_exacta(A):
+    # True si A se puede tratar como racional exacta (sin flotantes)
+    if isinstance(A, RationalMatrix):
+        return True
+    A = np.asarray(A)
+    if A.dtype == object:
+        return all(not isinstance(x, float) for x in A.flat)
+    return A.dtype.kind in "iub"
+
+
+@medir
+def verificar_producto_es_identidad(matriz_original, matriz_inversa, metodo="auto", rondas=3):
     """
     Verifica si el producto de dos matrices es la matriz identidad,
     lo que confirma que una matriz es la inversa de la otra.
@@ -140,8 +233,29 @@ def verificar_producto_es_identidad(matriz_original, matriz_inversa):
 
     Esta función es crucial para verificar si la matriz calculada
     mediante Gauss-Jordan es realmente la inversa.
+
+    Si ninguna de las matrices es de punto flotante (enteros, Fraction o
+    RationalMatrix), la verificación se hace con aritmética racional
+    exacta y no se usa tolerancia. Con metodo="freivalds" (o "auto" y
+    n ≥ UMBRAL_FREIVALDS) se comprueba A·(B·r) = r para vectores
+    aleatorios r módulo un primo de 31 bits sorteado en cada ronda: O(n²)
+    por ronda y una probabilidad de aceptar una inversa incorrecta que se
+    acota en logic.modular.verificar_inversas_freivalds_lote.
+    Con metodo="exacto" siempre se forma el producto completo.
     """
     try:
+        if _es_exacta(matriz_original) and _es_exacta(matriz_inversa):
+            izquierda = RationalMatrix.desde(matriz_original)
+            if izquierda.shape[0] != izquierda.shape[1]:
+                return False, "La matriz original debe ser cuadrada."
+            if metodo == "freivalds" or (metodo == "auto" and izquierda.shape[0] >= UMBRAL_FREIVALDS):
+                correcta = verificar_inversa_freivalds(izquierda, matriz_inversa, rondas)
+            else:
+                correcta = (izquierda @ matriz_inversa).es_identidad()
+            if correcta:
+                return True, "¡La matriz ingresada es la inversa correcta!"
+            return False, "La matriz ingresada no es la inversa correcta."
+
         # Convertimos a float para cálculos numéricos
         matriz_float = np.array(matriz_original, dtype=float)
         matriz_inversa_float = np.array(matriz_inversa, dtype=float)
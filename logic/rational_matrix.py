@@ -0,0 +1,292 @@
+from fractions import Fraction
+import math
+import numpy as np
+
+# Margen de seguridad para int64: si una cota de resultado supera este valor,
+# la matriz se promueve a enteros de precisión arbitraria (dtype=object).
+LIMITE_INT64 = 2 ** 62
+
+
+def _como_fraccion(x):
+    # Convierte escalares (int, float, Fraction, numpy) a Fraction exacta
+    if isinstance(x, Fraction):
+        return x
+    if isinstance(x, np.generic):
+        x = x.item()
+    return Fraction(x)
+
+
+def _max_abs(arreglo):
+    # Cota superior del valor absoluto como entero de Python
+    if arreglo.size == 0:
+        return 0
+    return int(np.max(np.abs(arreglo)))
+
+
+class RationalMatrix:
+    """
+    Matriz de números racionales exactos respaldada por arreglos NumPy.
+
+    Representación:
+    - num: numeradores enteros de forma (n, m), dtype int64
+    - den: denominador común por fila de forma (n,), siempre positivo
+
+    El elemento (i, j) vale num[i, j] / den[i]. Cada fila se mantiene
+    reducida (mcd de la fila y su denominador igual a 1).
+
+    Las operaciones elementales se aplican en el lugar como kernels
+    vectorizados sobre filas completas. Si una operación puede desbordar
+    int64, la matriz pasa a dtype=object con enteros de Python, que tienen
+    precisión arbitraria, y sigue funcionando igual.
+    """
+
+    __slots__ = ("num", "den")
+
+    def __init__(self, num, den=None):
+        num = np.array(num)
+        if num.ndim != 2:
+            raise ValueError("RationalMatrix requiere un arreglo bidimensional.")
+        if num.dtype != object:
+            num = num.astype(np.int64)
+        if den is None:
+            den = np.ones(num.shape[0], dtype=num.dtype)
+        else:
+            den = np.array(den, dtype=num.dtype).reshape(num.shape[0])
+        self.num = num
+        self.den = den
+        for i in range(num.shape[0]):
+            self._normalizar_fila(i)
+
+    # -------------------- Construcción --------------------
+
+    @classmethod
+    def desde(cls, A):
+        """
+        Construye una RationalMatrix a partir de un arreglo de enteros,
+        flotantes u objetos Fraction (o de otra RationalMatrix).
+        """
+        if isinstance(A, RationalMatrix):
+            return A.copy()
+        A = np.asarray(A)
+        if A.ndim == 1:
+            A = A.reshape(-1, 1)
+        if A.dtype.kind in "iub":
+            return cls(A.astype(np.int64))
+
+        # Flotantes u objetos: se pasa por Fraction y se busca el
+        # denominador común de cada fila
+        filas, columnas = A.shape
+        num = np.empty((filas, columnas), dtype=object)
+        den = np.empty(filas, dtype=object)
+        for i in range(filas):
+            fracciones = [_como_fraccion(x) for x in A[i]]
+            d = math.lcm(*(f.denominator for f in fracciones)) if fracciones else 1
+            den[i] = d
+            num[i] = [f.numerator * (d // f.denominator) for f in fracciones]
+        matriz = cls.__new__(cls)
+        matriz.num = num
+        matriz.den = den
+        for i in range(filas):
+            matriz._normalizar_fila(i)
+        matriz._intentar_int64()
+        return matriz
+
+    @classmethod
+    def identidad(cls, n):
+        return cls(np.eye(n, dtype=np.int64))
+
+    def hstack(self, otra):
+        """
+        Concatena columnas [self | otra] llevando ambas partes de cada fila
+        al mínimo común múltiplo de sus denominadores.
+        """
+        if not isinstance(otra, RationalMatrix):
+            otra = RationalMatrix.desde(otra)
+        if len(self) != len(otra):
+            raise ValueError("Las matrices deben tener el mismo número de filas.")
+        comunes = [math.lcm(int(a), int(b)) for a, b in zip(self.den, otra.den)]
+        escala_izq = [c // int(d) for c, d in zip(comunes, self.den)]
+        escala_der = [c // int(d) for c, d in zip(comunes, otra.den)]
+        cota = max(comunes, default=1) * max(_max_abs(self.num), _max_abs(otra.num))
+        grande = cota >= LIMITE_INT64 or max(comunes, default=1) >= LIMITE_INT64
+        tipo = object if grande or not (self.exacta_int64 and otra.exacta_int64) else np.int64
+        izquierda = self.num.astype(tipo) * np.array(escala_izq, dtype=tipo)[:, None]
+        derecha = otra.num.astype(tipo) * np.array(escala_der, dtype=tipo)[:, None]
+        resultado = RationalMatrix.__new__(RationalMatrix)
+        resultado.num = np.hstack((izquierda, derecha))
+        resultado.den = np.array(comunes, dtype=tipo)
+        return resultado
+
+    def columnas(self, inicio, fin=None):
+        # Submatriz con las columnas [inicio, fin), como nueva RationalMatrix reducida
+        resultado = RationalMatrix.__new__(RationalMatrix)
+        resultado.num = self.num[:, inicio:fin].copy()
+        resultado.den = self.den.copy()
+        for i in range(resultado.num.shape[0]):
+            resultado._normalizar_fila(i)
+        return resultado
+
+    def copy(self):
+        copia = RationalMatrix.__new__(RationalMatrix)
+        copia.num = self.num.copy()
+        copia.den = self.den.copy()
+        return copia
+
+    # -------------------- Acceso --------------------
+
+    @property
+    def shape(self):
+        return self.num.shape
+
+    @property
+    def exacta_int64(self):
+        # True mientras la matriz se mantiene en la ruta rápida int64
+        return self.num.dtype != object
+
+    def __len__(self):
+        return self.num.shape[0]
+
+    def __getitem__(self, indice):
+        i, j = indice
+        return Fraction(int(self.num[i, j]), int(self.den[i]))
+
+    def fila(self, i):
+        d = int(self.den[i])
+        return [Fraction(int(x), d) for x in self.num[i]]
+
+    def __iter__(self):
+        for i in range(self.num.shape[0]):
+            yield self.fila(i)
+
+    def a_fracciones(self):
+        # Arreglo dtype=object de Fraction, para interoperar con código existente
+        return np.array([self.fila(i) for i in range(self.num.shape[0])], dtype=object).reshape(self.shape)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and np.dtype(dtype).kind == "f":
+            return self.num.astype(float) / self.den.astype(float)[:, None]
+        arreglo = self.a_fracciones()
+        return arreglo if dtype is None else arreglo.astype(dtype)
+
+    def mascara_no_cero(self):
+        return self.num != 0
+
+    def mascara_uno(self):
+        return self.num == self.den[:, None]
+
+    def es_identidad(self):
+        filas, columnas = self.shape
+        if filas != columnas:
+            return False
+        return bool(np.array_equal(self.num, np.diag(self.den)))
+
+    def __eq__(self, otra):
+        if not isinstance(otra, RationalMatrix):
+            return NotImplemented
+        return (self.shape == otra.shape
+                and np.array_equal(self.num, otra.num)
+                and np.array_equal(self.den, otra.den))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"RationalMatrix({self.a_fracciones().tolist()!r})"
+
+    # -------------------- Mantenimiento interno --------------------
+
+    def _normalizar_fila(self, i):
+        # Divide la fila y su denominador por su mcd común
+        g = math.gcd(int(np.gcd.reduce(self.num[i])) if self.num.shape[1] else 0, int(self.den[i]))
+        if g > 1:
+            self.num[i] //= g
+            self.den[i] //= g
+
+    def _promover(self):
+        # Pasa a enteros de Python para evitar desbordamientos
+        if self.num.dtype != object:
+            self.num = self.num.astype(object)
+            self.den = self.den.astype(object)
+
+    def _intentar_int64(self):
+        # Vuelve a int64 si todos los valores caben con holgura
+        if self.num.dtype == object and max(_max_abs(self.num), _max_abs(self.den)) < LIMITE_INT64:
+            self.num = self.num.astype(np.int64)
+            self.den = self.den.astype(np.int64)
+
+    # -------------------- Operaciones elementales en el lugar --------------------
+
+    def intercambiar(self, i, j):
+        """Fi ↔ Fj"""
+        self.num[[i, j]] = self.num[[j, i]]
+        self.den[[i, j]] = self.den[[j, i]]
+        return self
+
+    def escalar(self, i, factor):
+        """Fi → k·Fi (k≠0)"""
+        k = _como_fraccion(factor)
+        if k == 0:
+            raise ValueError("El factor de multiplicación no puede ser cero.")
+        p, q = k.numerator, k.denominator
+        # abs(p) se revisa solo: con la fila en cero el producto no lo acota
+        if (abs(p) >= LIMITE_INT64 or q * int(self.den[i]) >= LIMITE_INT64
+                or abs(p) * _max_abs(self.num[i]) >= LIMITE_INT64):
+            self._promover()
+        # Se conserva el signo en el numerador: el denominador siempre es positivo
+        self.num[i] *= p
+        self.den[i] *= q
+        self._normalizar_fila(i)
+        return self
+
+    def sumar_multiplo(self, i, j, factor):
+        """Fi → Fi + k·Fj (i≠j)"""
+        k = _como_fraccion(factor)
+        if k == 0:
+            return self
+        p, q = k.numerator, k.denominator
+        di, dj = int(self.den[i]), int(self.den[j])
+        # Denominador común mínimo de ambos términos
+        d_nuevo = math.lcm(di, q * dj)
+        a, b = d_nuevo // di, (d_nuevo // (q * dj)) * p
+        cota = a * _max_abs(self.num[i]) + abs(b) * _max_abs(self.num[j])
+        # Los multiplicadores también deben caber aunque alguna fila sea cero
+        if cota >= LIMITE_INT64 or d_nuevo >= LIMITE_INT64 or a >= LIMITE_INT64 or abs(b) >= LIMITE_INT64:
+            self._promover()
+        self.num[i] = self.num[i] * a + self.num[j] * b
+        self.den[i] = d_nuevo
+        self._normalizar_fila(i)
+        return self
+
+    # -------------------- Aritmética --------------------
+
+    def __matmul__(self, otra):
+        """
+        Producto exacto A·B.
+
+        Con A = diag(1/dA)·NA y B = diag(1/dB)·NB, se escalan las columnas
+        de NA por L/dB (L = mcm de dB) para obtener un único producto entero:
+        A·B = diag(1/(dA·L)) · (NA·(L/dB)) · NB
+        """
+        if not isinstance(otra, RationalMatrix):
+            otra = RationalMatrix.desde(otra)
+        if self.shape[1] != otra.shape[0]:
+            raise ValueError("Dimensiones incompatibles para el producto matricial.")
+        L = math.lcm(*(int(d) for d in otra.den)) if len(otra) else 1
+        escala = [L // int(d) for d in otra.den]
+        cota_izq = _max_abs(self.num) * max(escala, default=1)
+        cota = self.shape[1] * cota_izq * _max_abs(otra.num)
+        denominadores = [int(d) * L for d in self.den]
+        if cota >= LIMITE_INT64 or max(denominadores, default=1) >= LIMITE_INT64:
+            izquierda = self.num.astype(object) * np.array(escala, dtype=object)[None, :]
+            producto = izquierda.dot(otra.num.astype(object))
+            den = np.array(denominadores, dtype=object)
+        else:
+            izquierda = self.num.astype(np.int64) * np.array(escala, dtype=np.int64)[None, :]
+            producto = izquierda @ otra.num.astype(np.int64)
+            den = np.array(denominadores, dtype=np.int64)
+        resultado = RationalMatrix.__new__(RationalMatrix)
+        resultado.num = producto
+        resultado.den = den
+        for i in range(producto.shape[0]):
+            resultado._normalizar_fila(i)
+        resultado._intentar_int64()
+        return resultado
@@ -0,0 +1,291 @@
+"""
+Registros compactos de sesión para alojar muchas partidas a la vez.
+
+Una GameSession guarda su estado en varios objetos sueltos (arreglos,
+motor con diario, formateador). Para miles de sesiones en un servidor, la
+TablaSesiones reserva de una vez un bloque contiguo (arena) con:
+
+- num: numeradores int64 de forma (capacidad, n_max, n_max + max(n_max,
+  COLUMNAS_DERECHA)), que alcanza para [A | B] con B de COLUMNAS_DERECHA
+  columnas (Gauss Jordan, varios sistemas a la vez) o la identidad (Inversa)
+- den: denominadores int64 por fila de forma (capacidad, n_max)
+- meta: arreglo estructurado con nivel, progreso, n, columnas y el
+  contador de operaciones de cada sesión
+
+Cada RegistroSesion guarda solo su índice en la arena y expone la matriz
+aumentada como una RationalMatrix cuyos arreglos son vistas de la arena,
+así las operaciones elementales escriben directamente en el bloque
+compartido. Si una operación desborda int64, esa sesión pasa a una matriz
+propia con enteros de Python y deja de usar su fila de la arena.
+
+Uso del banco de memoria:
+    python -m logic.registro --sesiones 2000 --tamanos 2 3 4 5 20 100
+"""
+import argparse
+import sys
+import tracemalloc
+from array import array
+import numpy as np
+from logic.motor import INTERCAMBIO, MULTIPLICACION, validar_operacion
+from logic.niveles import COLUMNAS_DERECHA
+from logic.rational_matrix import RationalMatrix
+
+TIPO_META = np.dtype([
+    ("nivel", np.int8),
+    ("current_level", np.int8),
+    ("n", np.int16),
+    ("columnas_a", np.int16),
+    ("columnas", np.int16),
+    ("operaciones", np.int32),
+])
+
+
+class RegistroSesion:
+    """Sesión almacenada en una fila de la arena de una TablaSesiones."""
+
+    __slots__ = ("tabla", "indice", "_externa")
+
+    def __init__(self, tabla, indice):
+        self.tabla = tabla
+        self.indice = indice
+        self._externa = None  # Matriz propia si la sesión se desbordó de int64
+
+    def _cargar(self, aumentada, columnas_a):
+        n, columnas = aumentada.shape
+        if aumentada.exacta_int64:
+            self.tabla.num[self.indice, :n, :columnas] = aumentada.num
+            self.tabla.den[self.indice, :n] = aumentada.den
+        else:
+            self._externa = aumentada.copy()
+        meta = self.tabla.meta[self.indice]
+        meta["n"] = n
+        meta["columnas_a"] = columnas_a
+        meta["columnas"] = columnas
+        meta["operaciones"] = 0
+
+    def alojar(self, aumentada, columnas_a):
+        """
+        Copia la matriz aumentada a la fila de la arena de esta sesión y
+        retorna la matriz con la que seguir operando: una vista de la arena
+        o, si no cabe o ya no es int64, la misma matriz. Así un motor puede
+        operar directamente sobre la arena (motor.matriz = registro.alojar(...)).
+        """
+        if not (self.tabla.cabe(aumentada) and aumentada.exacta_int64):
+            return aumentada
+        self._externa = None
+        self._cargar(aumentada, columnas_a)
+        return self.matriz
+
+    # -------------------- Campos empaquetados --------------------
+
+    def _campo(self, nombre):
+        return int(self.tabla.meta[nombre][self.indice])
+
+    @property
+    def nivel(self):
+        return self._campo("nivel")
+
+    @nivel.setter
+    def nivel(self, valor):
+        self.tabla.meta["nivel"][self.indice] = valor
+
+    @property
+    def current_level(self):
+        return self._campo("current_level")
+
+    @current_level.setter
+    def current_level(self, valor):
+        self.tabla.meta["current_level"][self.indice] = valor
+
+    @property
+    def n(self):
+        return self._campo("n")
+
+    @property
+    def operaciones(self):
+        return self._campo("operaciones")
+
+    @property
+    def en_arena(self):
+        # False si la sesión se desbordó a enteros de Python
+        return self._externa is None
+
+    @property
+    def matriz(self):
+        """Matriz aumentada [A | B]; en la arena, sus arreglos son vistas del bloque."""
+        if self._externa is not None:
+            return self._externa
+        n, columnas = self._campo("n"), self._campo("columnas")
+        matriz = RationalMatrix.__new__(RationalMatrix)
+        matriz.num = self.tabla.num[self.indice, :n, :columnas]
+        matriz.den = self.tabla.den[self.indice, :n]
+        return matriz
+
+    @property
+    def A(self):
+        return self.matriz.columnas(0, self._campo("columnas_a"))
+
+    @property
+    def B(self):
+        columnas_a = self._campo("columnas_a")
+        if self._campo("columnas") == columnas_a:
+            return None
+        return self.matriz.columnas(columnas_a)
+
+    # -------------------- Operaciones --------------------
+
+    def aplicar(self, tipo, fila1, fila2=None, factor=1):
+        """Aplica una operación elemental sobre la matriz aumentada en la arena."""
+        codigo, factor = validar_operacion(tipo, fila1, fila2, factor, self.n)
+        matriz = self.matriz
+        if codigo == INTERCAMBIO:
+            matriz.intercambiar(fila1, fila2)
+        elif codigo == MULTIPLICACION:
+            matriz.escalar(fila1, factor)
+        else:
+            matriz.sumar_multiplo(fila1, fila2, factor)
+        if not matriz.exacta_int64:
+            # La operación promovió la matriz a objetos: ya no cabe en la arena
+            self._externa = matriz
+        self.tabla.meta["operaciones"][self.indice] += 1
+
+
+class TablaSesiones:
+    """
+    Tabla de sesiones con arena preasignada para matrices de hasta n_max filas.
+
+    asignar() toma un índice libre en O(1) y liberar() lo devuelve; no se
+    reserva memoria nueva mientras la sesión se mantenga en int64.
+    """
+
+    def __init__(self, capacidad, n_max=5):
+        self.capacidad = capacidad
+        self.n_max = n_max
+        # A más la identidad (Inversa) o las partes derechas (Gauss Jordan)
+        self.columnas_max = n_max + max(n_max, COLUMNAS_DERECHA)
+        self.num = np.zeros((capacidad, n_max, self.columnas_max), dtype=np.int64)
+        self.den = np.ones((capacidad, n_max), dtype=np.int64)
+        self.meta = np.zeros(capacidad, dtype=TIPO_META)
+        # Pila de índices libres; se asignan primero los más bajos
+        self._libres = array("l", range(capacidad - 1, -1, -1))
+        self._registros = [None] * capacidad
+
+    def __len__(self):
+        return self.capacidad - len(self._libres)
+
+    def __getitem__(self, indice):
+        registro = self._registros[indice]
+        if registro is None:
+            raise IndexError(f"No hay una sesión en el índice {indice}.")
+        return registro
+
+    @property
+    def nbytes(self):
+        # Memoria de la arena (fija, independiente de las sesiones ocupadas)
+        return self.num.nbytes + self.den.nbytes + self.meta.nbytes + self._libres.itemsize * self.capacidad
+
+    def asignar(self, nivel, A, B=None, current_level=0):
+        """
+        Crea una sesión del nivel dado con la matriz A y la parte derecha B
+        (opcional) y retorna su RegistroSesion.
+        """
+        A = RationalMatrix.desde(A)
+        aumentada = A if B is None else A.hstack(B)
+        if not self.cabe(aumentada):
+            raise ValueError(f"La matriz no cabe en la tabla (máximo {self.n_max} filas).")
+        registro = self.reservar(nivel, current_level)
+        registro._cargar(aumentada, A.shape[1])
+        return registro
+
+    def cabe(self, aumentada):
+        # True si la matriz aumentada entra en una fila de la arena
+        n, columnas = aumentada.shape
+        return n <= self.n_max and columnas <= self.columnas_max
+
+    def reservar(self, nivel=0, current_level=0):
+        """Toma un índice libre para una sesión todavía sin matriz."""
+        if not self._libres:
+            raise ValueError("La tabla de sesiones está llena.")
+        indice = self._libres.pop()
+        registro = RegistroSesion(self, indice)
+        self.meta[indice] = 0
+        registro.nivel = nivel
+        registro.current_level = current_level
+        self._registros[indice] = registro
+        return registro
+
+    def liberar(self, registro):
+        # Devuelve el índice de la sesión a la pila de libres
+        if self._registros[registro.indice] is not registro:
+            raise ValueError("La sesión no pertenece a esta tabla.")
+        self._registros[registro.indice] = None
+        registro._externa = None
+        self._libres.append(registro.indice)
+
+
+# ==================== BANCO DE MEMORIA ====================
+
+def _medir(crear, cantidad):
+    # Bytes asignados en Python por sesión al crear `cantidad` sesiones
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = [crear(i) for i in range(cantidad)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return (despues - antes) / cantidad
+
+
+def medir_memoria(n, sesiones=1000, semilla=0):
+    """
+    Bytes por sesión de nivel Inversa (A n×n con la identidad a la derecha) en
+    tres representaciones:
+    - fracciones: arreglos dtype=object de Fraction como el juego original
+    - motor: MotorOperaciones con RationalMatrix, como GameSession
+    - registro: RegistroSesion en una TablaSesiones (incluye la arena)
+    """
+    from logic.motor import MotorOperaciones
+    from logic.rational_matrix import _como_fraccion
+
+    rng = np.random.default_rng(semilla)
+    matrices = rng.integers(-10, 10, size=(sesiones, n, n), dtype=np.int64)
+    identidad = np.eye(n, dtype=np.int64)
+
+    def fracciones(i):
+        A = np.vectorize(_como_fraccion, otypes=[object])(matrices[i])
+        return A, np.vectorize(_como_fraccion, otypes=[object])(identidad)
+
+    def motor(i):
+        return MotorOperaciones(matrices[i], identidad)
+
+    tabla = None
+
+    def registro(i):
+        nonlocal tabla
+        if tabla is None:
+            tabla = TablaSesiones(sesiones, n)
+        return tabla.asignar(3, matrices[i], identidad)
+
+    return {
+        "n": n,
+        "fracciones": _medir(fracciones, sesiones),
+        "motor": _medir(motor, sesiones),
+        "registro": _medir(registro, sesiones),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide los bytes por sesión de cada representación.")
+    parser.add_argument("--sesiones", type=int, default=1000)
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[2, 3, 4, 5, 20, 100])
+    args = parser.parse_args(argv)
+
+    print(f"{'n':>4} {'fracciones':>12} {'motor':>12} {'registro':>12}   (bytes por sesión)")
+    for n in args.tamanos:
+        fila = medir_memoria(n, args.sesiones)
+        print(f"{n:>4} {fila['fracciones']:>12.0f} {fila['motor']:>12.0f} {fila['registro']:>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
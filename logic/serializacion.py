@@ -0,0 +1,117 @@
+"""
+Serialización de resultados y matrices a datos JSON.
+
+La caché de resultados y las instantáneas de la bitácora se guardan en
+disco como JSON con solo números: enteros para lo exacto (numeradores y
+denominadores de cualquier tamaño) y flotantes para las matrices en punto
+flotante. Leer un archivo ajeno o dañado nunca ejecuta código (a
+diferencia de pickle): decodificar() revisa el tipo, la forma y los
+denominadores de cada valor y lanza ArchivoInvalido si algo no encaja.
+
+Cada valor es un objeto con su tipo en "t":
+    {"t": "nada"}  {"t": "entero", "v": 3}  {"t": "fraccion", "num": 1, "den": 2}
+    {"t": "arreglo", "dtype": "<i8", "forma": [2, 2], "datos": [...]}
+    {"t": "arreglo_racional", "forma": [2, 2], "num": [...], "den": [...]}
+    {"t": "racional", "forma": [2, 2], "num": [...], "den": [...]}  (RationalMatrix)
+"""
+import math
+from fractions import Fraction
+import numpy as np
+from logic.rational_matrix import RationalMatrix, LIMITE_INT64
+
+# Errores que puede lanzar leer y decodificar un archivo JSON ajeno
+ERRORES_LECTURA = (ValueError, KeyError, TypeError, OverflowError, RecursionError)
+
+
+class ArchivoInvalido(ValueError):
+    """Los datos leídos de un archivo no tienen la forma esperada."""
+
+
+def codificar(valor):
+    """Objeto JSON para None, un entero, una Fraction, un arreglo o una RationalMatrix."""
+    if valor is None:
+        return {"t": "nada"}
+    if isinstance(valor, (bool, np.bool_)):
+        raise TypeError("Valor booleano inesperado.")
+    if isinstance(valor, (int, np.integer)):
+        return {"t": "entero", "v": int(valor)}
+    if isinstance(valor, Fraction):
+        return {"t": "fraccion", "num": valor.numerator, "den": valor.denominator}
+    if isinstance(valor, np.ndarray) and valor.dtype != object:
+        return {"t": "arreglo", "dtype": valor.dtype.str, "forma": list(valor.shape), "datos": valor.ravel().tolist()}
+    if isinstance(valor, np.ndarray):
+        fracciones = [Fraction(x) for x in valor.flat]
+        return {"t": "arreglo_racional", "forma": list(valor.shape),
+                "num": [f.numerator for f in fracciones], "den": [f.denominator for f in fracciones]}
+    if isinstance(valor, RationalMatrix):
+        return {"t": "racional", "forma": list(valor.shape),
+                "num": [int(x) for x in valor.num.flat], "den": [int(x) for x in valor.den]}
+    raise TypeError(f"Valor de tipo {type(valor).__name__} no admitido.")
+
+
+def entero(x):
+    if type(x) is not int:
+        raise ArchivoInvalido("Se esperaba un entero.")
+    return x
+
+
+def enteros(lista, forma, positivos=False):
+    # Arreglo int64 si todos caben con holgura; si no, enteros de Python (dtype=object)
+    if not isinstance(lista, list) or len(lista) != math.prod(forma):
+        raise ArchivoInvalido("Lista de enteros con largo incorrecto.")
+    valores = [entero(x) for x in lista]
+    if positivos and any(x <= 0 for x in valores):
+        raise ArchivoInvalido("Denominador no positivo.")
+    dtype = np.int64 if all(-LIMITE_INT64 < x < LIMITE_INT64 for x in valores) else object
+    arreglo = np.empty(len(valores), dtype=dtype)
+    arreglo[:] = valores
+    return arreglo.reshape(forma)
+
+
+def forma_valida(datos, dimensiones=None):
+    forma = datos["forma"]
+    if (not isinstance(forma, list) or dimensiones is not None and len(forma) != dimensiones
+            or any(entero(x) < 0 for x in forma)):
+        raise ArchivoInvalido("Forma inválida.")
+    return tuple(forma)
+
+
+def decodificar(datos):
+    """Inverso de codificar(); lanza ArchivoInvalido si `datos` no es un valor válido."""
+    if not isinstance(datos, dict):
+        raise ArchivoInvalido("Se esperaba un objeto.")
+    tipo = datos.get("t")
+    if tipo == "nada":
+        return None
+    if tipo == "entero":
+        return entero(datos["v"])
+    if tipo == "fraccion":
+        den = entero(datos["den"])
+        if den <= 0:
+            raise ArchivoInvalido("Denominador no positivo.")
+        return Fraction(entero(datos["num"]), den)
+    if tipo == "arreglo":
+        dtype = np.dtype(datos["dtype"]) if isinstance(datos["dtype"], str) else None
+        if dtype is None or dtype.kind not in "iuf":
+            raise ArchivoInvalido("Tipo de arreglo no admitido.")
+        forma = forma_valida(datos)
+        valores = datos["datos"]
+        if (not isinstance(valores, list) or len(valores) != math.prod(forma)
+                or any(type(x) not in (int, float) for x in valores)):
+            raise ArchivoInvalido("Datos de arreglo inválidos.")
+        return np.array(valores, dtype=dtype).reshape(forma)
+    if tipo == "arreglo_racional":
+        forma = forma_valida(datos)
+        num = enteros(datos["num"], forma).ravel()
+        den = enteros(datos["den"], forma, positivos=True).ravel()
+        valores = np.empty(len(num), dtype=object)
+        valores[:] = [Fraction(int(a), int(b)) for a, b in zip(num, den)]
+        return valores.reshape(forma)
+    if tipo == "racional":
+        forma = forma_valida(datos, 2)
+        num = enteros(datos["num"], forma)
+        den = enteros(datos["den"], (forma[0],), positivos=True)
+        if num.dtype != den.dtype:
+            num, den = num.astype(object), den.astype(object)
+        return RationalMatrix(num, den)
+    raise ArchivoInvalido(f"Tipo de valor desconocido: {tipo!r}.")
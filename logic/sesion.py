@@ -0,0 +1,406 @@
+from fractions import Fraction
+import numpy as np
+from logic import bitacora as bit
+from logic.generador import PoolMatrices, NIVEL_TRANSPUESTA, NIVEL_GAUSS, NIVEL_INVERSA
+from logic.motor import MotorOperaciones, CODIGOS
+from logic.operations import comparar_con_transpuesta, verificar_producto_es_identidad, UMBRAL_FREIVALDS
+from logic import cache as resultados
+from logic.matrix_utils import FormateadorMatriz
+from logic.eliminacion import resolver_sistemas, UNICA, INFINITAS
+from logic.entrada import interpretar_matriz
+from logic.rational_matrix import RationalMatrix
+from logic.serializacion import ArchivoInvalido, codificar, decodificar, entero
+from logic.instrumentacion import medir_metodos
+from logic.niveles import TRANSPUESTA, GAUSS_JORDAN, INVERSA, REQUISITOS, TAMANO_MINIMO, TAMANO_MAXIMO, COLUMNAS_DERECHA
+
+# Códigos de nivel en la bitácora (0 = menú)
+CODIGOS_NIVEL = {None: 0, TRANSPUESTA: NIVEL_TRANSPUESTA, GAUSS_JORDAN: NIVEL_GAUSS, INVERSA: NIVEL_INVERSA}
+_NOMBRES_OPERACION = {codigo: tipo for tipo, codigo in CODIGOS.items()}
+
+
+def describir_sistemas(solucion):
+    # Una línea por sistema: si tiene solución única, infinitas o ninguna
+    lineas = []
+    for j in range(len(solucion.consistentes)):
+        estado = solucion.estado(j)
+        if estado == UNICA:
+            lineas.append(f"Sistema {j + 1}: solución única.")
+        elif estado == INFINITAS:
+            libres = solucion.incognitas - solucion.rango
+            lineas.append(f"Sistema {j + 1}: infinitas soluciones ({libres} variable(s) libre(s)).")
+        else:
+            lineas.append(f"Sistema {j + 1}: sin solución (inconsistente).")
+    return "\n".join(lineas)
+
+
+@medir_metodos
+class GameSession:
+    """
+    Estado de una partida, sin dependencia de Tkinter.
+
+    Máquina de estados:
+    - current_level: último nivel completado (0 a 3); habilita los siguientes
+    - nivel: nivel en curso (TRANSPUESTA, GAUSS_JORDAN, INVERSA) o None en el menú
+
+    Las acciones que pueden fallar por datos del usuario lanzan ValueError o
+    IndexError con un mensaje para mostrar. Las verificaciones de los niveles
+    retornan (exito, mensaje), igual que las funciones de logic.operations.
+
+    Con una Bitacora, cada operación y cada cambio de nivel se anota en
+    disco y recuperar() reconstruye la partida al volver a abrir el juego.
+
+    Los resultados esperados (transpuesta, forma reducida, inversa) se
+    piden a una CacheResultados; por defecto, la compartida del proceso.
+    """
+
+    def __init__(self, pool=None, bitacora=None, cache=None):
+        self.pool = pool if pool is not None else PoolMatrices()
+        self.bitacora = bitacora
+        self.cache = cache if cache is not None else resultados.compartida()
+        self.current_level = 0
+        self.nivel = None
+        self.n = 0
+        self.matriz = None
+        self.matriz_original = None
+        self.derecha = None  # Partes derechas originales de los sistemas (Gauss Jordan)
+        self.motor = None
+        self.formateador = None
+
+    # -------------------- Progresión de niveles --------------------
+
+    def nivel_disponible(self, nivel):
+        return self.current_level >= REQUISITOS[nivel][0]
+
+    def motivo_bloqueo(self, nivel):
+        # Mensaje que explica por qué el nivel aún no está habilitado (None si lo está)
+        return None if self.nivel_disponible(nivel) else REQUISITOS[nivel][1]
+
+    @staticmethod
+    def validar_tamano(n):
+        # Lanza ValueError si n no es un tamaño de matriz admitido
+        if not TAMANO_MINIMO <= n <= TAMANO_MAXIMO:
+            raise ValueError(f"Por favor, ingresa un número válido entre {TAMANO_MINIMO} y {TAMANO_MAXIMO}.")
+        return n
+
+    def iniciar(self, nivel, n):
+        """
+        Inicia un nivel con una matriz n×n tomada de la reserva.
+        Retorna (exito, mensaje); falla si el nivel aún no está habilitado.
+        """
+        if not self.nivel_disponible(nivel):
+            return False, self.motivo_bloqueo(nivel)
+        self.validar_tamano(n)
+        self.n = n
+        self.nivel = nivel
+        self.motor = None
+        self.formateador = None
+        self.derecha = None
+
+        if nivel == TRANSPUESTA:
+            self.matriz = self.pool.obtener(NIVEL_TRANSPUESTA, n)
+        elif nivel == GAUSS_JORDAN:
+            self.matriz = self.pool.obtener(NIVEL_GAUSS, n)
+            # Partes derechas de COLUMNAS_DERECHA sistemas, transformadas junto con A
+            self.derecha = np.random.randint(-10, 10, (n, COLUMNAS_DERECHA))
+            self.motor = MotorOperaciones(self.matriz, self.derecha)
+        else:
+            # Matriz invertible con inversa de denominadores pequeños
+            self.matriz = self.pool.obtener(NIVEL_INVERSA, n)
+            self.matriz_original = self.matriz.copy()
+            self.motor = MotorOperaciones(self.matriz, np.eye(n, dtype=np.int64))
+
+        if self.motor is not None:
+            self.formateador = FormateadorMatriz(self.motor.columnas_a)
+        if self.bitacora is not None:
+            if self.motor is not None:
+                self.bitacora.registrar_matriz(bit.INICIO, CODIGOS_NIVEL[nivel], self.motor.matriz, self.motor.columnas_a)
+            else:
+                self.bitacora.registrar_matriz(bit.INICIO, CODIGOS_NIVEL[nivel], self.matriz)
+        self._guardar_instantanea()
+        return True, ""
+
+    def salir(self):
+        # Vuelve al menú sin cambiar el progreso
+        self._limpiar()
+        self._registrar(bit.SALIR)
+
+    def reiniciar(self):
+        # Reinicia el progreso al nivel 1
+        self.current_level = 0
+        self._limpiar()
+        self._registrar(bit.REINICIO)
+
+    def _limpiar(self):
+        self.nivel = None
+        self.matriz = None
+        self.matriz_original = None
+        self.derecha = None
+        self.motor = None
+        self.formateador = None
+
+    def _completar(self, nivel):
+        self.current_level = nivel
+        self._registrar(bit.COMPLETADO, nivel)
+
+    # -------------------- Persistencia --------------------
+
+    def _registrar(self, tipo, nivel=0):
+        if self.bitacora is not None:
+            self.bitacora.registrar_evento(tipo, nivel)
+            if self.bitacora.necesita_instantanea:
+                self._guardar_instantanea()
+
+    def _guardar_instantanea(self):
+        # Solo datos (ver logic.serializacion): la instantánea se lee sin ejecutar código
+        if self.bitacora is not None:
+            self.bitacora.guardar_instantanea({
+                "current_level": self.current_level,
+                "nivel": self.nivel,
+                "n": self.n,
+                "matriz": codificar(self.matriz),
+                "matriz_original": codificar(self.matriz_original),
+                "derecha": codificar(self.derecha),
+                "motor": None if self.motor is None else self.motor.a_datos(),
+            })
+
+    @staticmethod
+    def _leer_instantanea(datos):
+        # Inverso de _guardar_instantanea; lanza ArchivoInvalido si los datos no encajan
+        estado = {
+            "current_level": entero(datos["current_level"]),
+            "nivel": datos["nivel"],
+            "n": entero(datos["n"]),
+            "matriz": decodificar(datos["matriz"]),
+            "matriz_original": decodificar(datos["matriz_original"]),
+            "derecha": decodificar(datos["derecha"]),
+            "motor": None if datos["motor"] is None else MotorOperaciones.desde_datos(datos["motor"]),
+        }
+        if not 0 <= estado["current_level"] <= 3 or estado["nivel"] not in CODIGOS_NIVEL:
+            raise ArchivoInvalido("Nivel inválido en la instantánea.")
+        if estado["nivel"] is not None and estado["matriz"] is None:
+            raise ArchivoInvalido("Falta la matriz del nivel en curso.")
+        if (estado["nivel"] in (GAUSS_JORDAN, INVERSA)) != (estado["motor"] is not None):
+            raise ArchivoInvalido("El motor no corresponde al nivel en curso.")
+        return estado
+
+    def _reconstruir_matriz(self, tipo, nivel, columnas_a, valores):
+        """
+        Rehace el estado de un registro INICIO o MATRIZ a partir de sus
+        registros VALOR, para recuperar la partida sin instantánea.
+        """
+        if all(v.denominator == 1 for v in valores.flat):
+            valores = valores.astype(np.int64)
+        A, B = valores[:, :columnas_a], valores[:, columnas_a:]
+        B = B if B.shape[1] else None
+        if tipo == bit.INICIO:
+            self._limpiar()
+            self.nivel = nivel
+            self.n = len(valores)
+            if nivel == INVERSA:
+                self.matriz_original = A.copy()
+        elif self.nivel is None:
+            return
+        self.matriz = A
+        if self.nivel == GAUSS_JORDAN:
+            self.derecha = B
+        self.motor = MotorOperaciones(A, B) if self.nivel in (GAUSS_JORDAN, INVERSA) else None
+
+    def recuperar(self):
+        """
+        Reconstruye la partida desde la bitácora: carga la última instantánea
+        y reproduce los registros posteriores. Retorna cuántos reprodujo.
+
+        Sin instantánea (falta, está dañada o no corresponde) se reproduce
+        toda la bitácora: cada nivel se rehace desde sus registros INICIO y
+        VALOR. Los registros que no encajan con el estado (una operación sin
+        nivel en curso, índices fuera de rango) se saltan.
+        """
+        if self.bitacora is None:
+            return 0
+        estado, registros = self.bitacora.cargar(self._leer_instantanea)
+        if estado is not None:
+            self.current_level = estado["current_level"]
+            self.nivel = estado["nivel"]
+            self.n = estado["n"]
+            self.matriz = estado["matriz"]
+            self.matriz_original = estado["matriz_original"]
+            self.derecha = estado["derecha"]
+            self.motor = estado["motor"]
+
+        niveles = {codigo: nivel for nivel, codigo in CODIGOS_NIVEL.items()}
+        pendiente = None  # (tipo, nivel, columnas_a, valores) de un INICIO o MATRIZ que espera sus VALOR
+        faltan = 0
+        for tipo, nivel, codigo, fila1, fila2, num, den in zip(
+                registros["tipo"].tolist(), registros["nivel"].tolist(), registros["codigo"].tolist(),
+                registros["fila1"].tolist(), registros["fila2"].tolist(),
+                registros["num"].tolist(), registros["den"].tolist()):
+            if tipo == bit.VALOR:
+                if pendiente is not None and 0 <= fila1 < pendiente[3].shape[0] \
+                        and 0 <= fila2 < pendiente[3].shape[1] and den > 0:
+                    pendiente[3][fila1, fila2] = Fraction(num, den)
+                    faltan -= 1
+                    if faltan == 0:
+                        self._reconstruir_matriz(*pendiente)
+                        pendiente = None
+                continue
+            if pendiente is not None:
+                # Un nivel cuya matriz no alcanzó a guardarse completa: se vuelve al menú
+                self._limpiar()
+                pendiente = None
+            if tipo in (bit.INICIO, bit.MATRIZ):
+                # fila1 = filas, fila2 = columnas de A, num = columnas totales
+                if nivel in niveles and fila1 > 0 and 0 < fila2 <= num:
+                    pendiente = (tipo, niveles[nivel], fila2, np.zeros((fila1, num), dtype=object))
+                    faltan = fila1 * num
+                else:
+                    self._limpiar()
+            elif tipo in (bit.OPERACION, bit.DESHACER, bit.REHACER):
+                if self.motor is None:
+                    continue
+                if tipo == bit.OPERACION:
+                    try:
+                        self.motor.aplicar(_NOMBRES_OPERACION.get(codigo), fila1, None if fila2 < 0 else fila2,
+                                           Fraction(num, den))
+                    except (ValueError, IndexError, ZeroDivisionError):
+                        continue
+                elif tipo == bit.DESHACER:
+                    self.motor.deshacer()
+                else:
+                    self.motor.rehacer()
+            elif tipo == bit.COMPLETADO:
+                if 0 <= nivel <= 3:
+                    self.current_level = nivel
+            elif tipo == bit.REINICIO:
+                self.current_level = 0
+                self._limpiar()
+            else:
+                # SALIR: se vuelve al menú
+                self._limpiar()
+
+        if pendiente is not None:
+            # Un nivel cuya matriz no alcanzó a guardarse completa: se vuelve al menú
+            self._limpiar()
+        self.formateador = FormateadorMatriz(self.motor.columnas_a) if self.motor is not None else None
+        return len(registros)
+
+    # -------------------- Operaciones elementales --------------------
+
+    def aplicar_operacion(self, tipo, fila1, fila2=None, factor=1):
+        """Aplica una operación elemental a la matriz aumentada del nivel en curso."""
+        if self.motor is None:
+            raise ValueError("El nivel actual no admite operaciones elementales.")
+        factor = Fraction(factor)
+        if self.bitacora is not None:
+            self.bitacora.validar_factor(factor)
+        self.motor.aplicar(tipo, fila1, fila2, factor)
+        if self.bitacora is not None:
+            self.bitacora.registrar_operacion(CODIGOS_NIVEL[self.nivel], CODIGOS[tipo], fila1, fila2, factor)
+            if self.bitacora.necesita_instantanea:
+                self._guardar_instantanea()
+
+    def deshacer(self):
+        if self.motor is None or not self.motor.deshacer():
+            return False
+        self._registrar(bit.DESHACER)
+        return True
+
+    def rehacer(self):
+        if self.motor is None or not self.motor.rehacer():
+            return False
+        self._registrar(bit.REHACER)
+        return True
+
+    def reemplazar_matriz(self, matriz):
+        # Sustituye la matriz izquierda conservando la parte derecha
+        derecha = self.motor.B if self.motor is not None else None
+        motor = MotorOperaciones(matriz, derecha)
+        if self.bitacora is not None:
+            self.bitacora.registrar_matriz(bit.MATRIZ, CODIGOS_NIVEL[self.nivel], motor.matriz, motor.columnas_a)
+        self.matriz = matriz
+        self.derecha = derecha
+        self.motor = motor
+        self.formateador = FormateadorMatriz(self.motor.columnas_a)
+        self._guardar_instantanea()
+
+    def texto_matriz(self):
+        """
+        Texto alineado de la matriz aumentada; solo reformatea las filas
+        tocadas desde la llamada anterior.
+        """
+        if self.motor is None:
+            return None
+        return self.formateador.formatear(self.motor.matriz, self.motor.tomar_filas_sucias())
+
+    # -------------------- Resultados esperados --------------------
+
+    def resultado_transpuesta(self):
+        return self.cache.obtener(resultados.TRANSPUESTA, self.matriz)
+
+    def resultado_inversa(self):
+        # Inversa exacta de la matriz original, o None si no existe
+        return self.cache.obtener(resultados.INVERSA, self.matriz_original)
+
+    def _es_inversa(self, B):
+        """
+        (exito, mensaje) para B como inversa de la matriz original. Con la
+        inversa en la caché basta comparar; si falta, para n grande es más
+        barato verificar A·B = I (Freivalds) que calcular la inversa.
+        """
+        if self.n < UMBRAL_FREIVALDS:
+            encontrada, inversa = True, self.resultado_inversa()
+        else:
+            encontrada, inversa = self.cache.buscar(resultados.INVERSA, self.matriz_original)
+        if not encontrada:
+            return verificar_producto_es_identidad(self.matriz_original, B)
+        if inversa is not None and RationalMatrix.desde(B) == inversa:
+            return True, "¡La matriz ingresada es la inversa correcta!"
+        return False, "La matriz ingresada no es la inversa correcta."
+
+    # -------------------- Verificaciones --------------------
+
+    def verificar_transpuesta(self, celdas):
+        """Verifica una cuadrícula de textos como transpuesta de la matriz."""
+        try:
+            ingresada = interpretar_matriz(celdas)
+            if comparar_con_transpuesta(self.matriz, ingresada):
+                self._completar(1)
+                return True, "¡Has completado el nivel correctamente!"
+            return False, "La matriz ingresada no es la transpuesta correcta."
+        except Exception as e:
+            return False, f"Error al verificar la transpuesta: {e}"
+
+    def sistemas(self):
+        """
+        Soluciones de los sistemas A·x = b de cada columna derecha. Las
+        operaciones elementales no cambian las soluciones, así que se
+        resuelven sobre [A | B] original: después de operar con fracciones
+        la parte derecha del alumno puede tener números de cientos de
+        dígitos y eliminar sobre ella es mucho más caro.
+        """
+        if self.derecha is None:
+            return resolver_sistemas(self.motor.A, self.motor.B)
+        return resolver_sistemas(self.matriz, self.derecha)
+
+    def terminar_gauss(self):
+        # La forma escalonada reducida es única: basta compararla con la de la matriz original
+        if self.motor.A == self.cache.obtener(resultados.RREF, self.matriz):
+            self._completar(2)
+            return True, "¡Has completado el nivel correctamente!\n" + describir_sistemas(self.sistemas())
+        return False, "La matriz no está en forma escalonada reducida."
+
+    def terminar_inversa(self):
+        # La izquierda debe ser la identidad y la derecha la inversa de la original
+        if not self.motor.A.es_identidad():
+            return False, "La matriz izquierda debe ser la matriz identidad."
+        exito, _ = self._es_inversa(self.motor.B)
+        if exito:
+            self._completar(3)
+            return True, "¡Has calculado correctamente la matriz inversa!"
+        return False, "La matriz derecha no es la inversa de la matriz original."
+
+    def verificar_inversa(self, celdas):
+        """Verifica una cuadrícula de textos como inversa de la matriz original."""
+        exito, mensaje = self._es_inversa(interpretar_matriz(celdas))
+        if exito:
+            self._completar(3)
+        return exito, mensaje
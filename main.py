@@ -1,7 +1,67 @@
+import argparse
+import os
+import sys
+import time
 import tkinter as tk
-from gui.app import Linealgame 
+from gui.app import Linealgame
+from logic.instrumentacion import activar_desde_entorno
 
-if __name__ == "__main__":
+# Bitácora de la partida: el progreso se recupera al volver a abrir el juego
+RUTA_BITACORA = os.path.join(os.path.expanduser("~"), ".quizlineal", "partida.bitacora")
+# Resultados esperados ya calculados (inversas, formas reducidas), entre partidas
+RUTA_CACHE = os.path.join(os.path.expanduser("~"), ".quizlineal", "resultados.cache")
+
+# Marcas que imprime --medir-arranque (las lee benchmarks/arranque.py)
+MARCA_VENTANA = "primera_ventana_ms"
+MARCA_SESION = "sesion_lista_ms"
+
+
+def crear_sesion(ruta=RUTA_BITACORA, ruta_cache=RUTA_CACHE):
+    # Corre fuera del hilo de Tk, después de mostrar la ventana: aquí se cargan NumPy y la lógica
+    from logic.bitacora import Bitacora
+    from logic.cache import CacheResultados
+    from logic.sesion import GameSession
+    sesion = GameSession(bitacora=Bitacora(ruta), cache=CacheResultados(ruta=ruta_cache))
+    sesion.recuperar()
+    return sesion
+
+
+def medir_arranque(root, app, inicio):
+    # Imprime cuándo se dibujó la ventana y cuándo quedó lista la sesión, y sale
+    root.update()
+    print(f"{MARCA_VENTANA}={(time.perf_counter() - inicio) * 1000:.1f}", flush=True)
+
+    def esperar_sesion():
+        if app.sesion is None:
+            root.after(5, esperar_sesion)
+            return
+        print(f"{MARCA_SESION}={(time.perf_counter() - inicio) * 1000:.1f}", flush=True)
+        root.destroy()
+    esperar_sesion()
+
+
+def main(argv=None):
+    inicio = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Desafío Matemático: juego de álgebra lineal.")
+    parser.add_argument("--medir-arranque", action="store_true",
+                        help="imprime el tiempo hasta la primera ventana y hasta la sesión lista, y sale")
+    args = parser.parse_args(argv)
+
+    # QUIZLINEAL_PERFIL=ruta enciende la instrumentación y la vuelca al salir
+    activar_desde_entorno()
     root = tk.Tk()
-    app = Linealgame(root)
-    root.mainloop()
\ No newline at end of file
+    app = Linealgame(root, crear_sesion=crear_sesion)
+    if args.medir_arranque:
+        root.after_idle(medir_arranque, root, app, inicio)
+    root.mainloop()
+    # La última tarea en segundo plano puede estar escribiendo en la bitácora
+    app.tareas.cerrar()
+    if app.sesion is not None:
+        app.sesion.cache.guardar()
+        if app.sesion.bitacora is not None:
+            app.sesion.bitacora.cerrar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
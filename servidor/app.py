@@ -0,0 +1,285 @@
+"""
+Servidor asyncio para atender muchas partidas a la vez.
+
+Cada estudiante tiene una GameSession en memoria. El protocolo es HTTP/1.1
+con cuerpos JSON y conexiones persistentes (keep-alive):
+
+    POST   /sesiones                     crea una sesión → {"id": ...}
+    GET    /sesiones/<id>                estado de la sesión
+    DELETE /sesiones/<id>                elimina la sesión
+    POST   /sesiones/<id>/iniciar        {"nivel": "Gauss Jordan", "n": 3}
+    POST   /sesiones/<id>/operacion      {"tipo": "suma", "fila1": 0, "fila2": 1, "factor": "-1/2"}
+    POST   /sesiones/<id>/deshacer
+    POST   /sesiones/<id>/rehacer
+    POST   /sesiones/<id>/transpuesta    {"celdas": [["1", "2"], ["3", "4"]]}
+    POST   /sesiones/<id>/inversa        {"celdas": [...]}
+    POST   /sesiones/<id>/terminar       verifica el nivel Gauss Jordan o Inversa
+    POST   /sesiones/<id>/salir
+    GET    /cache                        aciertos y fallos de la caché de resultados
+
+Las operaciones elementales son baratas y se atienden en el bucle de
+eventos. La generación de matrices y las verificaciones se envían a un
+grupo de hilos de trabajo, así el bucle nunca se bloquea; los kernels de
+NumPy liberan el GIL durante el cálculo. Cada sesión tiene su propio
+asyncio.Lock para que sus acciones se apliquen en orden.
+
+La matriz aumentada con la que opera cada sesión (niveles Gauss Jordan e
+Inversa) se aloja, si cabe, en una fila de una TablaSesiones compartida
+(logic.registro): las operaciones elementales escriben directamente en un
+único bloque int64 preasignado en lugar de en arreglos sueltos por sesión.
+Las matrices más grandes que --n-arena o que pasan a enteros de Python
+siguen en memoria propia, igual que antes.
+
+Los cuerpos con campos de tipo equivocado (una celda que no es texto, una
+fila que no es entero) se rechazan con 400 antes de tocar la sesión.
+
+Todas las sesiones comparten una CacheResultados: las inversas y formas
+reducidas de una matriz se calculan una vez aunque la resuelvan muchos
+estudiantes. Con --cache RUTA se guarda al detener el servidor y se carga
+al arrancar.
+
+Uso:
+    python -m servidor.app --puerto 8765 --hilos 4 --cache resultados.cache --capacidad 10000
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from logic.sesion import GameSession, GAUSS_JORDAN, INVERSA, CODIGOS_NIVEL
+from logic.generador import PoolMatrices
+from logic.entrada import interpretar_valor
+from logic.cache import CacheResultados
+from logic.registro import TablaSesiones
+
+ESTADOS_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _entero(cuerpo, campo, opcional=False):
+    # Los booleanos de JSON no cuentan como enteros
+    valor = cuerpo.get(campo) if opcional else cuerpo[campo]
+    if valor is None and opcional:
+        return None
+    if type(valor) is not int:
+        raise ErrorHTTP(400, f"El campo '{campo}' debe ser un entero.")
+    return valor
+
+
+def _celdas(cuerpo):
+    # Cuadrícula rectangular no vacía de textos, como la que llena la interfaz
+    celdas = cuerpo["celdas"]
+    if (not isinstance(celdas, list) or not celdas or not all(isinstance(fila, list) for fila in celdas)
+            or len({len(fila) for fila in celdas}) != 1 or not celdas[0]
+            or not all(isinstance(texto, str) for fila in celdas for texto in fila)):
+        raise ErrorHTTP(400, "El campo 'celdas' debe ser una lista de filas de textos del mismo largo.")
+    return celdas
+
+
+class ServidorJuego:
+    """Aloja sesiones de juego y atiende peticiones HTTP/JSON sobre asyncio."""
+
+    def __init__(self, hilos=4, semilla=None, ruta_cache=None, capacidad=10000, n_arena=5):
+        self.pool = PoolMatrices(semilla=semilla)
+        self.cache = CacheResultados(ruta=ruta_cache)
+        self.ejecutor = ThreadPoolExecutor(max_workers=hilos)
+        self.tabla = TablaSesiones(capacidad, n_arena)
+        self.sesiones = {}
+        self.cerrojos = {}
+        self.registros = {}  # Fila de la arena de cada sesión que tiene una
+        self._ids = itertools.count(1)
+
+    # -------------------- Acciones --------------------
+
+    def _estado(self, sesion):
+        estado = {"nivel": sesion.nivel, "current_level": sesion.current_level, "n": sesion.n}
+        if sesion.motor is not None:
+            estado["matriz"] = sesion.texto_matriz()
+            estado["operaciones"] = len(sesion.motor)
+        elif sesion.matriz is not None:
+            estado["matriz"] = sesion.matriz.tolist()
+        return estado
+
+    def _alojar(self, identificador, sesion):
+        # Pasa la matriz del motor a la arena si cabe; si no, queda donde estaba
+        motor = sesion.motor
+        if motor is None or not (self.tabla.cabe(motor.matriz) and motor.matriz.exacta_int64):
+            return
+        registro = self.registros.get(identificador)
+        if registro is None:
+            if len(self.tabla) == self.tabla.capacidad:
+                return
+            registro = self.registros[identificador] = self.tabla.reservar()
+        registro.nivel = CODIGOS_NIVEL[sesion.nivel]
+        registro.current_level = sesion.current_level
+        motor.matriz = registro.alojar(motor.matriz, motor.columnas_a)
+
+    def _eliminar(self, identificador):
+        del self.sesiones[identificador]
+        del self.cerrojos[identificador]
+        registro = self.registros.pop(identificador, None)
+        if registro is not None:
+            self.tabla.liberar(registro)
+
+    async def _en_trabajador(self, funcion, *args):
+        # Ejecuta trabajo pesado fuera del bucle de eventos
+        return await asyncio.get_running_loop().run_in_executor(self.ejecutor, funcion, *args)
+
+    async def atender(self, metodo, ruta, cuerpo):
+        partes = [p for p in ruta.split("/") if p]
+        if partes == ["cache"]:
+            if metodo != "GET":
+                raise ErrorHTTP(405, "Método no permitido.")
+            return self.cache.metricas()
+        if not partes or partes[0] != "sesiones":
+            raise ErrorHTTP(404, "Ruta no encontrada.")
+
+        if len(partes) == 1:
+            if metodo != "POST":
+                raise ErrorHTTP(405, "Método no permitido.")
+            identificador = str(next(self._ids))
+            self.sesiones[identificador] = GameSession(self.pool, cache=self.cache)
+            self.cerrojos[identificador] = asyncio.Lock()
+            return {"id": identificador}
+
+        identificador = partes[1]
+        sesion = self.sesiones.get(identificador)
+        if sesion is None:
+            raise ErrorHTTP(404, "Sesión no encontrada.")
+        accion = partes[2] if len(partes) > 2 else None
+
+        async with self.cerrojos[identificador]:
+            if accion is None:
+                if metodo == "DELETE":
+                    self._eliminar(identificador)
+                    return {"eliminada": identificador}
+                return self._estado(sesion)
+            if metodo != "POST":
+                raise ErrorHTTP(405, "Método no permitido.")
+            if not isinstance(cuerpo, dict):
+                raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON.")
+            respuesta = await self._accion(sesion, accion, cuerpo)
+            if accion == "iniciar" and respuesta["exito"]:
+                self._alojar(identificador, sesion)
+            return respuesta
+
+    async def _accion(self, sesion, accion, cuerpo):
+        try:
+            if accion == "iniciar":
+                if not isinstance(cuerpo["nivel"], str):
+                    raise ErrorHTTP(400, "El campo 'nivel' debe ser un texto.")
+                exito, mensaje = await self._en_trabajador(sesion.iniciar, cuerpo["nivel"], _entero(cuerpo, "n"))
+            elif accion == "operacion":
+                factor = cuerpo.get("factor", "1")
+                if not isinstance(cuerpo["tipo"], str) or type(factor) not in (str, int):
+                    raise ErrorHTTP(400, "El tipo debe ser un texto y el factor un texto o un entero.")
+                sesion.aplicar_operacion(cuerpo["tipo"], _entero(cuerpo, "fila1"),
+                                         _entero(cuerpo, "fila2", opcional=True), interpretar_valor(str(factor)))
+                exito, mensaje = True, ""
+            elif accion == "deshacer":
+                exito, mensaje = sesion.deshacer(), ""
+            elif accion == "rehacer":
+                exito, mensaje = sesion.rehacer(), ""
+            elif accion == "transpuesta":
+                exito, mensaje = await self._en_trabajador(sesion.verificar_transpuesta, _celdas(cuerpo))
+            elif accion == "inversa":
+                exito, mensaje = await self._en_trabajador(sesion.verificar_inversa, _celdas(cuerpo))
+            elif accion == "terminar":
+                if sesion.nivel == GAUSS_JORDAN:
+                    exito, mensaje = await self._en_trabajador(sesion.terminar_gauss)
+                elif sesion.nivel == INVERSA:
+                    exito, mensaje = await self._en_trabajador(sesion.terminar_inversa)
+                else:
+                    raise ValueError("El nivel actual no se termina con operaciones elementales.")
+            elif accion == "salir":
+                sesion.salir()
+                exito, mensaje = True, ""
+            else:
+                raise ErrorHTTP(404, "Acción no encontrada.")
+        except (KeyError, TypeError) as e:
+            raise ErrorHTTP(400, f"Falta o es inválido el campo {e}.")
+        except (ValueError, IndexError, OverflowError) as e:
+            raise ErrorHTTP(400, str(e))
+        respuesta = {"exito": bool(exito), "mensaje": mensaje}
+        respuesta.update(self._estado(sesion))
+        return respuesta
+
+    # -------------------- HTTP --------------------
+
+    async def conexion(self, lector, escritor):
+        # Atiende peticiones sucesivas en una conexión persistente
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                metodo, ruta, _ = linea.decode("latin-1").split(" ", 2)
+                cabeceras = {}
+                while True:
+                    cabecera = await lector.readline()
+                    if cabecera in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = cabecera.decode("latin-1").partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                largo = int(cabeceras.get("content-length", 0))
+                datos = await lector.readexactly(largo) if largo else b""
+
+                try:
+                    cuerpo = json.loads(datos) if datos else {}
+                    estado, respuesta = 200, await self.atender(metodo, ruta, cuerpo)
+                except ErrorHTTP as e:
+                    estado, respuesta = e.estado, {"error": str(e)}
+                except json.JSONDecodeError:
+                    estado, respuesta = 400, {"error": "El cuerpo no es JSON válido."}
+                except Exception as e:
+                    estado, respuesta = 500, {"error": f"Error inesperado: {e}"}
+
+                contenido = json.dumps(respuesta).encode("utf-8")
+                escritor.write(
+                    f"HTTP/1.1 {estado} {ESTADOS_HTTP[estado]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(contenido)}\r\n"
+                    f"Connection: keep-alive\r\n\r\n".encode("latin-1") + contenido
+                )
+                await escritor.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, anfitrion="127.0.0.1", puerto=8765):
+        servidor = await asyncio.start_server(self.conexion, anfitrion, puerto)
+        async with servidor:
+            await servidor.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor de partidas del Desafío Matemático.")
+    parser.add_argument("--anfitrion", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--hilos", type=int, default=4, help="hilos para generación y verificación")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--cache", metavar="RUTA", help="archivo para conservar la caché de resultados entre reinicios")
+    parser.add_argument("--capacidad", type=int, default=10000, help="sesiones que caben en la arena compartida")
+    parser.add_argument("--n-arena", type=int, default=5, help="tamaño máximo de las matrices alojadas en la arena")
+    args = parser.parse_args(argv)
+
+    servidor = ServidorJuego(args.hilos, args.semilla, args.cache, args.capacidad, args.n_arena)
+    print(f"Servidor escuchando en http://{args.anfitrion}:{args.puerto}")
+    try:
+        asyncio.run(servidor.servir(args.anfitrion, args.puerto))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.cache.guardar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
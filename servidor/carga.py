@@ -0,0 +1,153 @@
+"""
+Cliente de prueba de carga para servidor.app.
+
+Abre varias conexiones persistentes y simula estudiantes que juegan los
+tres niveles: resuelven la transpuesta, aplican operaciones elementales
+en Gauss Jordan e Inversa, deshacen alguna y piden la verificación.
+Al final informa la latencia p50/p99 por tipo de petición y las
+operaciones por segundo.
+
+Uso:
+    python -m servidor.carga --clientes 50 --partidas 4 --n 3
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from fractions import Fraction
+import numpy as np
+
+
+class ClienteHTTP:
+    """Conexión HTTP/1.1 persistente con cuerpos JSON."""
+
+    def __init__(self, lector, escritor):
+        self.lector = lector
+        self.escritor = escritor
+
+    @classmethod
+    async def conectar(cls, anfitrion, puerto):
+        return cls(*await asyncio.open_connection(anfitrion, puerto))
+
+    async def pedir(self, metodo, ruta, cuerpo=None):
+        datos = json.dumps(cuerpo).encode("utf-8") if cuerpo is not None else b""
+        self.escritor.write(
+            f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(datos)}\r\n\r\n".encode("latin-1") + datos
+        )
+        await self.escritor.drain()
+        estado = int((await self.lector.readline()).split()[1])
+        largo = 0
+        while True:
+            linea = await self.lector.readline()
+            if linea in (b"\r\n", b"\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            if nombre.strip().lower() == "content-length":
+                largo = int(valor)
+        return estado, json.loads(await self.lector.readexactly(largo))
+
+    def cerrar(self):
+        self.escritor.close()
+
+
+def _texto(valor):
+    return str(Fraction(valor))
+
+
+async def simular_estudiante(anfitrion, puerto, partidas, n, latencias, rng):
+    cliente = await ClienteHTTP.conectar(anfitrion, puerto)
+
+    async def pedir(etiqueta, metodo, ruta, cuerpo=None):
+        inicio = time.perf_counter()
+        estado, respuesta = await cliente.pedir(metodo, ruta, cuerpo)
+        latencias.setdefault(etiqueta, []).append(time.perf_counter() - inicio)
+        if estado != 200:
+            raise RuntimeError(f"{etiqueta}: {estado} {respuesta.get('error')}")
+        return respuesta
+
+    try:
+        for _ in range(partidas):
+            sesion = (await pedir("crear", "POST", "/sesiones"))["id"]
+            base = f"/sesiones/{sesion}"
+
+            # Nivel 1: se envía la transpuesta correcta
+            respuesta = await pedir("iniciar", "POST", f"{base}/iniciar", {"nivel": "Transpuesta", "n": n})
+            celdas = [[_texto(v) for v in fila] for fila in np.array(respuesta["matriz"], dtype=object).T]
+            await pedir("verificar", "POST", f"{base}/transpuesta", {"celdas": celdas})
+
+            # Niveles 2 y 3: operaciones elementales al azar y verificación
+            for nivel in ("Gauss Jordan", "Inversa"):
+                await pedir("iniciar", "POST", f"{base}/iniciar", {"nivel": nivel, "n": n})
+                for _ in range(3 * n):
+                    i, j = rng.sample(range(n), 2)
+                    tipo = rng.choice(("intercambio", "multiplicacion", "suma"))
+                    cuerpo = {"tipo": tipo, "fila1": i, "fila2": j, "factor": rng.choice(("2", "-1", "1/3"))}
+                    await pedir("operacion", "POST", f"{base}/operacion", cuerpo)
+                await pedir("deshacer", "POST", f"{base}/deshacer")
+                await pedir("terminar", "POST", f"{base}/terminar")
+
+            await pedir("eliminar", "DELETE", base)
+    finally:
+        cliente.cerrar()
+
+
+def percentil(valores, p):
+    return float(np.percentile(valores, p)) * 1000 if valores else 0.0
+
+
+async def ejecutar_carga(anfitrion, puerto, clientes, partidas, n, semilla=None):
+    """
+    Lanza `clientes` estudiantes concurrentes y retorna las métricas:
+    peticiones, segundos, ops/s y latencias p50/p99 (ms) por etiqueta.
+    """
+    latencias = {}
+    rng = random.Random(semilla)
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        simular_estudiante(anfitrion, puerto, partidas, n, latencias, random.Random(rng.random()))
+        for _ in range(clientes)
+    ))
+    transcurrido = time.perf_counter() - inicio
+    todas = [t for valores in latencias.values() for t in valores]
+    return {
+        "peticiones": len(todas),
+        "segundos": transcurrido,
+        "ops_por_segundo": len(todas) / transcurrido if transcurrido else 0.0,
+        "p50_ms": percentil(todas, 50),
+        "p99_ms": percentil(todas, 99),
+        "por_tipo": {
+            etiqueta: {"cantidad": len(valores), "p50_ms": percentil(valores, 50), "p99_ms": percentil(valores, 99)}
+            for etiqueta, valores in sorted(latencias.items())
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor de partidas.")
+    parser.add_argument("--anfitrion", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--clientes", type=int, default=50, help="estudiantes concurrentes")
+    parser.add_argument("--partidas", type=int, default=4, help="partidas completas por estudiante")
+    parser.add_argument("--n", type=int, default=3, help="tamaño de las matrices")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="imprime las métricas en JSON")
+    args = parser.parse_args(argv)
+
+    metricas = asyncio.run(ejecutar_carga(args.anfitrion, args.puerto, args.clientes,
+                                          args.partidas, args.n, args.semilla))
+    if args.json:
+        print(json.dumps(metricas, indent=2))
+        return 0
+    print(f"{metricas['peticiones']} peticiones en {metricas['segundos']:.2f} s "
+          f"({metricas['ops_por_segundo']:.1f} ops/s)")
+    print(f"latencia total: p50 {metricas['p50_ms']:.2f} ms, p99 {metricas['p99_ms']:.2f} ms")
+    for etiqueta, datos in metricas["por_tipo"].items():
+        print(f"  {etiqueta:<10} {datos['cantidad']:>7}  p50 {datos['p50_ms']:7.2f} ms  p99 {datos['p99_ms']:7.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Análisis fuera de línea (logic.analisis): un intento mal formado no detiene
+el resumen y las sesiones se distinguen por la ruta completa del archivo.
+"""
+import json
+from logic.analisis import analizar_registros, armar_intentos, leer_eventos
+
+
+def _escribir(ruta, eventos):
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text("\n".join(json.dumps(e) for e in eventos), encoding="utf-8")
+    return str(ruta)
+
+
+def _intento(fila1):
+    return [
+        {"tipo": "inicio", "nivel": 2, "t": 0, "matriz": [["1", "2", "5"], ["3", "4", "6"]], "columnas_a": 2},
+        {"tipo": "operacion", "operacion": "suma", "fila1": fila1, "fila2": 0, "factor": "-3", "t": 1},
+        {"tipo": "completado", "nivel": 2, "t": 2},
+    ]
+
+
+def test_intento_mal_formado_se_cuenta_como_invalido(tmp_path):
+    bueno = _escribir(tmp_path / "bueno.jsonl", _intento(1))
+    malo = _escribir(tmp_path / "malo.jsonl", _intento(5))
+    salida = str(tmp_path / "resumen.json")
+
+    analizar_registros([malo, bueno], salida, procesos=1)
+
+    with open(salida, encoding="utf-8") as archivo:
+        resumen = json.load(archivo)["2"]
+    assert resumen["invalidos"] == 1
+    assert resumen["intentos"] == 1
+    assert resumen["completados"] == 1
+
+
+def test_sesiones_con_el_mismo_nombre_no_se_mezclan(tmp_path):
+    # Dos equipos con el mismo nombre de archivo: cada uno tiene su intento
+    eventos = _intento(1)[:2]
+    rutas = [_escribir(tmp_path / equipo / "partida.jsonl", eventos) for equipo in ("a", "b")]
+    intentos = list(armar_intentos(leer_eventos(rutas)))
+    assert len(intentos) == 2
+    assert all(len(intento["operaciones"]) == 1 for intento in intentos)
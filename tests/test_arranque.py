@@ -0,0 +1,27 @@
+"""
+Presupuesto de arranque (ver benchmarks/arranque.py): main.py no debe
+cargar NumPy ni la lógica de matrices antes de mostrar la primera ventana.
+"""
+import statistics
+import pytest
+from benchmarks.arranque import (importaciones, primera_ventana, modulos_diferidos,
+                                 PRESUPUESTO_IMPORTACION_MS, PRESUPUESTO_VENTANA_MS)
+
+REPETICIONES = 3
+
+
+def test_no_se_importan_modulos_diferidos(tmp_path):
+    modulos, _ = importaciones(str(tmp_path))
+    assert modulos_diferidos(modulos) == []
+
+
+def test_importar_main_dentro_del_presupuesto(tmp_path):
+    tiempo = statistics.median(importaciones(str(tmp_path))[1] for _ in range(REPETICIONES))
+    assert tiempo <= PRESUPUESTO_IMPORTACION_MS
+
+
+def test_primera_ventana_dentro_del_presupuesto(tmp_path):
+    ventanas = [primera_ventana(str(tmp_path)) for _ in range(REPETICIONES)]
+    if None in ventanas:
+        pytest.skip("sin pantalla: no se puede abrir la ventana")
+    assert statistics.median(v for v, _ in ventanas) <= PRESUPUESTO_VENTANA_MS
@@ -0,0 +1,26 @@
+"""
+Restricciones del banco de ejercicios (logic.banco): las imposibles para
+el tamaño pedido se rechazan antes de buscar.
+"""
+import numpy as np
+import pytest
+from logic.banco import interpretar_restriccion, cumple_restriccion, generar_banco
+
+
+@pytest.mark.parametrize("texto", ["pivotes:0", "pivotes:5", "denominador:0"])
+def test_restriccion_imposible_se_rechaza(texto):
+    with pytest.raises(ValueError):
+        interpretar_restriccion(texto, 3)
+
+
+def test_generar_banco_no_busca_lo_imposible(tmp_path):
+    with pytest.raises(ValueError):
+        generar_banco(str(tmp_path / "banco.jsonl"), 3, 1, ("pivotes", 5), procesos=1)
+
+
+def test_restriccion_de_pivotes():
+    singular = np.array([[1, 2, 3], [2, 4, 6], [0, 1, 1]])
+    assert interpretar_restriccion("pivotes:2", 3) == ("pivotes", 2)
+    assert cumple_restriccion(singular, ("pivotes", 2))
+    assert not cumple_restriccion(singular, ("pivotes", 3))
+    assert cumple_restriccion(np.eye(3, dtype=np.int64), ("pivotes", 3))
@@ -0,0 +1,100 @@
+"""
+Recuperación de la partida desde la bitácora (logic.bitacora y
+GameSession.recuperar), con y sin instantánea.
+"""
+import os
+import pickle
+import pytest
+from logic.bitacora import Bitacora
+from logic.niveles import GAUSS_JORDAN, INVERSA
+from logic.sesion import GameSession
+
+
+def _partida(ruta, **opciones):
+    sesion = GameSession(bitacora=Bitacora(ruta, **opciones))
+    sesion._completar(2)
+    sesion.iniciar(INVERSA, 4)
+    sesion.aplicar_operacion("multiplicacion", 0, None, "3/7")
+    sesion.aplicar_operacion("suma", 1, 0, 2)
+    sesion.aplicar_operacion("intercambio", 2, 3)
+    sesion.deshacer()
+    return sesion
+
+
+def _recuperada(ruta):
+    sesion = GameSession(bitacora=Bitacora(ruta))
+    sesion.recuperar()
+    sesion.bitacora.cerrar()
+    return sesion
+
+
+def _misma_partida(recuperada, original):
+    assert recuperada.nivel == original.nivel
+    assert recuperada.current_level == original.current_level
+    assert recuperada.motor.matriz == original.motor.matriz
+    assert list(recuperada.motor.diario()) == list(original.motor.diario())
+    assert recuperada.motor.puede_rehacer == original.motor.puede_rehacer
+    assert (recuperada.matriz_original == original.matriz_original).all()
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / "partida.bitacora")
+
+
+def test_recupera_desde_la_instantanea(ruta):
+    original = _partida(ruta)
+    original.bitacora.cerrar()
+    _misma_partida(_recuperada(ruta), original)
+
+
+def test_recupera_sin_instantanea(ruta):
+    original = _partida(ruta)
+    original.bitacora.cerrar()
+    os.remove(ruta + ".instantanea")
+    _misma_partida(_recuperada(ruta), original)
+
+
+@pytest.mark.parametrize("contenido", [
+    b"",
+    b'{"version": 1',
+    b'{"version": 1, "generacion": 0, "secuencia": 3, "estado": {"nivel": "otro"}}',
+    pickle.dumps((3, {"nivel": None})),
+])
+def test_instantanea_danada_se_ignora(ruta, contenido):
+    original = _partida(ruta)
+    original.bitacora.cerrar()
+    with open(ruta + ".instantanea", "wb") as archivo:
+        archivo.write(contenido)
+    _misma_partida(_recuperada(ruta), original)
+
+
+def test_la_instantanea_no_ejecuta_codigo(ruta, tmp_path):
+    class Carga:
+        def __reduce__(self):
+            return (open, (str(tmp_path / "ejecutado"), "w"))
+
+    original = _partida(ruta)
+    original.bitacora.cerrar()
+    with open(ruta + ".instantanea", "wb") as archivo:
+        pickle.dump(Carga(), archivo)
+    _recuperada(ruta)
+    assert not (tmp_path / "ejecutado").exists()
+
+
+def test_la_bitacora_se_compacta(ruta):
+    sesion = GameSession(bitacora=Bitacora(ruta, limite_registros=200, rotaciones=1))
+    sesion._completar(2)
+    for _ in range(20):
+        sesion.iniciar(GAUSS_JORDAN, 6)
+        sesion.aplicar_operacion("intercambio", 0, 1)
+    sesion.bitacora.cerrar()
+
+    assert sesion.bitacora.generacion > 0
+    compactada = Bitacora(ruta)
+    assert len(compactada) < 200
+    compactada.cerrar()
+    assert os.path.exists(ruta + ".1") and not os.path.exists(ruta + ".2")
+    recuperada = _recuperada(ruta)
+    assert recuperada.motor.matriz == sesion.motor.matriz
+    assert (recuperada.derecha == sesion.derecha).all()
@@ -0,0 +1,104 @@
+"""
+Caché de resultados (logic.cache): claves por contenido, límite de
+memoria y persistencia en JSON.
+"""
+import json
+import pickle
+from fractions import Fraction
+import numpy as np
+import pytest
+from logic.cache import DETERMINANTE, INVERSA, RANGO, RREF, TRANSPUESTA, CacheResultados, clave
+from logic.rational_matrix import RationalMatrix
+
+A = np.array([[2, 1, 0], [5, 3, 1], [0, 1, 4]])
+FRACCIONES = np.array([[Fraction(1, 2), 2], [3, Fraction(-5, 7)]], dtype=object)
+FLOTANTES = np.array([[0.5, 1.25], [2.0, -3.5]])
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / "resultados.cache")
+
+
+def _llena(ruta):
+    cache = CacheResultados(ruta=ruta)
+    for tipo in (TRANSPUESTA, RREF, RANGO, DETERMINANTE, INVERSA):
+        cache.obtener(tipo, A)
+    cache.obtener(INVERSA, FRACCIONES)
+    cache.obtener(TRANSPUESTA, FLOTANTES)
+    cache.obtener(DETERMINANTE, np.array([[2 ** 40, 1], [1, 2 ** 40]]) * 2 ** 20)
+    return cache
+
+
+def test_la_clave_depende_del_contenido():
+    assert clave(A) == clave(A.copy())
+    assert clave(FRACCIONES) == clave(RationalMatrix.desde(FRACCIONES))
+    assert clave(A) != clave(A.T)
+    assert clave(A) != clave(A.astype(np.float64))
+
+
+def test_ida_y_vuelta_en_json(ruta):
+    original = _llena(ruta)
+    original.guardar()
+    with open(ruta, encoding="utf-8") as archivo:
+        json.load(archivo)
+
+    cargada = CacheResultados(ruta=ruta)
+    assert len(cargada) == len(original)
+    assert list(cargada._entradas) == list(original._entradas)  # Mismo orden LRU
+    for llave, (valor, _) in original._entradas.items():
+        leido = cargada._entradas[llave][0]
+        assert type(leido) is type(valor)
+        if isinstance(valor, np.ndarray):
+            assert leido.dtype == valor.dtype and (leido == valor).all()
+        else:
+            assert leido == valor
+    assert cargada.obtener(RANGO, A) == 3
+    assert cargada.aciertos[RANGO] == 1 and cargada.fallos[RANGO] == 0
+
+
+@pytest.mark.parametrize("contenido", [
+    b"",
+    b"{no es json",
+    b"\xff\xfe",
+    b'{"version": 99, "entradas": []}',
+    b'{"version": 1, "entradas": [["inversa", "abc"]]}',
+    b'{"version": 1, "entradas": [["otro", "abc", {"t": "nada"}]]}',
+    b'{"version": 1, "entradas": [["rango", "abc", {"t": "arreglo", "dtype": "|O", "forma": [1], "datos": [1]}]]}',
+    b'{"version": 1, "entradas": [["inversa", "abc", {"t": "racional", "forma": [1, 1], "num": [1], "den": [0]}]]}',
+    b'{"version": 1, "entradas": [["inversa", "abc", {"t": "racional", "forma": [2, 2], "num": [1], "den": [1]}]]}',
+    b"[" * 100000,
+])
+def test_archivo_danado_deja_la_cache_vacia(ruta, contenido):
+    with open(ruta, "wb") as archivo:
+        archivo.write(contenido)
+    cache = CacheResultados(ruta=ruta)
+    assert len(cache) == 0
+    assert cache.obtener(RANGO, A) == 3
+
+
+def test_un_pickle_no_se_ejecuta(ruta, tmp_path):
+    class Carga:
+        def __reduce__(self):
+            return (open, (str(tmp_path / "ejecutado"), "w"))
+
+    with open(ruta, "wb") as archivo:
+        pickle.dump(Carga(), archivo)
+    assert len(CacheResultados(ruta=ruta)) == 0
+    assert not (tmp_path / "ejecutado").exists()
+
+
+def test_desaloja_las_menos_usadas():
+    matrices = [np.full((10, 10), k, dtype=np.int64) for k in range(5)]
+    cache = CacheResultados(max_bytes=3 * matrices[0].nbytes)
+    for M in matrices:
+        cache.obtener(TRANSPUESTA, M)
+    assert len(cache) == 3 and cache.desalojos == 2
+    assert cache.buscar(TRANSPUESTA, matrices[0])[0] is False
+    assert cache.buscar(TRANSPUESTA, matrices[4])[0] is True
+
+
+def test_los_resultados_son_copias():
+    cache = CacheResultados()
+    cache.obtener(TRANSPUESTA, A)[0, 0] = 99
+    assert cache.obtener(TRANSPUESTA, A)[0, 0] == 2
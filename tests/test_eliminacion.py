@@ -0,0 +1,141 @@
+"""
+Eliminación exacta (logic.eliminacion): Bareiss para forma escalonada
+reducida, rango, determinante e inversa, el camino multimodular para n
+grande y resolver_sistemas con varias partes derechas.
+"""
+from fractions import Fraction
+import numpy as np
+import pytest
+from logic import eliminacion
+from logic.eliminacion import (INFINITAS, SIN_SOLUCION, UNICA, determinante, forma_escalonada_reducida,
+                               obtener_matriz_inversa, rango, resolver_sistemas)
+from logic.niveles import GAUSS_JORDAN
+from logic.rational_matrix import RationalMatrix
+from logic.sesion import GameSession
+
+
+def _fracciones(matriz):
+    return [[Fraction(x) for x in fila] for fila in RationalMatrix.desde(matriz).a_fracciones()]
+
+
+def _rref_referencia(filas):
+    # Gauss-Jordan de libro con Fraction, para comparar
+    M = [[Fraction(x) for x in fila] for fila in filas]
+    r = 0
+    for c in range(len(M[0])):
+        pivote = next((i for i in range(r, len(M)) if M[i][c] != 0), None)
+        if pivote is None:
+            continue
+        M[r], M[pivote] = M[pivote], M[r]
+        M[r] = [x / M[r][c] for x in M[r]]
+        for i in range(len(M)):
+            if i != r and M[i][c] != 0:
+                M[i] = [x - M[i][c] * y for x, y in zip(M[i], M[r])]
+        r += 1
+        if r == len(M):
+            break
+    return M, r
+
+
+def _det_referencia(filas):
+    M = [[Fraction(x) for x in fila] for fila in filas]
+    n, det = len(M), Fraction(1)
+    for c in range(n):
+        pivote = next((i for i in range(c, n) if M[i][c] != 0), None)
+        if pivote is None:
+            return Fraction(0)
+        if pivote != c:
+            M[c], M[pivote] = M[pivote], M[c]
+            det = -det
+        det *= M[c][c]
+        for i in range(c + 1, n):
+            f = M[i][c] / M[c][c]
+            M[i] = [x - f * y for x, y in zip(M[i], M[c])]
+    return det
+
+
+MATRICES = [
+    [[2, 1, -1], [-3, -1, 2], [-2, 1, 2]],
+    [[0, 2, 4], [1, 1, 1], [2, 4, 6]],  # Singular, con un cero en el primer pivote
+    [[Fraction(1, 2), Fraction(2, 3)], [Fraction(-3, 4), 5]],
+    [[1, 2, 3, 4], [2, 4, 6, 8], [0, 0, 1, 1]],  # Rectangular de rango 2
+]
+
+
+@pytest.mark.parametrize("filas", MATRICES)
+def test_forma_escalonada_y_rango(filas):
+    esperada, rango_esperado = _rref_referencia(filas)
+    A = np.array(filas, dtype=object)
+    assert _fracciones(forma_escalonada_reducida(A)) == esperada
+    assert rango(A) == rango_esperado
+
+
+@pytest.mark.parametrize("filas", [m for m in MATRICES if len(m) == len(m[0])])
+def test_determinante_e_inversa(filas):
+    A = np.array(filas, dtype=object)
+    det = determinante(A)
+    assert det == _det_referencia(filas)
+    inversa = obtener_matriz_inversa(A)
+    if det == 0:
+        assert inversa is None
+    else:
+        assert (RationalMatrix.desde(A) @ inversa).es_identidad()
+
+
+def test_formas_no_cuadradas():
+    with pytest.raises(ValueError):
+        determinante(np.ones((2, 3), dtype=np.int64))
+    with pytest.raises(ValueError):
+        obtener_matriz_inversa(np.ones((3, 2), dtype=np.int64))
+
+
+def test_camino_modular_coincide_con_bareiss(monkeypatch):
+    rng = np.random.default_rng(3)
+    A = rng.integers(-50, 50, size=(12, 12))
+    singular = A.copy()
+    singular[5] = 2 * singular[1] - singular[7]
+    monkeypatch.setattr(eliminacion, "UMBRAL_MODULAR", 10 ** 6)
+    esperados = [(determinante(M), obtener_matriz_inversa(M)) for M in (A, singular)]
+    monkeypatch.setattr(eliminacion, "UMBRAL_MODULAR", 2)
+    for M, (det, inversa) in zip((A, singular), esperados):
+        assert determinante(M) == det
+        if inversa is None:
+            assert obtener_matriz_inversa(M) is None
+        else:
+            assert obtener_matriz_inversa(M) == inversa
+
+
+def test_resolver_sistemas_con_varias_partes_derechas():
+    A = np.array([[1, 1, 1], [1, 2, 3], [2, 3, 4]])  # Rango 2: la fila 3 es la suma de las otras
+    B = np.array([[6, 1, 0], [14, 2, 0], [20, 3, 1]])
+    solucion = resolver_sistemas(A, B)
+    assert solucion.rango == 2
+    assert [solucion.estado(j) for j in range(3)] == [INFINITAS, INFINITAS, SIN_SOLUCION]
+    X = _fracciones(solucion.X)
+    for j in (0, 1):
+        columna = [fila[j] for fila in X]
+        assert [sum(a * x for a, x in zip(fila, columna)) for fila in A.tolist()] == B[:, j].tolist()
+
+    unica = resolver_sistemas([[2, 1], [1, 3]], [[3], [5]])
+    assert unica.estado(0) == UNICA
+    assert _fracciones(unica.X) == [[Fraction(4, 5)], [Fraction(7, 5)]]
+
+
+def test_resolver_sistemas_rechaza_filas_distintas():
+    with pytest.raises(ValueError):
+        resolver_sistemas(np.eye(3, dtype=np.int64), np.ones((2, 1), dtype=np.int64))
+
+
+def test_sistemas_de_la_sesion_no_cambian_al_operar():
+    sesion = GameSession()
+    sesion._completar(1)
+    sesion.iniciar(GAUSS_JORDAN, 4)
+    esperada = resolver_sistemas(sesion.matriz, sesion.derecha)
+    sesion.aplicar_operacion("multiplicacion", 0, None, Fraction(7, 3))
+    sesion.aplicar_operacion("suma", 2, 0, Fraction(-5, 11))
+    sesion.aplicar_operacion("intercambio", 1, 3)
+    obtenida = sesion.sistemas()
+    assert obtenida.X == esperada.X
+    assert (obtenida.consistentes == esperada.consistentes).all()
+    # Las mismas soluciones que sobre la matriz transformada por el alumno
+    assert resolver_sistemas(sesion.motor.A, sesion.motor.B).X == obtenida.X
@@ -0,0 +1,26 @@
+"""
+Reserva de matrices (logic.generador.PoolMatrices): con semilla, la
+secuencia no depende de cuándo se rellena la reserva.
+"""
+import numpy as np
+import pytest
+from logic.generador import PoolMatrices, NIVEL_TRANSPUESTA, NIVEL_INVERSA
+from logic.eliminacion import determinante
+
+
+def _secuencia(pool, nivel, n, cantidad=40):
+    return [pool.obtener(nivel, n) for _ in range(cantidad)]
+
+
+@pytest.mark.parametrize("nivel, n", [(NIVEL_INVERSA, 3), (NIVEL_TRANSPUESTA, 4), (NIVEL_INVERSA, 12)])
+def test_secuencia_reproducible(nivel, n):
+    directa = PoolMatrices(semilla=7, en_segundo_plano=False)
+    rellenada = PoolMatrices(semilla=7, en_segundo_plano=False, capacidad=5, minimo=2)
+    rellenada.rellenar(nivel, n)
+    for a, b in zip(_secuencia(directa, nivel, n), _secuencia(rellenada, nivel, n)):
+        assert np.array_equal(a, b)
+
+
+def test_inversas_grandes_son_unimodulares():
+    pool = PoolMatrices(semilla=1, en_segundo_plano=False)
+    assert abs(determinante(pool.obtener(NIVEL_INVERSA, 8))) == 1
@@ -0,0 +1,47 @@
+"""
+Instrumentación con la lógica corriendo en otro hilo, como en el
+EjecutorTareas de la interfaz.
+"""
+import pstats
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from logic import instrumentacion
+
+
+@pytest.fixture(autouse=True)
+def limpia():
+    instrumentacion.reiniciar()
+    yield
+    instrumentacion.desactivar()
+    instrumentacion.reiniciar()
+
+
+@instrumentacion.medir("trabajo")
+def _trabajo():
+    return sum(range(100))
+
+
+def _en_el_hilo_de_trabajo():
+    return sum(_trabajo() for _ in range(50))
+
+
+def test_las_mediciones_de_varios_hilos_no_se_pierden():
+    instrumentacion.activar()
+    hilos = [threading.Thread(target=lambda: [_trabajo() for _ in range(2000)]) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert instrumentacion.mediciones()["trabajo"]["llamadas"] == 8000
+
+
+def test_cprofile_incluye_el_hilo_de_trabajo(tmp_path):
+    instrumentacion.activar(cprofile=True)
+    with ThreadPoolExecutor(max_workers=1) as hilo:
+        hilo.submit(_en_el_hilo_de_trabajo).result()
+    ruta_base = str(tmp_path / "perfil")
+    instrumentacion.volcar(ruta_base)
+
+    funciones = {nombre for _, _, nombre in pstats.Stats(ruta_base + ".prof").stats}
+    assert "_en_el_hilo_de_trabajo" in funciones
@@ -0,0 +1,86 @@
+"""
+Aritmética multimodular (logic.modular): reconstrucción por CRT,
+determinante y adjunta módulo varios primos, y la verificación de
+Freivalds con primos sorteados.
+"""
+from fractions import Fraction
+import math
+import numpy as np
+import pytest
+from logic.eliminacion import determinante, obtener_matriz_inversa
+from logic.modular import (BITS_PRIMO, _es_primo, adjunta_modular, determinante_modular, primo, primo_aleatorio,
+                           reconstruir_crt, verificar_inversa_freivalds, verificar_inversas_freivalds_lote)
+from logic.operations import verificar_producto_es_identidad
+from logic.rational_matrix import RationalMatrix
+
+
+def test_primos_de_trabajo():
+    primos = [primo(i) for i in range(5)]
+    assert primos == sorted(primos, reverse=True)
+    assert all(_es_primo(p) and p < 2 ** BITS_PRIMO for p in primos)
+    assert not _es_primo(2 ** 31 - 3) and _es_primo(2 ** 31 - 1)
+
+    rng = np.random.default_rng(0)
+    sorteados = {primo_aleatorio(rng) for _ in range(20)}
+    assert len(sorteados) > 15
+    assert all(_es_primo(p) and 2 ** (BITS_PRIMO - 1) <= p < 2 ** BITS_PRIMO for p in sorteados)
+
+
+def test_reconstruir_crt_con_negativos_grandes():
+    primos = [primo(i) for i in range(4)]
+    valores = np.array([[0, -1, 2 ** 100], [-(2 ** 110), 12345, 7]], dtype=object)
+    residuos = [np.array([[v % p for v in fila] for fila in valores], dtype=np.int64) for p in primos]
+    assert (reconstruir_crt(residuos, primos) == valores).all()
+
+
+def test_determinante_y_adjunta_modular():
+    rng = np.random.default_rng(1)
+    N = rng.integers(-1000, 1000, size=(15, 15))
+    det = determinante(N)
+    assert determinante_modular(N) == det
+
+    det_adj, adjunta = adjunta_modular(N)
+    assert det_adj == det
+    esperada = obtener_matriz_inversa(N).a_fracciones() * det
+    assert (adjunta == esperada).all()
+
+    singular = N.copy()
+    singular[3] = singular[0] + singular[9]
+    assert determinante_modular(singular) == 0
+    assert adjunta_modular(singular) == (0, None)
+
+
+def test_freivalds_acepta_inversas_con_fracciones():
+    A = RationalMatrix([[2, 1, 0], [1, 3, 1], [0, 1, 4]], [1, 2, 3])
+    inversa = obtener_matriz_inversa(A)
+    assert verificar_inversa_freivalds(A, inversa, semilla=0)
+
+    casi = inversa.copy()
+    casi.sumar_multiplo(0, 1, Fraction(1, 10 ** 6))
+    assert not verificar_inversa_freivalds(A, casi, semilla=0)
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_freivalds_rechaza_errores_divisibles_por_primos_fijos(semilla):
+    # B = (1 + P)·A⁻¹ con P el producto de muchos primos del rango: A·B - I = P·I
+    A = np.array([[3, 1], [5, 2]])
+    P = math.prod(primo(i) for i in range(40))
+    B = (1 + P) * RationalMatrix.desde(obtener_matriz_inversa(A)).a_fracciones()
+    assert not verificar_inversa_freivalds(A, B, semilla=semilla)
+
+
+def test_freivalds_en_lote():
+    rng = np.random.default_rng(2)
+    matrices = [rng.integers(-9, 10, size=(6, 6)) + 20 * np.eye(6, dtype=np.int64) for _ in range(4)]
+    pares = [(A, obtener_matriz_inversa(A)) for A in matrices]
+    pares[2] = (matrices[2], obtener_matriz_inversa(matrices[1]))
+    pares.append((matrices[0], np.eye(5, dtype=np.int64)))  # Formas incompatibles
+    assert verificar_inversas_freivalds_lote(pares, semilla=0).tolist() == [True, True, False, True, False]
+
+
+def test_verificacion_de_la_inversa_por_ambos_metodos():
+    A = np.array([[4, 7], [2, 6]])
+    correcta = obtener_matriz_inversa(A)
+    for metodo in ("exacto", "freivalds"):
+        assert verificar_producto_es_identidad(A, correcta, metodo=metodo)[0]
+        assert not verificar_producto_es_identidad(A, np.eye(2, dtype=np.int64), metodo=metodo)[0]
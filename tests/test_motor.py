@@ -0,0 +1,54 @@
+"""
+Secuencias de operaciones elementales (logic.motor): composición en una
+matriz E y aplicación a varias matrices a la vez.
+"""
+from fractions import Fraction
+import numpy as np
+from logic.motor import aplicar_secuencia, aplicar_secuencia_a_lote, componer_operaciones
+from logic.rational_matrix import RationalMatrix
+
+OPERACIONES = [
+    ("intercambio", 0, 2, 1),
+    ("multiplicacion", 1, None, Fraction(3, 7)),
+    ("suma", 2, 0, Fraction(-5, 2)),
+    ("suma", 0, 1, 4),
+]
+
+
+def _fracciones(matriz):
+    return [[Fraction(x) for x in fila] for fila in matriz.a_fracciones()]
+
+
+def test_componer_operaciones_equivale_a_aplicarlas():
+    A = RationalMatrix(np.arange(1, 10).reshape(3, 3))
+    E = componer_operaciones(OPERACIONES, 3)
+    esperada, _ = aplicar_secuencia(A, OPERACIONES)
+    assert E @ A == esperada
+
+
+def test_lote_igual_a_cada_matriz_por_separado():
+    matrices = [
+        RationalMatrix([[1, 2], [3, 4], [5, 6]]),
+        RationalMatrix([[7], [8], [9]]),
+        RationalMatrix([[1, 0, 0], [0, 1, 0], [0, 0, 1]], [2, 3, 5]),
+        RationalMatrix([[2, 2], [1, 0], [0, 1]]),
+    ]
+    resultados = aplicar_secuencia_a_lote(OPERACIONES, matrices)
+    assert len(resultados) == len(matrices)
+    for M, resultado in zip(matrices, resultados):
+        assert resultado == aplicar_secuencia(M, OPERACIONES)[0]
+
+
+def test_lote_no_promueve_por_una_matriz_con_denominadores_grandes():
+    grande = 2 ** 61 - 1
+    enteras = [RationalMatrix(np.eye(3, dtype=np.int64) * k) for k in range(1, 4)]
+    rara = RationalMatrix([[1], [1], [1]], [grande, grande - 2, 3])
+    resultados = aplicar_secuencia_a_lote(OPERACIONES, enteras + [rara])
+    for M, resultado in zip(enteras, resultados):
+        assert resultado.num.dtype == np.int64
+        assert _fracciones(resultado) == _fracciones(aplicar_secuencia(M, OPERACIONES)[0])
+    assert _fracciones(resultados[-1]) == _fracciones(aplicar_secuencia(rara, OPERACIONES)[0])
+
+
+def test_lote_vacio():
+    assert aplicar_secuencia_a_lote(OPERACIONES, []) == []
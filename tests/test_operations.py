@@ -0,0 +1,91 @@
+"""
+Operaciones elementales adaptativas (logic.operations): se quedan en
+int64 o float64 mientras el resultado sea entero exacto y pasan a
+Fraction solo cuando hace falta.
+"""
+from fractions import Fraction
+import numpy as np
+import pytest
+from logic.operations import aplicar_operacion_elemental, contadores_caminos, reiniciar_contadores_caminos
+from logic.rational_matrix import LIMITE_INT64
+
+
+@pytest.fixture(autouse=True)
+def contadores():
+    reiniciar_contadores_caminos()
+    yield
+    reiniciar_contadores_caminos()
+
+
+def _aplicar(A, tipo, fila1, fila2, factor):
+    original = A.copy()
+    resultado, _ = aplicar_operacion_elemental(A, tipo, fila1, fila2, factor)
+    assert (A == original).all()  # La entrada no se modifica
+    return resultado
+
+
+def test_enteros_se_quedan_en_int64():
+    A = np.array([[2, 4], [1, 3]])
+    resultado = _aplicar(A, "suma", 1, 0, Fraction(-1, 2))
+    assert resultado.dtype == np.int64
+    assert resultado.tolist() == [[2, 4], [0, 1]]
+    assert _aplicar(A, "intercambio", 0, 1, 1).tolist() == [[1, 3], [2, 4]]
+    assert contadores_caminos() == {"int64": 2}
+
+
+def test_flotantes_enteros_se_quedan_en_float64():
+    A = np.array([[2.0, 4.0], [1.0, 3.0]])
+    resultado = _aplicar(A, "multiplicacion", 0, None, Fraction(1, 2))
+    assert resultado.dtype == np.float64
+    assert resultado.tolist() == [[1.0, 2.0], [1.0, 3.0]]
+    assert contadores_caminos() == {"float64": 1}
+
+
+def test_division_inexacta_promueve_a_fracciones():
+    resultado = _aplicar(np.array([[1, 2], [3, 4]]), "multiplicacion", 0, None, Fraction(1, 3))
+    assert resultado.dtype == object
+    assert resultado[0].tolist() == [Fraction(1, 3), Fraction(2, 3)]
+    assert contadores_caminos() == {"promovida": 1}
+
+
+def test_flotantes_no_enteros_van_por_fracciones():
+    resultado = _aplicar(np.array([[0.5, 1.0], [1.0, 1.0]]), "suma", 1, 0, 2)
+    assert resultado[1].tolist() == [Fraction(2), Fraction(3)]
+    assert contadores_caminos() == {"promovida": 1}
+
+
+@pytest.mark.parametrize("tipo, fila2, factor", [
+    ("multiplicacion", None, 2 ** 70),
+    ("multiplicacion", None, Fraction(1, 2 ** 70)),
+    ("suma", 0, 2 ** 70),
+    ("suma", 0, Fraction(1, 2 ** 70)),
+    ("multiplicacion", None, LIMITE_INT64),
+])
+def test_factores_que_no_caben_promueven(tipo, fila2, factor):
+    # Con la fila de origen en cero la cota del producto no ve el factor
+    A = np.array([[0, 0], [1, 1]]) if tipo == "suma" else np.array([[1, 1], [0, 0]])
+    fila1 = 1
+    resultado = _aplicar(A, tipo, fila1, fila2, factor)
+    esperado = [Fraction(int(x)) * factor if tipo == "multiplicacion" else Fraction(int(x)) for x in A[fila1]]
+    assert resultado[fila1].tolist() == esperado
+    assert contadores_caminos() == {"promovida": 1}
+
+
+def test_factor_enorme_en_flotantes():
+    resultado = _aplicar(np.array([[1.0, 2.0], [3.0, 4.0]]), "multiplicacion", 0, None, 2 ** 60)
+    assert resultado[0].tolist() == [Fraction(2 ** 60), Fraction(2 ** 61)]
+    assert contadores_caminos() == {"promovida": 1}
+
+
+def test_cerca_del_limite_promueve():
+    A = np.array([[LIMITE_INT64 // 2, 1], [1, 1]])
+    resultado = _aplicar(A, "multiplicacion", 0, None, 4)
+    assert resultado[0].tolist() == [Fraction(LIMITE_INT64 * 2), Fraction(4)]
+    assert contadores_caminos() == {"promovida": 1}
+
+
+def test_la_parte_derecha_sigue_la_misma_operacion():
+    A, B = np.array([[1, 2], [3, 4]]), np.eye(2, dtype=np.int64)
+    A2, B2 = aplicar_operacion_elemental(A, "suma", 1, 0, -3, B=B)
+    assert A2.tolist() == [[1, 2], [0, -2]]
+    assert B2.tolist() == [[1, 0], [-3, 1]]
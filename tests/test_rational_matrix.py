@@ -0,0 +1,54 @@
+"""
+RationalMatrix (logic.rational_matrix): operaciones elementales exactas y
+paso a enteros de Python cuando int64 no alcanza.
+"""
+from fractions import Fraction
+import numpy as np
+import pytest
+from logic.rational_matrix import RationalMatrix
+
+GRANDE = 2 ** 70
+
+
+def _fracciones(matriz):
+    return [[Fraction(x) for x in fila] for fila in matriz.a_fracciones()]
+
+
+def test_escalar_fila_cero_con_factor_grande():
+    matriz = RationalMatrix([[0, 0], [1, 2]])
+    matriz.escalar(0, GRANDE)
+    matriz.escalar(1, Fraction(1, GRANDE))
+    assert _fracciones(matriz) == [[0, 0], [Fraction(1, GRANDE), Fraction(2, GRANDE)]]
+
+
+@pytest.mark.parametrize("factor", [GRANDE, Fraction(1, GRANDE), -GRANDE])
+def test_sumar_multiplo_de_fila_cero_con_factor_grande(factor):
+    matriz = RationalMatrix([[1, 2], [0, 0]])
+    matriz.sumar_multiplo(0, 1, factor)
+    assert _fracciones(matriz) == [[1, 2], [0, 0]]
+    matriz.sumar_multiplo(1, 0, factor)
+    assert _fracciones(matriz) == [[1, 2], [factor, 2 * factor]]
+
+
+def test_operaciones_coinciden_con_fraction():
+    rng = np.random.default_rng(3)
+    valores = rng.integers(-9, 10, (5, 5))
+    matriz = RationalMatrix(valores)
+    esperada = [[Fraction(int(x)) for x in fila] for fila in valores]
+    for _ in range(300):
+        i, j = (int(x) for x in rng.choice(5, 2, replace=False))
+        factor = Fraction(int(rng.integers(-20, 21)) or 1, int(rng.integers(1, 20)))
+        if rng.random() < 0.5:
+            matriz.escalar(i, factor)
+            esperada[i] = [x * factor for x in esperada[i]]
+        else:
+            matriz.sumar_multiplo(i, j, factor)
+            esperada[i] = [x + factor * y for x, y in zip(esperada[i], esperada[j])]
+    assert _fracciones(matriz) == esperada
+
+
+def test_producto_exacto():
+    A = RationalMatrix.desde(np.array([[Fraction(1, 3), 2], [5, Fraction(-7, 2)]], dtype=object))
+    B = RationalMatrix([[GRANDE, 1], [0, 3]])
+    esperado = [[Fraction(GRANDE, 3), Fraction(1, 3) + 6], [5 * GRANDE, 5 - Fraction(21, 2)]]
+    assert _fracciones(A @ B) == esperado
@@ -0,0 +1,81 @@
+"""
+Acciones del servidor de partidas (servidor.app) sin abrir sockets:
+validación de los cuerpos y sesiones alojadas en la arena compartida.
+"""
+import asyncio
+import pytest
+from logic.niveles import GAUSS_JORDAN, INVERSA
+from servidor.app import ErrorHTTP, ServidorJuego
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorJuego(hilos=1, semilla=0, capacidad=2, n_arena=3)
+    yield servidor
+    servidor.ejecutor.shutdown()
+
+
+def _pedir(servidor, metodo, ruta, cuerpo=None):
+    return asyncio.run(servidor.atender(metodo, ruta, {} if cuerpo is None else cuerpo))
+
+
+def _sesion_en(servidor, nivel, n):
+    identificador = _pedir(servidor, "POST", "/sesiones")["id"]
+    servidor.sesiones[identificador]._completar(3)
+    assert _pedir(servidor, "POST", f"/sesiones/{identificador}/iniciar", {"nivel": nivel, "n": n})["exito"]
+    return identificador
+
+
+@pytest.mark.parametrize("accion, cuerpo", [
+    ("transpuesta", {"celdas": [[1, 2], [3, 4]]}),
+    ("transpuesta", {"celdas": [["1", "2"], ["3"]]}),
+    ("inversa", {"celdas": "1 2 3 4"}),
+    ("inversa", {"celdas": []}),
+    ("iniciar", {"nivel": GAUSS_JORDAN, "n": 1e308}),
+    ("iniciar", {"nivel": GAUSS_JORDAN, "n": float("inf")}),
+    ("iniciar", {"nivel": ["Inversa"], "n": 3}),
+    ("operacion", {"tipo": "intercambio", "fila1": True, "fila2": 1}),
+    ("operacion", {"tipo": "suma", "fila1": 0, "fila2": 1, "factor": [1]}),
+    ("operacion", {"tipo": "suma", "fila1": 0, "fila2": 10 ** 30}),
+])
+def test_cuerpos_invalidos_responden_400(servidor, accion, cuerpo):
+    identificador = _sesion_en(servidor, INVERSA, 3)
+    with pytest.raises(ErrorHTTP) as error:
+        _pedir(servidor, "POST", f"/sesiones/{identificador}/{accion}", cuerpo)
+    assert error.value.estado == 400
+
+
+def test_cuerpo_que_no_es_objeto(servidor):
+    identificador = _pedir(servidor, "POST", "/sesiones")["id"]
+    with pytest.raises(ErrorHTTP) as error:
+        _pedir(servidor, "POST", f"/sesiones/{identificador}/salir", [1, 2])
+    assert error.value.estado == 400
+
+
+def test_las_operaciones_escriben_en_la_arena(servidor):
+    identificador = _sesion_en(servidor, GAUSS_JORDAN, 3)
+    registro = servidor.registros[identificador]
+    motor = servidor.sesiones[identificador].motor
+    assert registro.en_arena and registro.n == 3
+
+    _pedir(servidor, "POST", f"/sesiones/{identificador}/operacion",
+           {"tipo": "suma", "fila1": 1, "fila2": 0, "factor": "-1/2"})
+    _pedir(servidor, "POST", f"/sesiones/{identificador}/operacion",
+           {"tipo": "intercambio", "fila1": 0, "fila2": 2})
+    assert registro.matriz == motor.matriz
+    assert (servidor.tabla.num[registro.indice, :3, :6] == motor.matriz.num).all()
+
+    _pedir(servidor, "POST", f"/sesiones/{identificador}/deshacer")
+    assert registro.matriz == motor.matriz
+
+
+def test_sesiones_que_no_caben_siguen_fuera_de_la_arena(servidor):
+    grande = _sesion_en(servidor, INVERSA, 4)
+    assert grande not in servidor.registros
+    _pedir(servidor, "POST", f"/sesiones/{grande}/operacion", {"tipo": "multiplicacion", "fila1": 0, "factor": 3})
+
+    primeras = [_sesion_en(servidor, INVERSA, 2) for _ in range(3)]
+    assert len(servidor.tabla) == 2 and primeras[2] not in servidor.registros
+
+    _pedir(servidor, "DELETE", f"/sesiones/{primeras[0]}")
+    assert len(servidor.tabla) == 1